@@ -1,33 +1,37 @@
 # app/api/consultation.py
 from fastapi import APIRouter, HTTPException, status
+from datetime import datetime
+from app.config import settings
+from app.dependencies import (
+    analysis_executor,
+    record_refiner,
+    session_locks,
+    session_manager,
+    state_token_codec,
+)
 from app.schemas.consultation import ConsultationRequest, ConsultationResponse
-from app.services.core.session_manager import SessionManager
 from app.services.support.input_sanitization import InputSanitizationService
 from app.services.detection.emergency_detection import EmergencyDetectionService
-from app.services.analysis.structured_extraction import StructuredExtractionService
+from app.services.analysis.offload import AnalysisOverloaded
+from app.services.analysis.text_analysis import TextAnalysis
 from app.services.support.emotion_support import EmotionSupportService
 from app.services.detection.conflict_resolution import ConflictResolutionService
-from app.models.consultation_state import Phase
+from app.models.consultation_state import ConsultationState, Phase
+from app.models.conversation import Role
+from app.services.storage.state_token import InvalidStateToken
+from app.services.llm import deadline, stage_timeout
+from app.api.phase_rules import generate_response_for_phase, get_missing_fields
 
 
 router = APIRouter(prefix="/api/v1/consultation", tags=["consultation"])
 
 # 初始化服务
-session_manager = SessionManager()
 sanitization_service = InputSanitizationService()
 emergency_service = EmergencyDetectionService()
-extraction_service = StructuredExtractionService()
 emotion_service = EmotionSupportService()
 conflict_service = ConflictResolutionService()
 
 
-def get_missing_fields(state) -> list:
-    """获取缺失字段"""
-    required = ["chief_complaint", "present_illness", "past_history"]
-    collected = state.collected_data.keys()
-    return [f for f in required if f not in collected]
-
-
 @router.post("/chat", response_model=ConsultationResponse)
 async def chat(request: ConsultationRequest):
     """
@@ -35,24 +39,100 @@ async def chat(request: ConsultationRequest):
 
     处理用户输入，返回机器人响应
     """
-    # 输入验证
-    if not sanitization_service.validate_input(request.user_input):
+    # 输入长度限制：清洗与分析的耗时随输入线性增长，过长的输入直接拒绝
+    if len(request.user_input) > settings.max_input_chars:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"输入过长，请控制在 {settings.max_input_chars} 字以内"
+        )
+
+    # 输入验证与分析：长输入交给分析池，不阻塞同一 worker 内的其他请求
+    try:
+        analysis = await analysis_executor.inspect(request.user_input)
+    except AnalysisOverloaded:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="服务繁忙，请稍后重试"
+        )
+    if analysis is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="输入包含不安全内容"
         )
 
+    # 整轮处理共享一个截止时间，大模型阶段超出时降级为关键词提取
+    with deadline(settings.request_deadline_seconds):
+        # 无状态模式：会话状态由客户端令牌携带，服务端不保存
+        if request.stateless or request.state_token:
+            return await _run_stateless_turn(request, analysis)
+
+        # 新会话无需加锁；已有会话先等待上一轮的后台精修写回，
+        # 并发请求（重试、重复提交）按到达顺序串行
+        if request.session_id is None:
+            return await _run_turn(request, analysis)
+        await record_refiner.settle(request.session_id, stage_timeout())
+        async with session_locks.lock(request.session_id):
+            return await _run_turn(request, analysis)
+
+
+async def _run_turn(request: ConsultationRequest, analysis: TextAnalysis) -> ConsultationResponse:
+    """处理一轮对话（调用方负责会话级串行）"""
     # 获取或创建会话
     state = session_manager.get_or_create(request.session_id)
+    response = await _advance_and_complete(state, analysis, settings.llm_background_refinement)
 
-    # 敏感信息脱敏
-    cleaned_input, detected = sanitization_service.sanitize(request.user_input)
+    # 更新会话
+    session_manager.update(state.session_id, state)
+    return response
+
+
+async def _run_stateless_turn(
+    request: ConsultationRequest, analysis: TextAnalysis
+) -> ConsultationResponse:
+    """处理一轮无状态对话，响应中返回新的状态令牌"""
+    state = None
+    if request.state_token:
+        try:
+            state = state_token_codec.decode(request.state_token)
+        except InvalidStateToken as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"状态令牌无效：{exc}"
+            )
+        # 过期令牌与过期会话一致：重新开始问诊
+        if datetime.now() - state.last_update > session_manager.timeout:
+            state = None
+    if state is None:
+        state = ConsultationState(session_id=session_manager.new_session_id())
+
+    response = await _advance_and_complete(state, analysis)
+    state.last_update = datetime.now()
+    response.state_token = state_token_codec.encode(state)
+    return response
+
+
+async def _advance_and_complete(
+    state: ConsultationState, analysis: TextAnalysis, background: bool = False
+) -> ConsultationResponse:
+    """推进一轮；问诊完成时整理结构化病历（启用大模型时；background 时先返回关键词结果）"""
+    response = _advance(state, analysis)
+    outcome = await record_refiner.complete(state, background) if response.is_complete else None
+    if outcome is not None:
+        response.medical_record, response.degraded = state.collected_data, outcome.degraded
+    return response
+
+
+def _advance(state: ConsultationState, analysis: TextAnalysis) -> ConsultationResponse:
+    """根据用户输入的分析结果推进会话状态并生成响应"""
+    # 单次分析：脱敏、紧急程度、情绪等结果供后续步骤直接读取
+    cleaned_input = analysis.text
 
     # 添加用户输入
-    state.conversation_history.append(f"用户: {cleaned_input}")
+    state.conversation_history.add(Role.USER, cleaned_input)
+    state.emotion_state = analysis.emotion_level.value
 
     # 紧急检测
-    emergency_result = emergency_service.detect(cleaned_input)
+    emergency_result = emergency_service.assess(analysis.emergency_level)
     state.emergency_flag = emergency_result.is_emergency
 
     if emergency_result.is_emergency:
@@ -61,12 +141,9 @@ async def chat(request: ConsultationRequest):
         bot_response = emergency_result.recommendation
     else:
         # 根据当前阶段生成响应
-        bot_response = _generate_response_for_phase(state, cleaned_input)
+        bot_response = generate_response_for_phase(state, cleaned_input)
 
-    state.conversation_history.append(f"助手: {bot_response}")
-
-    # 更新会话
-    session_manager.update(state.session_id, state)
+    state.conversation_history.add(Role.ASSISTANT, bot_response)
 
     return ConsultationResponse(
         session_id=state.session_id,
@@ -80,36 +157,6 @@ async def chat(request: ConsultationRequest):
     )
 
 
-def _generate_response_for_phase(state, user_input: str) -> str:
-    """根据阶段生成响应"""
-    phase = state.current_phase
-
-    if phase == Phase.GREETING:
-        state.current_phase = Phase.CHIEF_COMPLAINT
-        return "您好，请问您有什么不舒服？"
-
-    elif phase == Phase.CHIEF_COMPLAINT:
-        # 简单提取主诉
-        if "头痛" in user_input or "痛" in user_input:
-            state.collected_data["chief_complaint"] = {"symptom": user_input}
-            state.current_phase = Phase.PRESENT_ILLNESS
-            return "请问这个症状持续多久了？有没有其他伴随症状？"
-
-        return "请问主要是什么症状？"
-
-    elif phase == Phase.PRESENT_ILLNESS:
-        state.collected_data["present_illness"] = {"notes": user_input}
-        state.current_phase = Phase.PAST_HISTORY
-        return "请问您既往有什么病史吗？比如高血压、糖尿病等。"
-
-    elif phase == Phase.PAST_HISTORY:
-        state.collected_data["past_history"] = {"notes": user_input}
-        state.current_phase = Phase.COMPLETE
-        return "问诊已完成，感谢您的配合。"
-
-    return "请问还有什么可以帮您的？"
-
-
 @router.get("/medical-record/{session_id}")
 async def get_medical_record(session_id: str):
     """
@@ -117,6 +164,7 @@ async def get_medical_record(session_id: str):
 
     仅在会话完成后可获取
     """
+    await record_refiner.settle(session_id, settings.request_deadline_seconds)
     state = session_manager.get(session_id)
 
     if not state:
@@ -2,6 +2,19 @@
 
 from fastapi import APIRouter
 
+from app.dependencies import (
+    analysis_executor,
+    context_builder,
+    extraction_cache,
+    journal_compactor,
+    llm_batcher,
+    llm_client,
+    record_extractor,
+    record_refiner,
+    session_manager,
+    session_sweeper,
+)
+
 router = APIRouter(prefix="/health", tags=["health"])
 
 # 增加健康检查路由
@@ -9,3 +22,26 @@ router = APIRouter(prefix="/health", tags=["health"])
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "message": "Service is running"}
+
+
+@router.get("/sessions")
+async def session_metrics():
+    """Session store and sweeper metrics."""
+    metrics = {**session_sweeper.metrics(), "store": session_manager.store.footprint()}
+    if journal_compactor is not None:
+        metrics["journal"] = journal_compactor.metrics()
+    return metrics
+
+
+@router.get("/extraction")
+async def extraction_metrics():
+    """Extraction cache and LLM client metrics."""
+    return {
+        "cache": extraction_cache.stats() if extraction_cache is not None else None,
+        "llm": llm_client.stats() if llm_client is not None else None,
+        "batching": llm_batcher.stats() if llm_batcher is not None else None,
+        "context": context_builder.stats(),
+        **record_extractor.stats(),
+        "refinement": record_refiner.stats(),
+        "analysis": analysis_executor.stats(),
+    }
@@ -0,0 +1,40 @@
+# app/api/phase_rules.py
+"""问诊各阶段的规则响应（不依赖大模型）"""
+from app.models.consultation_state import Phase
+
+
+def get_missing_fields(state) -> list:
+    """获取缺失字段"""
+    required = ["chief_complaint", "present_illness", "past_history"]
+    collected = state.collected_data.keys()
+    return [f for f in required if f not in collected]
+
+
+def generate_response_for_phase(state, user_input: str) -> str:
+    """根据阶段生成响应"""
+    phase = state.current_phase
+
+    if phase == Phase.GREETING:
+        state.current_phase = Phase.CHIEF_COMPLAINT
+        return "您好，请问您有什么不舒服？"
+
+    elif phase == Phase.CHIEF_COMPLAINT:
+        # 简单提取主诉
+        if "头痛" in user_input or "痛" in user_input:
+            state.collected_data["chief_complaint"] = {"symptom": user_input}
+            state.current_phase = Phase.PRESENT_ILLNESS
+            return "请问这个症状持续多久了？有没有其他伴随症状？"
+
+        return "请问主要是什么症状？"
+
+    elif phase == Phase.PRESENT_ILLNESS:
+        state.collected_data["present_illness"] = {"notes": user_input}
+        state.current_phase = Phase.PAST_HISTORY
+        return "请问您既往有什么病史吗？比如高血压、糖尿病等。"
+
+    elif phase == Phase.PAST_HISTORY:
+        state.collected_data["past_history"] = {"notes": user_input}
+        state.current_phase = Phase.COMPLETE
+        return "问诊已完成，感谢您的配合。"
+
+    return "请问还有什么可以帮您的？"
@@ -0,0 +1,46 @@
+# app/api/streaming.py
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+
+from app.services.detection.emergency_detection import EmergencyDetectionService
+from app.services.detection.streaming_emergency import StreamingEmergencyDetector
+
+router = APIRouter(prefix="/api/v1/consultation", tags=["consultation"])
+
+emergency_service = EmergencyDetectionService()
+
+
+@router.websocket("/stream")
+async def stream_emergency(websocket: WebSocket):
+    """
+    流式紧急检测接口
+
+    客户端按分片发送语音转写或输入中的文本；紧急程度升级时立即推送
+    {"level", "recommendation", "offset"}。发送空消息表示一段输入结束，
+    服务端返回该段的最终结果（"final": true）并开始新的一段。
+    完整消息仍通过 /chat 提交。
+    """
+    await websocket.accept()
+    detector = StreamingEmergencyDetector(emergency_service)
+    try:
+        while True:
+            chunk = await websocket.receive_text()
+            if not chunk:
+                result = detector.result()
+                await websocket.send_json({
+                    "level": result.level.value,
+                    "recommendation": result.recommendation,
+                    "offset": detector.consumed,
+                    "final": True,
+                })
+                detector = StreamingEmergencyDetector(emergency_service)
+                continue
+
+            alert = detector.feed(chunk)
+            if alert is not None:
+                await websocket.send_json({
+                    "level": alert.level.value,
+                    "recommendation": alert.recommendation,
+                    "offset": detector.alert_offset,
+                })
+    except WebSocketDisconnect:
+        pass
@@ -0,0 +1,6 @@
+# app/cli/__init__.py
+"""命令行工具
+
+- retriage    历史问诊记录批量重新分诊
+- deidentify  问诊记录归档脱敏导出
+"""
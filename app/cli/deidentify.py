@@ -0,0 +1,53 @@
+# app/cli/deidentify.py
+"""问诊记录归档脱敏导出
+
+用法:
+    python -m app.cli.deidentify transcripts.jsonl -o deidentified.jsonl --report report.json \\
+        --workers 8
+"""
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from app.services.support.deidentify import deidentify_file
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """命令行参数"""
+    parser = argparse.ArgumentParser(description="脱敏问诊记录归档，供研究使用")
+    parser.add_argument("input", help="输入文件路径（JSONL 导出或纯文本）")
+    parser.add_argument("-o", "--output", default="-", help="脱敏结果路径，默认标准输出")
+    parser.add_argument("--report", help="各类敏感信息计数报告 JSON 路径，默认输出到标准错误")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="进程数")
+    parser.add_argument("--chunk-mb", type=int, default=4, help="每块大小（MB）")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    args = build_parser().parse_args(argv)
+    target = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    try:
+        report = deidentify_file(
+            args.input,
+            target,
+            workers=args.workers,
+            chunk_bytes=args.chunk_mb * 1024 * 1024,
+        )
+    finally:
+        if target is not sys.stdout.buffer:
+            target.close()
+
+    summary = json.dumps(report.to_dict(), ensure_ascii=False, indent=2)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(summary + "\n")
+    else:
+        print(summary, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
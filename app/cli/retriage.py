@@ -0,0 +1,58 @@
+# app/cli/retriage.py
+"""历史问诊记录批量重新分诊
+
+用法:
+    python -m app.cli.retriage transcripts.jsonl -o levels.jsonl --report report.json \\
+        --workers 8 --lexicons new_lexicons.json
+"""
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from app.services.detection.bulk_triage import bulk_triage
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """命令行参数"""
+    parser = argparse.ArgumentParser(description="使用当前（或指定）词表重新分诊历史问诊记录")
+    parser.add_argument("input", help="JSONL 语料路径，- 表示标准输入")
+    parser.add_argument("-o", "--output", default="-", help="逐条结果 JSONL 路径，默认标准输出")
+    parser.add_argument("--report", help="汇总报告 JSON 路径，默认输出到标准错误")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="进程数")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="每块记录数")
+    parser.add_argument("--lexicons", help="词表文件，默认使用当前生效的词表")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """命令行入口"""
+    args = build_parser().parse_args(argv)
+    source = sys.stdin if args.input == "-" else open(args.input, "r", encoding="utf-8")
+    target = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        report = bulk_triage(
+            source,
+            target,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            lexicon_path=args.lexicons,
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+
+    summary = json.dumps(report.to_dict(), ensure_ascii=False, indent=2)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(summary + "\n")
+    else:
+        print(summary, file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
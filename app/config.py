@@ -6,15 +6,69 @@ from typing import Optional
 class Settings(BaseSettings):
     """应用配置"""
 
-    # OpenAI 配置
-    openai_api_key: str
+    # OpenAI 配置（未配置时不启用模型相关功能）
+    openai_api_key: Optional[str] = None
     openai_base_url: str = "https://api.openai.com/v1"
     model_name: str = "gpt-4"
+    # 使用大模型做结构化提取（需同时配置 openai_api_key），否则使用关键词提取
+    llm_extraction_enabled: bool = False
+    # 大模型并发请求上限（即共享连接池大小）与单次请求超时（秒）
+    llm_max_concurrency: int = 8
+    llm_timeout_seconds: float = 30.0
+    # 单次对话请求的整体截止时间（秒），大模型阶段超出时降级为关键词提取
+    request_deadline_seconds: float = 5.0
+    # 大模型调用连续失败多少次后熔断，以及熔断冷却时间（秒）
+    llm_breaker_failures: int = 5
+    llm_breaker_reset_seconds: float = 30.0
+    # 问诊完成时先返回关键词提取的病历，后台再用大模型精修（关闭则同步等待大模型）
+    llm_background_refinement: bool = True
+    # 提取调用合并窗口（毫秒，0 不合并）与单批最大任务数：窗口内同一段对话只请求一次
+    llm_batch_window_ms: int = 0
+    llm_batch_max_size: int = 8
+    # 每次调用的上下文 token 预算（已采集信息摘要 + 最近对话）
+    llm_context_tokens: int = 2000
+    # 提取结果缓存：最大条目数（0 关闭）与有效期（秒）
+    extraction_cache_size: int = 1024
+    extraction_cache_ttl_seconds: int = 3600
 
     # 会话配置
     session_timeout_minutes: int = 30
     max_conversation_length: int = 50
 
+    # 会话存储：SQLite 文件路径，多 worker 部署时必须配置；为空使用进程内存储
+    session_store_path: Optional[str] = None
+    # 进程内存储的内存预算（MB），超出时按 LRU 淘汰非活跃会话；为空不限制
+    session_memory_budget_mb: Optional[int] = None
+    # 淘汰会话的落盘目录，为空时直接丢弃
+    session_spill_dir: Optional[str] = None
+    # 会话快照路径：关闭时写入全部存活会话，启动时挂载并在首次访问时惰性恢复（仅单 worker）
+    session_snapshot_path: Optional[str] = None
+    # 会话增量日志目录：每轮追加一条变更记录，后台定期压缩为检查点，崩溃后重放恢复（仅单 worker）
+    session_journal_dir: Optional[str] = None
+    # 无状态模式的令牌签名密钥，多 worker / 多节点部署需一致；
+    # 为空时每个进程随机生成，其他进程签发的令牌会以明确的错误被拒绝
+    state_token_secret: Optional[str] = None
+    # 服务进程数（uvicorn / gunicorn 的默认 worker 数），多 worker 部署必须用它而不是 --workers 指定
+    web_concurrency: int = 1
+
+    # 单条输入的字符数上限，超出时拒绝请求
+    max_input_chars: int = 20000
+    # 脱敏与注入检测的分块扫描块大小（字符）
+    sanitization_chunk_chars: int = 8192
+    # 超过该字符数的输入交给分析池校验与分析，不阻塞事件循环；
+    # 池的线程/进程数（0 全部内联）、排队上限（已满返回 503），以及是否使用进程池
+    analysis_inline_chars: int = 2000
+    analysis_workers: int = 2
+    analysis_max_queue: int = 32
+    analysis_use_processes: bool = False
+
+    # 词表数据文件，为空使用内置词表；文件变化后自动重新加载，无需重启
+    lexicon_path: Optional[str] = None
+    # 词表编译结果缓存目录，worker 冷启动时直接读取，为空不缓存
+    lexicon_cache_dir: Optional[str] = None
+    # 词表文件检查间隔（秒），0 表示不自动重新加载
+    lexicon_reload_seconds: int = 30
+
     class Config:
         env_file = ".env"
         case_sensitive = False
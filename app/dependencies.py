@@ -1,23 +1,174 @@
 """Dependency Injection."""
 
+import os
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.config import settings
+from app.services.analysis.extraction_cache import CachedExtractionService, ExtractionCache
+from app.services.analysis.offload import AnalysisExecutor
+from app.services.analysis.text_analysis import TextAnalysisPipeline
+from app.services.core.journal_compactor import JournalCompactor, recover_from_journal
+from app.services.core.session_locks import SessionLockRegistry
+from app.services.core.session_manager import SessionManager
+from app.services.core.session_sweeper import SessionSweeper
+from app.services.lexicon import LexiconWatcher, default_registry
+from app.services.llm import (
+    CircuitBreaker,
+    ContextBuilder,
+    LLMExtractionClient,
+    MicroBatcher,
+    RecordExtractor,
+    RecordRefiner,
+)
+from app.services.storage import create_session_store
+from app.services.storage.journal import SessionJournal
+from app.services.storage.state_token import StateTokenCodec
+
+# 同一会话的请求串行处理，会话过期时回收锁
+session_locks = SessionLockRegistry()
+
+# 可选的增量日志：崩溃后可由检查点 + 日志重放恢复
+session_journal = (
+    SessionJournal(settings.session_journal_dir) if settings.session_journal_dir else None
+)
+
+# 过期清理由 lifespan 启动的后台任务负责
+session_manager = SessionManager(
+    timeout_minutes=settings.session_timeout_minutes,
+    cleanup_on_access=False,
+    store=create_session_store(
+        settings.session_store_path,
+        max_bytes=(
+            settings.session_memory_budget_mb * 1024 * 1024
+            if settings.session_memory_budget_mb else None
+        ),
+        spill_dir=settings.session_spill_dir,
+        is_active=session_locks.is_locked,
+    ),
+    journal=session_journal,
+)
+session_manager.add_eviction_listener(session_locks.discard)
+session_sweeper = SessionSweeper(session_manager)
+journal_compactor = (
+    JournalCompactor(session_manager, session_journal) if session_journal else None
+)
+
+# 无状态模式的会话令牌编解码
+state_token_codec = StateTokenCodec(settings.state_token_secret)
+
+# 医学词表：启动时加载（优先读取编译缓存），文件变化后由后台任务热替换
+lexicon_registry = default_registry()
+lexicon_watcher = (
+    LexiconWatcher(lexicon_registry, settings.lexicon_reload_seconds)
+    if settings.lexicon_reload_seconds > 0 else None
+)
+
+# 文本分析：长输入交给线程/进程池，短输入在事件循环中直接处理
+analysis_executor = AnalysisExecutor(
+    TextAnalysisPipeline(lexicon_registry),
+    inline_chars=settings.analysis_inline_chars,
+    workers=settings.analysis_workers,
+    max_queue=settings.analysis_max_queue,
+    processes=settings.analysis_use_processes,
+)
+
+# 大模型结构化提取：进程内共享连接池，未启用或未配置密钥时为空
+llm_client = (
+    LLMExtractionClient(
+        settings.openai_base_url,
+        settings.openai_api_key,
+        settings.model_name,
+        max_concurrency=settings.llm_max_concurrency,
+        timeout=settings.llm_timeout_seconds,
+    )
+    if settings.llm_extraction_enabled and settings.openai_api_key else None
+)
+# 短窗口内同一段对话的提取调用合并为一次请求（重复提交、重试），不同会话各自单独请求
+llm_batcher = (
+    MicroBatcher(
+        llm_client.extract_jobs,
+        max_batch_size=settings.llm_batch_max_size,
+        max_wait=settings.llm_batch_window_ms / 1000,
+    )
+    if llm_client is not None and settings.llm_batch_window_ms > 0 else None
+)
+# 提取结果缓存：重复或重试提交的相同对话不再重复提取
+extraction_cache = (
+    ExtractionCache(settings.extraction_cache_size, settings.extraction_cache_ttl_seconds)
+    if settings.extraction_cache_size > 0 else None
+)
+# 模型上下文按 token 预算构造，会话摘要随会话过期回收
+context_builder = ContextBuilder(settings.llm_context_tokens)
+session_manager.add_eviction_listener(context_builder.forget)
+# 病历字段提取入口：启用大模型时经缓存、合并调度调用，否则使用关键词提取；
+# 大模型超时、出错或熔断时降级为关键词提取
+record_extractor = RecordExtractor(
+    llm_client,
+    CachedExtractionService(extraction_cache),
+    extraction_cache,
+    llm_batcher,
+    context_builder,
+    breaker=CircuitBreaker(settings.llm_breaker_failures, settings.llm_breaker_reset_seconds),
+    stage_limit=settings.llm_timeout_seconds,
+)
+# 问诊完成时先返回关键词提取的病历，大模型精修在后台完成后写回会话
+record_refiner = RecordRefiner(record_extractor, session_manager, session_locks)
+
+
+def _require_single_worker(setting: str) -> None:
+    """快照与增量日志假定只有一个写入进程，多 worker 同时写同一路径会互相覆盖或删除"""
+    if settings.web_concurrency > 1:
+        raise RuntimeError(
+            f"{setting} 只支持单 worker（WEB_CONCURRENCY={settings.web_concurrency}），"
+            "多 worker 部署请改用 SESSION_STORE_PATH 共享会话库"
+        )
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan manager.
 
     Use this for startup and shutdown events:
-    - Startup: Initialize database connections, load models, etc.
-    - Shutdown: Close connections, cleanup resources, etc.
+    - Startup: Restore sessions, start background sweeper/compactor, etc.
+    - Shutdown: Stop background tasks, persist sessions, cleanup resources, etc.
     """
     # Startup
     print("Application startup...")
+    snapshot_path = settings.session_snapshot_path
+    if session_journal is not None:
+        _require_single_worker("SESSION_JOURNAL_DIR")
+    if snapshot_path:
+        _require_single_worker("SESSION_SNAPSHOT_PATH")
+    if session_journal is not None:
+        replayed = recover_from_journal(session_manager, session_journal)
+        print(f"Recovered sessions from journal ({replayed} replayed)")
+    elif snapshot_path and os.path.exists(snapshot_path):
+        restored = session_manager.restore_snapshot(snapshot_path)
+        print(f"Mounted session snapshot with {restored} sessions")
+    session_sweeper.start()
+    if journal_compactor is not None:
+        journal_compactor.start()
+    if lexicon_watcher is not None:
+        lexicon_watcher.start()
     yield
     # Shutdown
+    await record_refiner.aclose()
+    analysis_executor.shutdown()
+    await session_sweeper.stop()
+    if lexicon_watcher is not None:
+        await lexicon_watcher.stop()
+    if journal_compactor is not None:
+        await journal_compactor.stop()
+        session_journal.close()
+    elif snapshot_path:
+        saved = session_manager.save_snapshot(snapshot_path)
+        print(f"Saved {saved} sessions to snapshot")
+    session_manager.store.flush()
+    if llm_client is not None:
+        await llm_client.aclose()
     print("Application shutdown...")
 
 
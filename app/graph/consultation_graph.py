@@ -1,8 +1,10 @@
 # app/graph/consultation_graph.py
 from typing import Optional
 from app.models.consultation_state import ConsultationState, Phase
+from app.models.conversation import Role
 from app.services.detection.emergency_detection import EmergencyDetectionService
 from app.services.analysis.structured_extraction import StructuredExtractionService
+from app.services.analysis.text_analysis import TextAnalysisPipeline
 from app.services.support.emotion_support import EmotionSupportService
 
 
@@ -14,6 +16,7 @@ class ConsultationGraph:
         self.emergency_service = EmergencyDetectionService()
         self.extraction_service = StructuredExtractionService()
         self.emotion_service = EmotionSupportService()
+        self.text_analyzer = TextAnalysisPipeline()
 
     def run_greeting(self, state: ConsultationState) -> ConsultationState:
         """
@@ -26,7 +29,7 @@ class ConsultationGraph:
             更新后的状态
         """
         welcome_message = "您好，我是智能问诊助手。我会了解您的一些情况，请如实告诉我您的症状。"
-        state.conversation_history.append(f"助手: {welcome_message}")
+        state.conversation_history.add(Role.ASSISTANT, welcome_message)
         state.current_phase = Phase.CHIEF_COMPLAINT
         return state
 
@@ -40,12 +43,10 @@ class ConsultationGraph:
         Returns:
             更新后的状态
         """
-        # 从对话历史提取信息
-        conversation = "\n".join(state.conversation_history)
-
-        # 提取主诉
-        chief_complaint = self.extraction_service.extract(
-            conversation,
+        # 提取主诉（只扫描上次提取后新增的对话）
+        chief_complaint = self.extraction_service.extract_incremental(
+            state.conversation_history,
+            state.extraction_progress,
             "chief_complaint"
         )
 
@@ -70,8 +71,10 @@ class ConsultationGraph:
         if state.conversation_history:
             last_input = state.conversation_history[-1]
 
-            result = self.emergency_service.detect(last_input)
+            analysis = self.text_analyzer.analyze(last_input)
+            result = self.emergency_service.assess(analysis.emergency_level)
             state.emergency_flag = result.is_emergency
+            state.emotion_state = analysis.emotion_level.value
 
             if result.is_emergency:
                 state.emergency_assessment = result.recommendation
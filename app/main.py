@@ -2,17 +2,20 @@
 
 from fastapi import FastAPI
 
-from app.api import health, consultation
+from app.api import health, consultation, streaming
+from app.dependencies import lifespan
 
 app = FastAPI(
     title="医疗问诊 AI 系统",
     description="基于 FastAPI + LangGraph 的智能问诊系统",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # 注册路由
 app.include_router(health.router, tags=["health"])
 app.include_router(consultation.router, tags=["consultation"])
+app.include_router(streaming.router, tags=["consultation"])
 
 
 @app.get("/")
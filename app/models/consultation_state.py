@@ -4,6 +4,8 @@ from typing import Dict, List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 
+from app.models.conversation import ConversationHistory
+
 
 class Phase(Enum):
     """问诊阶段枚举"""
@@ -28,5 +30,6 @@ class ConsultationState(BaseModel):
     emotion_state: str = Field(default="normal")
     emergency_flag: bool = Field(default=False)
     emergency_assessment: Optional[str] = None
-    conversation_history: List[str] = Field(default_factory=list)
+    conversation_history: ConversationHistory = Field(default_factory=ConversationHistory)
+    extraction_progress: Dict = Field(default_factory=dict)
     last_update: datetime = Field(default_factory=datetime.now)
@@ -0,0 +1,186 @@
+# app/models/conversation.py
+import sys
+from collections import deque
+from enum import Enum
+from typing import Any, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from pydantic_core import core_schema
+
+from app.config import settings
+
+
+class Role(str, Enum):
+    """对话角色"""
+    USER = "user"
+    ASSISTANT = "assistant"
+    UNKNOWN = ""
+
+
+# 旧版对话历史使用的文本前缀
+ROLE_PREFIXES = {Role.USER: "用户: ", Role.ASSISTANT: "助手: "}
+
+
+class Turn(NamedTuple):
+    """单轮对话记录"""
+    role: Role
+    text: str
+
+    def render(self) -> str:
+        """渲染为带角色前缀的文本"""
+        return ROLE_PREFIXES.get(self.role, "") + self.text
+
+
+def parse_turn(item: Union[str, "Turn", Iterable]) -> Turn:
+    """
+    将旧版前缀字符串或 [role, text] 记录解析为 Turn
+
+    Args:
+        item: "用户: ..." 形式的字符串，或 (role, text) 序列
+
+    Returns:
+        对话记录
+    """
+    if isinstance(item, str):
+        for role, prefix in ROLE_PREFIXES.items():
+            if item.startswith(prefix):
+                return Turn(role, item[len(prefix):])
+        return Turn(Role.UNKNOWN, item)
+    role, text = item
+    return Turn(Role(role), text)
+
+
+class ConversationHistory:
+    """定长环形对话记录
+
+    只保留最近 maxlen 轮（Settings.max_conversation_length），
+    同时维护累计追加轮数、当前估算字节数与最近一次用户发言，
+    均为 O(1) 更新。迭代与下标访问返回带前缀的文本，兼容旧版 List[str] 用法。
+    """
+
+    __slots__ = ("_turns", "_appended", "_nbytes", "_last_user")
+
+    def __init__(self, turns: Iterable = (), maxlen: Optional[int] = None):
+        """
+        初始化对话记录
+
+        Args:
+            turns: 初始对话（前缀字符串或 [role, text] 记录）
+            maxlen: 最多保留的轮数，默认取配置 max_conversation_length
+        """
+        self._turns: Deque[Turn] = deque(maxlen=maxlen or settings.max_conversation_length)
+        self._appended = 0
+        self._nbytes = 0
+        self._last_user: Optional[str] = None
+        self.extend(turns)
+
+    @property
+    def maxlen(self) -> int:
+        return self._turns.maxlen
+
+    @property
+    def appended(self) -> int:
+        """累计追加的轮数（包含已被淘汰的轮次）"""
+        return self._appended
+
+    @property
+    def nbytes(self) -> int:
+        """当前保留轮次的估算字节数"""
+        return self._nbytes
+
+    @property
+    def last_user_turn(self) -> Optional[str]:
+        """最近一次用户发言的文本"""
+        return self._last_user
+
+    def add(self, role: Role, text: str) -> None:
+        """
+        追加一轮对话
+
+        Args:
+            role: 角色
+            text: 文本（不含前缀）
+        """
+        self._push(Turn(Role(role), text))
+
+    def append(self, item: Union[str, Turn]) -> None:
+        """追加一轮对话（兼容旧版 "用户: ..." 字符串）"""
+        self._push(parse_turn(item))
+
+    def extend(self, items: Iterable) -> None:
+        """批量追加"""
+        for item in items:
+            self.append(item)
+
+    def records(self) -> List[Turn]:
+        """当前保留的全部对话记录"""
+        return list(self._turns)
+
+    def tail(self, count: int) -> List[Turn]:
+        """最近 count 轮对话记录"""
+        if count <= 0:
+            return []
+        start = max(len(self._turns) - count, 0)
+        return [self._turns[i] for i in range(start, len(self._turns))]
+
+    def dump(self) -> Dict[str, Any]:
+        """JSON 形式：累计追加轮数与保留的 [role, text] 记录"""
+        return {
+            "appended": self._appended,
+            "turns": [[turn.role.value, turn.text] for turn in self._turns],
+        }
+
+    def __len__(self) -> int:
+        return len(self._turns)
+
+    def __iter__(self) -> Iterator[str]:
+        return (turn.render() for turn in self._turns)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[str, List[str]]:
+        if isinstance(index, slice):
+            return [turn.render() for turn in list(self._turns)[index]]
+        return self._turns[index].render()
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ConversationHistory):
+            return list(self._turns) == list(other._turns)
+        if isinstance(other, list):
+            return list(self) == other
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"ConversationHistory({list(self)!r}, maxlen={self.maxlen})"
+
+    def _push(self, turn: Turn) -> None:
+        """追加记录并同步计数"""
+        if len(self._turns) == self._turns.maxlen:
+            self._nbytes -= sys.getsizeof(self._turns[0].text)
+        self._turns.append(turn)
+        self._appended += 1
+        self._nbytes += sys.getsizeof(turn.text)
+        if turn.role == Role.USER:
+            self._last_user = turn.text
+
+    @classmethod
+    def _validate(cls, value: Any) -> "ConversationHistory":
+        if isinstance(value, cls):
+            return value
+        if isinstance(value, dict) and isinstance(value.get("turns"), (list, tuple)):
+            history = cls(value["turns"])
+            # 累计追加轮数随记录持久化，重新加载后增量游标仍然有效
+            history._appended = max(int(value.get("appended", 0)), history._appended)
+            return history
+        # 旧版只保存对话列表：累计轮数从保留的轮数重新开始
+        if isinstance(value, (list, tuple)):
+            return cls(value)
+        raise ValueError("conversation_history 必须是对话列表")
+
+    @staticmethod
+    def _serialize(value: "ConversationHistory") -> Dict[str, Any]:
+        return value.dump()
+
+    @classmethod
+    def __get_pydantic_core_schema__(cls, source: Any, handler: Any) -> core_schema.CoreSchema:
+        return core_schema.no_info_plain_validator_function(
+            cls._validate,
+            serialization=core_schema.plain_serializer_function_ser_schema(cls._serialize),
+        )
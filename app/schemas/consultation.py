@@ -7,6 +7,9 @@ class ConsultationRequest(BaseModel):
     """问诊请求"""
     session_id: Optional[str] = None
     user_input: str
+    # 无状态模式：首轮置 stateless=True，之后回传上一轮响应中的 state_token
+    stateless: bool = False
+    state_token: Optional[str] = None
 
 
 class ConsultationResponse(BaseModel):
@@ -19,3 +22,6 @@ class ConsultationResponse(BaseModel):
     is_complete: bool
     emergency_flag: bool
     medical_record: Optional[Dict] = None
+    state_token: Optional[str] = None
+    # 大模型不可用、本轮改用关键词提取时为 True
+    degraded: bool = False
@@ -6,4 +6,6 @@
 - detection 检测服务（紧急检测、冲突解决）
 - analysis  分析服务（结构化提取、多症状处理）
 - support   支持服务（输入清洗、意图分类、情感支持）
+- lexicon   词表匹配（多关键词自动机）
+- llm       大模型结构化提取（可选，配置后启用）
 """
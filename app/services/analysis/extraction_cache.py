@@ -0,0 +1,145 @@
+# app/services/analysis/extraction_cache.py
+import copy
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+from app.services.analysis.structured_extraction import StructuredExtractionService
+from app.services.lexicon import LexiconRegistry
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    规范化对话文本：NFKC（全角字母数字、兼容字符转为标准形式）并折叠空白
+
+    Args:
+        text: 对话文本
+
+    Returns:
+        规范化后的文本
+    """
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFKC", text)).strip()
+
+
+class ExtractionCache:
+    """提取结果缓存（LRU + TTL）
+
+    键为 规范化对话文本 + 字段类型 + 命名空间（后端、词表版本等）的摘要，
+    条目数超出上限时淘汰最久未使用的条目，超过有效期的条目在读取时丢弃。
+    读写均复制结果，调用方修改返回值不会影响缓存。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最大条目数
+            ttl_seconds: 有效期（秒）
+            clock: 时钟函数（测试用）
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def key(conversation: str, field_type: str, namespace: str = "") -> str:
+        """缓存键"""
+        material = "\0".join((namespace, field_type, normalize_text(conversation)))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """读取未过期的结果，未命中返回 None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() >= entry[0]:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, key: str, value: Dict) -> None:
+        """写入结果"""
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, copy.deepcopy(value))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """清空缓存（统计保留）"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict:
+        """命中率等统计"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class CachedExtractionService(StructuredExtractionService):
+    """带结果缓存的关键词提取服务
+
+    extract 与 extract_batch（逐字段调用 extract）都经过缓存；
+    键包含词表版本，词表热更新后旧结果自然失效。
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ExtractionCache] = None,
+        lexicons: Optional[LexiconRegistry] = None,
+    ):
+        """
+        初始化服务
+
+        Args:
+            cache: 结果缓存，为空不缓存
+            lexicons: 词表注册表，默认使用全局词表
+        """
+        super().__init__(lexicons)
+        self.cache = cache
+
+    def extract(self, conversation: str, field_type: str) -> Dict:
+        """从对话中提取特定字段（命中缓存时不重新提取）"""
+        if self.cache is None:
+            return super().extract(conversation, field_type)
+        key = self.cache.key(conversation, field_type, f"keywords:{self.lexicons.current.digest}")
+        result = self.cache.get(key)
+        if result is None:
+            result = super().extract(conversation, field_type)
+            self.cache.put(key, result)
+        return result
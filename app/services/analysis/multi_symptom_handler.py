@@ -1,35 +1,24 @@
 # app/services/multi_symptom_handler.py
-from typing import List
+from typing import List, Optional
 from app.models.consultation_state import ConsultationState
+from app.services.lexicon import LexiconRegistry, default_registry
 
 
 class MultiSymptomHandler:
     """多症状分叉流程处理器"""
 
-    # 症状优先级映射（数字越小优先级越高）
-    SYMPTOM_PRIORITY = {
-        "胸痛": 1,
-        "呼吸困难": 1,
-        "意识模糊": 1,
-        "大出血": 1,
-        "头痛": 2,
-        "腹痛": 2,
-        "发热": 3,
-        "咳嗽": 3,
-        "恶心": 3,
-        "呕吐": 3,
-    }
-
     # 默认优先级（未知症状）
     DEFAULT_PRIORITY = 99
 
-    # 症状同义词映射
-    SYMPTOM_SYNONYMS = {
-        "肚子不舒服": "腹痛",
-        "肚子痛": "腹痛",
-        "拉肚子": "腹泻",
-        "发烧": "发热",
-    }
+    def __init__(self, lexicons: Optional[LexiconRegistry] = None):
+        """
+        初始化处理器
+
+        Args:
+            lexicons: 词表注册表（症状优先级与同义词见词表 symptom_priority、
+                symptom_synonyms 段，数字越小优先级越高），默认使用全局词表
+        """
+        self.lexicons = lexicons or default_registry()
 
     def extract_symptoms(self, text: str) -> List[str]:
         """
@@ -41,18 +30,27 @@ class MultiSymptomHandler:
         Returns:
             症状列表
         """
+        return self.symptoms_from_keywords(self.lexicons.current.matcher("symptom").matched(text))
+
+    def symptoms_from_keywords(self, keywords: List[str]) -> List[str]:
+        """
+        将已匹配的症状关键词（含同义词）归一为症状列表
+
+        Args:
+            keywords: 按词表顺序排列的命中关键词
+
+        Returns:
+            症状列表
+        """
+        synonyms = self.lexicons.current["symptom_synonyms"]
         symptoms = []
 
-        # 检查已知症状
-        for symptom in self.SYMPTOM_PRIORITY.keys():
-            if symptom in text:
+        for keyword in keywords:
+            # 同义词映射为标准症状
+            symptom = synonyms.get(keyword, keyword)
+            if symptom not in symptoms:
                 symptoms.append(symptom)
 
-        # 检查同义词
-        for synonym, standard in self.SYMPTOM_SYNONYMS.items():
-            if synonym in text and standard not in symptoms:
-                symptoms.append(standard)
-
         return symptoms
 
     def prioritize(self, symptoms: List[str]) -> List[str]:
@@ -65,10 +63,11 @@ class MultiSymptomHandler:
         Returns:
             排序后的症状列表
         """
-        return sorted(
-            symptoms,
-            key=lambda s: self.SYMPTOM_PRIORITY.get(s, self.DEFAULT_PRIORITY)
-        )
+        return sorted(symptoms, key=self.priority_of)
+
+    def priority_of(self, symptom: str) -> int:
+        """症状优先级（未知症状为 DEFAULT_PRIORITY）"""
+        return self.lexicons.current["symptom_priority"].get(symptom, self.DEFAULT_PRIORITY)
 
     def create_fork(self, state: ConsultationState, symptoms: List[str]) -> None:
         """
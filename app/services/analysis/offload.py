@@ -0,0 +1,162 @@
+# app/services/analysis/offload.py
+"""文本分析的执行层
+
+短输入直接在事件循环中校验与分析（亚毫秒级，切换线程反而更慢）；超过阈值的长输入
+交给线程池或进程池，避免一次长输入的正则与关键词扫描阻塞同一 worker 内的其他请求。
+池内排队与执行中的任务总数有上限，已满时抛出 AnalysisOverloaded，由调用方拒绝请求。
+
+线程池：re 扫描期间不释放 GIL，但分块扫描与逐个产出的关键词命中之间解释器会
+按切换间隔轮转，事件循环仍能继续处理其他请求。
+进程池：可并行利用多核，代价是输入与结果的序列化；每个工作进程各自加载词表，
+并在每个任务前检查词表文件是否更新。
+"""
+import asyncio
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, Optional
+
+from app.services.analysis.text_analysis import TextAnalysis, TextAnalysisPipeline
+from app.services.lexicon import LexiconRegistry
+
+
+class AnalysisOverloaded(RuntimeError):
+    """分析任务排队已满"""
+
+
+def inspect_text(pipeline: TextAnalysisPipeline, text: str) -> Optional[TextAnalysis]:
+    """
+    校验并分析一条输入
+
+    Args:
+        pipeline: 分析流水线
+        text: 原始输入
+
+    Returns:
+        分析结果；输入包含不安全内容时返回 None
+    """
+    if not pipeline.sanitization.validate_input(text):
+        return None
+    return pipeline.analyze(text)
+
+
+# 进程池工作进程内的分析流水线（进程初始化时创建一次）
+_worker_pipeline: Optional[TextAnalysisPipeline] = None
+
+
+def _init_worker(lexicon_path: str, cache_dir: Optional[str]) -> None:
+    """工作进程初始化：加载与主进程相同的词表文件"""
+    global _worker_pipeline
+    _worker_pipeline = TextAnalysisPipeline(LexiconRegistry(lexicon_path, cache_dir))
+
+
+def _inspect_in_worker(text: str) -> Optional[TextAnalysis]:
+    """进程池任务：词表文件更新时先重新加载"""
+    _worker_pipeline.lexicons.reload_if_changed()
+    return inspect_text(_worker_pipeline, text)
+
+
+class AnalysisExecutor:
+    """按输入长度选择内联或池化执行的文本分析"""
+
+    def __init__(
+        self,
+        pipeline: Optional[TextAnalysisPipeline] = None,
+        inline_chars: int = 2000,
+        workers: int = 2,
+        max_queue: int = 32,
+        processes: bool = False,
+    ):
+        """
+        初始化
+
+        Args:
+            pipeline: 分析流水线（内联与线程池共用），默认新建
+            inline_chars: 不超过该长度的输入在事件循环中直接分析
+            workers: 池的工作线程/进程数，0 表示全部内联
+            max_queue: 池内排队与执行中的任务上限
+            processes: 使用进程池（默认线程池）
+        """
+        self.pipeline = pipeline or TextAnalysisPipeline()
+        self.inline_chars = inline_chars
+        self.workers = workers
+        self.max_queue = max_queue
+        self.processes = processes
+        self._pool: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._queued = 0
+        self.inline = 0
+        self.offloaded = 0
+        self.rejected = 0
+        self.peak_queued = 0
+
+    async def inspect(self, text: str) -> Optional[TextAnalysis]:
+        """
+        校验并分析一条输入
+
+        Args:
+            text: 原始输入
+
+        Returns:
+            分析结果；输入包含不安全内容时返回 None
+
+        Raises:
+            AnalysisOverloaded: 长输入排队已满
+        """
+        if self.workers <= 0 or len(text) <= self.inline_chars:
+            self.inline += 1
+            return inspect_text(self.pipeline, text)
+
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self.rejected += 1
+                raise AnalysisOverloaded(f"分析任务排队已满（{self.max_queue}）")
+            self._queued += 1
+            self.offloaded += 1
+            self.peak_queued = max(self.peak_queued, self._queued)
+        try:
+            if self.processes:
+                future = self._executor().submit(_inspect_in_worker, text)
+            else:
+                future = self._executor().submit(inspect_text, self.pipeline, text)
+        except BaseException:
+            self._release(None)
+            raise
+        # 名额在任务真正结束时归还：调用方取消等待时，池中的任务仍占用名额
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """关闭池，丢弃尚未开始的任务"""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        """执行统计"""
+        return {
+            "mode": "process" if self.processes else "thread",
+            "inline": self.inline,
+            "offloaded": self.offloaded,
+            "rejected": self.rejected,
+            "queued": self._queued,
+            "peak_queued": self.peak_queued,
+        }
+
+    def _executor(self) -> Executor:
+        """首次使用时创建池"""
+        with self._lock:
+            if self._pool is None:
+                if self.processes:
+                    lexicons = self.pipeline.lexicons
+                    self._pool = ProcessPoolExecutor(
+                        self.workers, initializer=_init_worker, initargs=(lexicons.path, lexicons.cache_dir)
+                    )
+                else:
+                    self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="analysis")
+            return self._pool
+
+    def _release(self, future: Optional[Future]) -> None:
+        """任务结束时归还一个排队名额（可能在池线程中回调）"""
+        with self._lock:
+            self._queued -= 1
@@ -1,24 +1,25 @@
 # app/services/structured_extraction.py
-from typing import Dict
+from typing import Dict, Iterable, List, Optional, Tuple
 import re
 
+from app.models.conversation import ConversationHistory
+from app.services.lexicon import LexiconRegistry, default_registry
+
+DURATION_PATTERN = re.compile(r'(\d+)(天|小时|周)')
+
 
 class StructuredExtractionService:
     """结构化提取服务"""
 
-    # 术语标准化字典
-    TERMINOLOGY_MAP = {
-        "感冒": "上呼吸道感染",
-        "打针": "注射治疗",
-        "挂水": "静脉输液",
-        "发烧": "发热",
-        "拉肚子": "腹泻",
-        "便秘": "排便困难",
-    }
+    def __init__(self, lexicons: Optional[LexiconRegistry] = None):
+        """
+        初始化服务
 
-    def __init__(self):
-        """初始化服务"""
-        pass
+        Args:
+            lexicons: 词表注册表（提取关键词与术语标准化字典见词表 extraction、
+                terminology 段），默认使用全局词表
+        """
+        self.lexicons = lexicons or default_registry()
 
     def extract(self, conversation: str, field_type: str) -> Dict:
         """
@@ -55,20 +56,102 @@ class StructuredExtractionService:
             "past_history": self.extract(conversation, "past_history"),
         }
 
+    def extract_incremental(
+        self,
+        history: ConversationHistory,
+        progress: Dict,
+        field_type: str
+    ) -> Dict:
+        """
+        增量提取：只扫描上次调用后新追加的对话轮次
+
+        结果与对完整对话调用 extract 一致，每轮成本与对话总长度无关。
+
+        Args:
+            history: 会话对话记录
+            progress: 会话的提取进度（游标与部分结果），原地更新
+            field_type: 字段类型
+
+        Returns:
+            提取的字段值字典
+        """
+        cursor = progress.get("cursor", 0)
+        if cursor > history.appended:
+            # 游标超前（旧版序列化未保存累计轮数）：丢弃部分结果，重新扫描保留的轮次
+            for key in ("symptoms", "chronic_diseases", "duration"):
+                progress.pop(key, None)
+            cursor = history.appended - len(history)
+        new_turns = history.appended - cursor
+        if new_turns > 0:
+            self._scan_turns((turn.render() for turn in history.tail(new_turns)), progress)
+        progress["cursor"] = history.appended
+
+        if field_type == "chief_complaint":
+            return self._chief_complaint_from(progress)
+        elif field_type == "present_illness":
+            return self._extract_present_illness("")
+        elif field_type == "past_history":
+            return self._past_history_from(progress)
+        return {}
+
+    def _scan_turns(self, turns: Iterable[str], progress: Dict) -> None:
+        """将新轮次中的关键词与时间描述并入部分结果"""
+        symptoms = list(progress.get("symptoms", []))
+        diseases = list(progress.get("chronic_diseases", []))
+        duration = progress.get("duration")
+        for text in turns:
+            found_symptoms, found_diseases = self._match_keywords(text)
+            symptoms += found_symptoms
+            diseases += found_diseases
+            if duration is None:
+                match = DURATION_PATTERN.search(text)
+                if match:
+                    duration = match.group(0)
+        keywords = self.lexicons.current["extraction"]
+        progress["symptoms"] = [k for k in keywords["symptoms"] if k in symptoms]
+        progress["chronic_diseases"] = [k for k in keywords["chronic_diseases"] if k in diseases]
+        progress["duration"] = duration
+
+    def _match_keywords(self, text: str) -> Tuple[List[str], List[str]]:
+        """
+        一次扫描找出主诉症状与慢性病关键词
+
+        Returns:
+            (症状关键词, 慢性病关键词)，均按词表顺序，症状同时出现时后者优先
+        """
+        lexicons = self.lexicons.current
+        symptom_keywords = lexicons["extraction"]["symptoms"]
+        symptoms, diseases = [], []
+        for keyword in lexicons.matcher("extraction").matched(text):
+            (symptoms if keyword in symptom_keywords else diseases).append(keyword)
+        return symptoms, diseases
+
+    def _chief_complaint_from(self, progress: Dict) -> Dict:
+        """由部分结果构造主诉"""
+        symptoms = progress.get("symptoms", [])
+        return {
+            "symptom": self._standardize(symptoms[-1]) if symptoms else None,
+            "duration": progress.get("duration"),
+            "severity": None,
+        }
+
+    def _past_history_from(self, progress: Dict) -> Dict:
+        """由部分结果构造既往史"""
+        result = self._extract_past_history("")
+        result["chronic_diseases"] = list(progress.get("chronic_diseases", []))
+        return result
+
     def _extract_chief_complaint(self, conversation: str) -> Dict:
         """提取主诉"""
         result = {"symptom": None, "duration": None, "severity": None}
 
-        # 简单关键词提取
-        if "头痛" in conversation:
-            result["symptom"] = self._standardize("头痛")
-        if "胸痛" in conversation:
-            result["symptom"] = self._standardize("胸痛")
-        if "腹痛" in conversation:
-            result["symptom"] = self._standardize("腹痛")
+        # 简单关键词提取（同时出现时取优先级最高者）
+        symptoms, _ = self._match_keywords(conversation)
+        if symptoms:
+            result["symptom"] = self._standardize(symptoms[-1])
 
         # 提取持续时间
-        duration_match = re.search(r'(\d+)(天|小时|周)', conversation)
+        duration_match = DURATION_PATTERN.search(conversation)
         if duration_match:
             result["duration"] = duration_match.group(0)
 
@@ -91,10 +174,7 @@ class StructuredExtractionService:
             "medications": []
         }
 
-        if "高血压" in conversation:
-            result["chronic_diseases"].append("高血压")
-        if "糖尿病" in conversation:
-            result["chronic_diseases"].append("糖尿病")
+        result["chronic_diseases"] = self._match_keywords(conversation)[1]
 
         return result
 
@@ -113,4 +193,4 @@ class StructuredExtractionService:
 
     def _standardize(self, term: str) -> str:
         """标准化医学术语"""
-        return self.TERMINOLOGY_MAP.get(term, term)
+        return self.lexicons.current["terminology"].get(term, term)
@@ -0,0 +1,112 @@
+# app/services/analysis/text_analysis.py
+"""统一文本分析
+
+对一条用户输入只做一次敏感信息定位与一次关键词扫描：各服务的词表
+按 "服务:标签" 合并编译为一个匹配器（见 CompiledLexicons 的 "analysis"），
+扫描结果再交给各服务的判定规则，
+下游直接读取 TextAnalysis，不再各自重复扫描输入。
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set
+
+from app.services.analysis.multi_symptom_handler import MultiSymptomHandler
+from app.services.detection.emergency_detection import EmergencyDetectionService, EmergencyLevel
+from app.services.lexicon import KeywordMatch, LexiconRegistry, default_registry
+from app.services.support.emotion_support import EmotionLevel, EmotionSupportService
+from app.services.support.input_sanitization import InputSanitizationService, PiiSpan
+from app.services.support.intent_classifier import Intent, IntentClassifier
+
+
+@dataclass(frozen=True)
+class SymptomMention:
+    """识别到的症状"""
+    name: str
+    priority: int
+
+
+@dataclass
+class TextAnalysis:
+    """单条输入的分析结果（关键词位置相对于脱敏后的文本）"""
+    original: str
+    text: str
+    pii: List[PiiSpan]
+    detected_pii: Dict[str, List[str]]
+    emergency_level: EmergencyLevel
+    emotion_level: EmotionLevel
+    intent: Intent
+    symptoms: List[SymptomMention]
+    certainty_markers: List[KeywordMatch] = field(default_factory=list)
+    uncertainty_markers: List[KeywordMatch] = field(default_factory=list)
+    contradiction_markers: List[KeywordMatch] = field(default_factory=list)
+    keywords: List[KeywordMatch] = field(default_factory=list)
+
+    def labels(self, namespace: str) -> Set[str]:
+        """某个服务命中的词表标签"""
+        prefix = f"{namespace}:"
+        return {
+            label[len(prefix):]
+            for hit in self.keywords for label in hit.labels if label.startswith(prefix)
+        }
+
+
+class TextAnalysisPipeline:
+    """单次遍历的文本分析流水线"""
+
+    def __init__(self, lexicons: Optional[LexiconRegistry] = None):
+        """
+        初始化各服务
+
+        Args:
+            lexicons: 词表注册表，默认使用全局词表
+        """
+        self.lexicons = lexicons or default_registry()
+        self.sanitization = InputSanitizationService()
+        self.emergency = EmergencyDetectionService(self.lexicons)
+        self.emotion = EmotionSupportService(self.lexicons)
+        self.intent = IntentClassifier(self.lexicons)
+        self.symptoms = MultiSymptomHandler(self.lexicons)
+
+    def analyze(self, text: str) -> TextAnalysis:
+        """
+        分析一条用户输入
+
+        Args:
+            text: 原始输入
+
+        Returns:
+            分析结果
+        """
+        lexicons = self.lexicons.current
+        cleaned, pii = self.sanitization.redact_pii(text)
+        hits = list(lexicons.matcher("analysis").finditer(cleaned))
+
+        analysis = TextAnalysis(
+            original=text,
+            text=cleaned,
+            pii=pii,
+            detected_pii=self.sanitization.group_spans(pii),
+            emergency_level=EmergencyLevel.GREEN,
+            emotion_level=EmotionLevel.NORMAL,
+            intent=Intent.RELEVANT_INFO,
+            symptoms=[],
+            keywords=hits,
+        )
+        analysis.emergency_level = self.emergency.level_for(analysis.labels("emergency"))
+        analysis.emotion_level = self.emotion.level_for(analysis.labels("emotion"))
+        analysis.intent = self.intent.intent_for(analysis.labels("intent"))
+        analysis.certainty_markers = self._with_label(hits, "certainty:certain")
+        analysis.uncertainty_markers = self._with_label(hits, "certainty:uncertain")
+        analysis.contradiction_markers = self._with_label(hits, "contradiction:")
+
+        # 症状按词表顺序归一，再按优先级排序
+        keywords = lexicons.matcher("symptom").order(
+            hit.keyword for hit in hits if "symptom:" in hit.labels
+        )
+        names = self.symptoms.prioritize(self.symptoms.symptoms_from_keywords(keywords))
+        analysis.symptoms = [SymptomMention(name, self.symptoms.priority_of(name)) for name in names]
+        return analysis
+
+    @staticmethod
+    def _with_label(hits: List[KeywordMatch], label: str) -> List[KeywordMatch]:
+        """筛选带某标签的命中"""
+        return [hit for hit in hits if label in hit.labels]
@@ -1,15 +1,20 @@
 # app/services/confidence_scoring.py
-from typing import Dict
+from typing import Dict, Optional, Set
+
+from app.services.lexicon import LexiconRegistry, default_registry
 
 
 class ConfidenceScoringService:
     """置信度评分服务"""
 
-    # 模糊关键词
-    UNCERTAIN_KEYWORDS = ["可能", "大概", "好像", "似乎", "不太确定"]
+    def __init__(self, lexicons: Optional[LexiconRegistry] = None):
+        """
+        初始化服务
 
-    # 明确关键词
-    CERTAIN_KEYWORDS = ["确实", "已经", "一直", "肯定", "一定"]
+        Args:
+            lexicons: 词表注册表（确定/模糊关键词见词表 certainty 段），默认使用全局词表
+        """
+        self.lexicons = lexicons or default_registry()
 
     def score(self, text: str, field_name: str) -> float:
         """
@@ -26,12 +31,25 @@ class ConfidenceScoringService:
         if not text or not text.strip():
             return 0.0
 
+        return self.score_for(text, self.lexicons.current.matcher("certainty").labels(text))
+
+    def score_for(self, text: str, hits: Set[str]) -> float:
+        """
+        由已扫描的确定性标记为非空文本评分
+
+        Args:
+            text: 字段文本值
+            hits: 命中的 certainty 词表标签
+
+        Returns:
+            置信度分数 (0.0 - 1.0)
+        """
         # 包含明确关键词
-        if any(keyword in text for keyword in self.CERTAIN_KEYWORDS):
+        if "certain" in hits:
             return 0.9
 
         # 包含模糊关键词
-        if any(keyword in text for keyword in self.UNCERTAIN_KEYWORDS):
+        if "uncertain" in hits:
             return 0.6
 
         # 根据文本长度判断
@@ -0,0 +1,87 @@
+# app/services/core/expiry_index.py
+import heapq
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+class ExpiryIndex:
+    """基于最小堆的过期索引（惰性删除）
+
+    每次 touch 都压入一条 (时间戳, 会话 ID) 记录，旧记录不主动删除，
+    而是在弹出时与 ``_latest`` 对比识别为陈旧条目并丢弃。
+    单次过期检查的代价与真正过期（及陈旧）的条目数成正比，与会话总数无关。
+    """
+
+    # 堆中陈旧条目超过存活条目的倍数时触发重建
+    COMPACT_RATIO = 2
+
+    def __init__(self):
+        """初始化索引"""
+        self._heap: List[Tuple[float, str]] = []
+        self._latest: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._latest)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._latest
+
+    def touch(self, session_id: str, timestamp: float) -> None:
+        """
+        记录会话的最后活跃时间
+
+        Args:
+            session_id: 会话 ID
+            timestamp: 最后活跃时间（POSIX 时间戳）
+        """
+        if self._latest.get(session_id) == timestamp:
+            return
+        self._latest[session_id] = timestamp
+        heapq.heappush(self._heap, (timestamp, session_id))
+        if len(self._heap) > self.COMPACT_RATIO * len(self._latest) + 64:
+            self._compact()
+
+    def discard(self, session_id: str) -> None:
+        """从索引中移除会话（堆中条目惰性清理）"""
+        self._latest.pop(session_id, None)
+
+    def pop_expired(
+        self,
+        cutoff: float,
+        limit: Optional[int] = None,
+        current: Optional[Callable[[str], Optional[float]]] = None,
+    ) -> List[str]:
+        """
+        弹出最后活跃时间早于 cutoff 的会话
+
+        Args:
+            cutoff: 截止时间戳，严格小于该值视为过期
+            limit: 最多弹出的会话数，None 表示不限
+            current: 可选回调，返回会话当前真实的最后活跃时间，
+                用于识别绕过 touch 直接修改时间戳的会话
+
+        Returns:
+            过期会话 ID 列表
+        """
+        expired: List[str] = []
+        heap = self._heap
+        while heap and heap[0][0] < cutoff:
+            if limit is not None and len(expired) >= limit:
+                break
+            timestamp, session_id = heapq.heappop(heap)
+            if self._latest.get(session_id) != timestamp:
+                continue  # 陈旧条目
+            if current is not None:
+                actual = current(session_id)
+                if actual is not None and actual != timestamp:
+                    # 时间戳在索引外被刷新，按真实时间重新入堆
+                    self._latest[session_id] = actual
+                    heapq.heappush(heap, (actual, session_id))
+                    continue
+            del self._latest[session_id]
+            expired.append(session_id)
+        return expired
+
+    def _compact(self) -> None:
+        """丢弃全部陈旧条目并重建堆"""
+        self._heap = [(ts, sid) for sid, ts in self._latest.items()]
+        heapq.heapify(self._heap)
@@ -0,0 +1,210 @@
+# app/services/core/journal_compactor.py
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from app.models.consultation_state import ConsultationState
+from app.services.core.session_manager import SessionManager
+from app.services.storage.journal import SessionJournal
+from app.services.storage.snapshot import SessionSnapshot, encode_state, write_snapshot
+
+logger = logging.getLogger(__name__)
+
+
+def apply_record(doc: Optional[Dict], record: Dict) -> Optional[Dict]:
+    """
+    将一条增量记录应用到会话文档（model_dump(mode="json") 形式）
+
+    Args:
+        doc: 当前文档，None 表示会话尚不存在
+        record: 增量记录
+
+    Returns:
+        更新后的文档，会话被删除时返回 None
+    """
+    if record.get("d"):
+        return None
+    if doc is None:
+        doc = {"session_id": record["s"]}
+    doc.update(record.get("set", {}))
+    for name, items in record.get("append", {}).items():
+        current = doc.setdefault(name, [])
+        if isinstance(current, dict):
+            # 对话记录：{"appended": 累计轮数, "turns": [...]}
+            current["turns"].extend(items)
+            current["appended"] = current.get("appended", 0) + len(items)
+        else:
+            current.extend(items)
+    for name, entries in record.get("merge", {}).items():
+        doc.setdefault(name, {}).update(entries)
+    for name, keys in record.get("unset", {}).items():
+        for key in keys:
+            doc.get(name, {}).pop(key, None)
+    return doc
+
+
+def replay_segments(
+    segments: Iterable[str],
+    load_base: Callable[[str], Optional[Dict]],
+) -> Dict[str, Optional[Dict]]:
+    """
+    依次重放日志段
+
+    Args:
+        segments: 日志段路径
+        load_base: 会话首次出现时调用，返回检查点中的基准文档（没有则 None）
+
+    Returns:
+        受影响会话的最终文档（None 表示已删除）
+    """
+    docs: Dict[str, Optional[Dict]] = {}
+    for path in segments:
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # 崩溃时写了一半的尾行
+                sid = record["s"]
+                if sid not in docs:
+                    docs[sid] = load_base(sid)
+                docs[sid] = apply_record(docs[sid], record)
+    return docs
+
+
+def _base_loader(snapshot: Optional[SessionSnapshot]) -> Callable[[str], Optional[Dict]]:
+    """从检查点读取基准文档"""
+    def load(session_id: str) -> Optional[Dict]:
+        state = snapshot.load(session_id) if snapshot is not None else None
+        return state.model_dump(mode="json") if state is not None else None
+    return load
+
+
+def compact_journal(journal: SessionJournal, cutoff: Optional[float] = None) -> int:
+    """
+    将已关闭的日志段折叠进新检查点，并删除旧段与旧检查点
+
+    Args:
+        journal: 会话日志
+        cutoff: 最后更新时间早于该时间戳的会话不再写入检查点
+
+    Returns:
+        新检查点中的会话数，没有可折叠的日志段时返回 -1
+    """
+    upto = journal.rotate()
+    base_path, base_seq = journal.latest_checkpoint()
+    segments = journal.segments(after=base_seq, upto=upto)
+    if not segments:
+        return -1
+
+    base = SessionSnapshot(base_path) if base_path else None
+    docs = replay_segments(segments, _base_loader(base))
+
+    def records() -> Iterator[Tuple[str, float, bytes]]:
+        if base is not None:
+            for sid, last_update, blob in base.records():
+                if sid not in docs and (cutoff is None or last_update >= cutoff):
+                    yield sid, last_update, blob
+        for sid, doc in docs.items():
+            if doc is None:
+                continue
+            state = ConsultationState.model_validate(doc)
+            last_update = state.last_update.timestamp()
+            if cutoff is None or last_update >= cutoff:
+                yield sid, last_update, encode_state(state)
+
+    count = write_snapshot(journal.checkpoint_path(upto), records())
+    if base is not None:
+        base.close()
+        os.remove(base_path)
+    for path in segments:
+        os.remove(path)
+    return count
+
+
+def recover_from_journal(manager: SessionManager, journal: SessionJournal) -> int:
+    """
+    崩溃恢复：挂载最新检查点，并重放其后的日志段
+
+    Args:
+        manager: 会话管理器
+        journal: 会话日志
+
+    Returns:
+        通过重放恢复（或删除）的会话数
+    """
+    base_path, base_seq = journal.latest_checkpoint()
+    if base_path:
+        manager.restore_snapshot(base_path)
+    docs = replay_segments(journal.segments(after=base_seq), _base_loader(manager.snapshot))
+    for sid, doc in docs.items():
+        manager.adopt(sid, ConsultationState.model_validate(doc) if doc else None)
+    return len(docs)
+
+
+class JournalCompactor:
+    """后台日志压缩任务（在线程中执行，不阻塞事件循环）"""
+
+    def __init__(
+        self,
+        manager: SessionManager,
+        journal: SessionJournal,
+        interval_seconds: float = 300.0,
+    ):
+        """
+        初始化压缩任务
+
+        Args:
+            manager: 会话管理器（用于确定过期时间）
+            journal: 会话日志
+            interval_seconds: 压缩间隔（秒）
+        """
+        self.manager = manager
+        self.journal = journal
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {"compactions": 0, "last_sessions": 0, "last_duration_ms": 0.0}
+
+    def start(self) -> None:
+        """在当前事件循环中启动后台任务"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台任务"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def compact_once(self) -> int:
+        """在线程池中执行一次压缩"""
+        start = time.perf_counter()
+        cutoff = (datetime.now() - self.manager.timeout).timestamp()
+        count = await asyncio.to_thread(compact_journal, self.journal, cutoff)
+        if count >= 0:
+            self._stats["compactions"] += 1
+            self._stats["last_sessions"] = count
+            self._stats["last_duration_ms"] = (time.perf_counter() - start) * 1000
+        return count
+
+    def metrics(self) -> Dict:
+        """压缩指标"""
+        return dict(self._stats)
+
+    async def _run(self) -> None:
+        """后台循环"""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.compact_once()
+            except Exception:
+                logger.exception("会话日志压缩失败")
@@ -0,0 +1,88 @@
+# app/services/core/session_locks.py
+import asyncio
+import threading
+import zlib
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Tuple
+
+
+class _LockEntry:
+    """单个会话的锁及引用计数"""
+
+    __slots__ = ("lock", "refs")
+
+    def __init__(self):
+        self.lock = asyncio.Lock()
+        self.refs = 0
+
+
+class SessionLockRegistry:
+    """按会话 ID 分配的异步锁注册表
+
+    同一会话的多个请求串行执行，不同会话互不阻塞。
+    注册表按会话 ID 哈希分段（lock striping），每段由独立的线程锁保护
+    字典的增删，没有等待者的锁会立即回收。
+
+    注意：锁只在当前进程内有效，多 worker 部署时跨进程的同会话并发
+    需依赖粘性路由或存储层自身的并发控制。
+    """
+
+    def __init__(self, stripes: int = 64):
+        """
+        初始化注册表
+
+        Args:
+            stripes: 分段数
+        """
+        self._stripes: List[Tuple[threading.Lock, Dict[str, _LockEntry]]] = [
+            (threading.Lock(), {}) for _ in range(stripes)
+        ]
+
+    def __len__(self) -> int:
+        return sum(len(entries) for _, entries in self._stripes)
+
+    @asynccontextmanager
+    async def lock(self, session_id: str) -> AsyncIterator[None]:
+        """
+        获取会话锁
+
+        Args:
+            session_id: 会话 ID
+        """
+        guard, entries = self._stripe(session_id)
+        with guard:
+            entry = entries.get(session_id)
+            if entry is None:
+                entry = entries[session_id] = _LockEntry()
+            entry.refs += 1
+        try:
+            async with entry.lock:
+                yield
+        finally:
+            with guard:
+                entry.refs -= 1
+                if entry.refs == 0 and entries.get(session_id) is entry:
+                    del entries[session_id]
+
+    def is_locked(self, session_id: str) -> bool:
+        """会话当前是否有请求在处理或等待"""
+        guard, entries = self._stripe(session_id)
+        with guard:
+            return session_id in entries
+
+    def discard(self, session_id: str) -> None:
+        """
+        会话过期时回收空闲锁（仍被持有的锁由最后一个持有者回收）
+
+        Args:
+            session_id: 会话 ID
+        """
+        guard, entries = self._stripe(session_id)
+        with guard:
+            entry = entries.get(session_id)
+            if entry is not None and entry.refs == 0:
+                del entries[session_id]
+
+    def _stripe(self, session_id: str) -> Tuple[threading.Lock, Dict[str, _LockEntry]]:
+        """定位会话所在分段"""
+        return self._stripes[zlib.crc32(session_id.encode("utf-8")) % len(self._stripes)]
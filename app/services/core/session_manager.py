@@ -1,22 +1,57 @@
 # app/services/session_manager.py
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Callable, Iterator, List, Optional, Set, Tuple
 import uuid
 from app.models.consultation_state import ConsultationState
+from app.services.storage import MemorySessionStore, SessionStore
+from app.services.storage.journal import SessionJournal
+from app.services.storage.snapshot import SessionSnapshot, encode_state, write_snapshot
 
 
 class SessionManager:
-    """内存会话管理器，支持自动过期清理"""
-
-    def __init__(self, timeout_minutes: int = 30):
+    """会话管理器，支持可插拔存储与自动过期清理"""
+
+    def __init__(
+        self,
+        timeout_minutes: int = 30,
+        cleanup_on_access: bool = True,
+        store: Optional[SessionStore] = None,
+        journal: Optional[SessionJournal] = None,
+    ):
         """
         初始化会话管理器
 
         Args:
             timeout_minutes: 会话超时时间（分钟）
+            cleanup_on_access: 是否在请求路径上清理过期会话；
+                由后台 SessionSweeper 负责清理时应设为 False
+            store: 会话存储后端，默认使用进程内存储
+            journal: 可选的增量日志，每次 update 追加一条变更记录
         """
-        self.sessions: Dict[str, ConsultationState] = {}
+        self.store = store if store is not None else MemorySessionStore()
         self.timeout = timedelta(minutes=timeout_minutes)
+        self.cleanup_on_access = cleanup_on_access
+        self._eviction_listeners: List[Callable[[str], None]] = []
+        # 启动时恢复的快照，会话在首次访问时才加载
+        self._snapshot: Optional[SessionSnapshot] = None
+        self._hydrated: Set[str] = set()
+        self.journal = journal
+        if journal is not None:
+            self.add_eviction_listener(journal.forget)
+
+    @property
+    def snapshot(self) -> Optional[SessionSnapshot]:
+        """当前挂载的快照"""
+        return self._snapshot
+
+    def add_eviction_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        注册会话过期回调
+
+        Args:
+            listener: 以被清理的会话 ID 调用的回调
+        """
+        self._eviction_listeners.append(listener)
 
     def get_or_create(self, session_id: Optional[str] = None) -> ConsultationState:
         """
@@ -28,17 +63,26 @@ class SessionManager:
         Returns:
             会话状态对象
         """
-        self._cleanup_expired()
-
-        if session_id and session_id in self.sessions:
-            # 刷新最后更新时间
-            self.sessions[session_id].last_update = datetime.now()
-            return self.sessions[session_id]
+        if self.cleanup_on_access:
+            self._cleanup_expired()
+
+        state = self._load(session_id) if session_id else None
+        if state is not None and self._is_expired(state):
+            # 后台清理尚未处理到的过期会话同样视为不存在
+            self.store.delete(session_id)
+            self._notify_evicted([session_id])
+            state = None
+
+        if state is not None:
+            # 刷新最后更新时间（写入可由存储缓冲，随 update 一并提交）
+            state.last_update = datetime.now()
+            self.store.put(session_id, state)
+            return state
 
         # 创建新会话
-        new_id = session_id or self._generate_id()
+        new_id = session_id or self.new_session_id()
         new_state = ConsultationState(session_id=new_id)
-        self.sessions[new_id] = new_state
+        self.store.put(new_id, new_state)
         return new_state
 
     def update(self, session_id: str, state: ConsultationState) -> None:
@@ -49,7 +93,11 @@ class SessionManager:
             session_id: 会话 ID
             state: 新的会话状态
         """
-        self.sessions[session_id] = state
+        self.store.put(session_id, state)
+        # 一轮对话结束时提交，保证其他 worker 能读到最新状态
+        self.store.flush()
+        if self.journal is not None:
+            self.journal.record(session_id, state)
 
     def get(self, session_id: str) -> Optional[ConsultationState]:
         """
@@ -61,18 +109,113 @@ class SessionManager:
         Returns:
             会话状态对象，不存在返回 None
         """
-        return self.sessions.get(session_id)
+        return self._load(session_id)
+
+    def restore_snapshot(self, path: str) -> int:
+        """
+        挂载快照，会话在首次访问时惰性加载
+
+        Args:
+            path: 快照路径
+
+        Returns:
+            快照中的会话数
+        """
+        self._close_snapshot()
+        self._snapshot = SessionSnapshot(path)
+        return len(self._snapshot)
+
+    def adopt(self, session_id: str, state: Optional[ConsultationState]) -> None:
+        """
+        以外部恢复出的状态（如日志重放结果）覆盖快照中的版本
+
+        Args:
+            session_id: 会话 ID
+            state: 恢复出的会话状态，None 表示会话已删除
+        """
+        self._hydrated.add(session_id)
+        if state is not None:
+            self.store.put(session_id, state)
+
+    def save_snapshot(self, path: str) -> int:
+        """
+        将全部存活会话（含尚未加载的快照会话）写入快照
+
+        Args:
+            path: 快照路径
+
+        Returns:
+            写入的会话数
+        """
+        self.store.flush()
+        count = write_snapshot(path, self._snapshot_records())
+        self._close_snapshot()
+        return count
+
+    def sweep_expired(self, limit: Optional[int] = None) -> List[str]:
+        """
+        清理过期会话（由存储后端按最后更新时间索引删除）
+
+        Args:
+            limit: 本次最多清理的会话数，None 表示全部
+
+        Returns:
+            被清理的会话 ID 列表
+        """
+        cutoff = (datetime.now() - self.timeout).timestamp()
+        expired = self.store.expire(cutoff, limit=limit)
+        self._notify_evicted(expired)
+        return expired
 
     def _cleanup_expired(self) -> None:
         """清理过期会话"""
-        now = datetime.now()
-        expired = [
-            sid for sid, state in self.sessions.items()
-            if now - state.last_update > self.timeout
-        ]
-        for sid in expired:
-            del self.sessions[sid]
-
-    def _generate_id(self) -> str:
+        self.sweep_expired()
+
+    def _load(self, session_id: str) -> Optional[ConsultationState]:
+        """读取会话，存储中没有时从快照加载"""
+        state = self.store.get(session_id)
+        if state is not None or self._snapshot is None:
+            return state
+        if session_id in self._hydrated:
+            return None
+        self._hydrated.add(session_id)
+        state = self._snapshot.load(session_id)
+        if state is not None:
+            self.store.put(session_id, state)
+        return state
+
+    def _snapshot_records(self) -> Iterator[Tuple[str, float, bytes]]:
+        """依次产出存储中的会话和快照中未加载且未过期的会话"""
+        cutoff = (datetime.now() - self.timeout).timestamp()
+        for sid in self.store:
+            state = self.store.get(sid)
+            if state is not None and not self._is_expired(state):
+                yield sid, state.last_update.timestamp(), encode_state(state)
+        if self._snapshot is None:
+            return
+        for sid, last_update, blob in self._snapshot.records():
+            if last_update < cutoff or sid in self._hydrated or sid in self.store:
+                continue
+            # 未被访问过的会话直接复制压缩记录，无需反序列化
+            yield sid, last_update, blob
+
+    def _close_snapshot(self) -> None:
+        """释放当前挂载的快照"""
+        if self._snapshot is not None:
+            self._snapshot.close()
+        self._snapshot = None
+        self._hydrated.clear()
+
+    def _notify_evicted(self, session_ids: List[str]) -> None:
+        """通知过期回调"""
+        for listener in self._eviction_listeners:
+            for sid in session_ids:
+                listener(sid)
+
+    def _is_expired(self, state: ConsultationState) -> bool:
+        """判断会话是否已过期"""
+        return datetime.now() - state.last_update > self.timeout
+
+    def new_session_id(self) -> str:
         """生成唯一会话 ID"""
         return str(uuid.uuid4())
@@ -0,0 +1,111 @@
+# app/services/core/session_sweeper.py
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from app.services.core.session_manager import SessionManager
+
+logger = logging.getLogger(__name__)
+
+
+class SessionSweeper:
+    """后台会话清理任务
+
+    按固定间隔分批清理过期会话，批次之间让出事件循环，
+    使请求处理路径不再承担清理开销。
+    """
+
+    def __init__(
+        self,
+        manager: SessionManager,
+        interval_seconds: float = 30.0,
+        batch_size: int = 500,
+    ):
+        """
+        初始化清理任务
+
+        Args:
+            manager: 会话管理器
+            interval_seconds: 两次清理之间的间隔（秒）
+            batch_size: 单批最多清理的会话数
+        """
+        self.manager = manager
+        self.interval_seconds = interval_seconds
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "sweeps": 0,
+            "evicted_total": 0,
+            "last_evicted": 0,
+            "last_duration_ms": 0.0,
+            "max_duration_ms": 0.0,
+        }
+
+    @property
+    def running(self) -> bool:
+        """清理任务是否在运行"""
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """在当前事件循环中启动后台任务"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台任务并等待其退出"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def sweep_once(self) -> int:
+        """
+        执行一轮清理
+
+        Returns:
+            本轮清理的会话数
+        """
+        start = time.perf_counter()
+        evicted = 0
+        while True:
+            batch = self.manager.sweep_expired(limit=self.batch_size)
+            evicted += len(batch)
+            if len(batch) < self.batch_size:
+                break
+            # 批次之间让出事件循环，避免阻塞请求
+            await asyncio.sleep(0)
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        self._stats["sweeps"] += 1
+        self._stats["evicted_total"] += evicted
+        self._stats["last_evicted"] = evicted
+        self._stats["last_duration_ms"] = duration_ms
+        self._stats["max_duration_ms"] = max(self._stats["max_duration_ms"], duration_ms)
+        return evicted
+
+    def metrics(self) -> Dict:
+        """
+        获取清理指标
+
+        Returns:
+            清理次数、清理数量、耗时及当前会话数
+        """
+        return {
+            **self._stats,
+            "running": self.running,
+            "live_sessions": len(self.manager.store),
+        }
+
+    async def _run(self) -> None:
+        """后台循环"""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.sweep_once()
+            except Exception:
+                logger.exception("会话清理失败")
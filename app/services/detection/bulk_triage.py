@@ -0,0 +1,205 @@
+# app/services/detection/bulk_triage.py
+"""历史问诊记录批量重新分诊
+
+输入为 JSONL 语料，每行一条记录，支持两种形式：
+- {"id": ..., "text": "..."}
+- 会话导出 {"session_id": ..., "conversation_history": [...], "emergency_flag": false}
+  （只检测用户发言，兼容 [role, text] 记录与旧版前缀字符串）
+
+语料按块流式读取并分发到进程池，每个进程只编译一次词表；输出与输入顺序一致，
+在途块数有上限，内存占用与语料规模无关。
+"""
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from app.models.conversation import Role, parse_turn
+from app.services.detection.emergency_detection import (
+    LEVEL_SEVERITY,
+    EmergencyDetectionService,
+    EmergencyLevel,
+)
+from app.services.lexicon import LexiconRegistry
+
+# 以前已判定为紧急的级别
+_FLAGGED_LEVELS = {EmergencyLevel.RED.value, EmergencyLevel.YELLOW.value}
+
+
+@dataclass
+class TriageReport:
+    """批量分诊汇总"""
+    records: int = 0
+    errors: int = 0
+    levels: Dict[str, int] = field(default_factory=lambda: {l.value: 0 for l in EmergencyLevel})
+    missed_escalations: int = 0
+    elapsed_seconds: float = 0.0
+    lexicon_version: str = ""
+
+    def merge(self, other: "TriageReport") -> None:
+        """合并另一块的统计"""
+        self.records += other.records
+        self.errors += other.errors
+        self.missed_escalations += other.missed_escalations
+        for level, count in other.levels.items():
+            self.levels[level] += count
+        self.lexicon_version = other.lexicon_version or self.lexicon_version
+
+    def to_dict(self) -> Dict:
+        """转为可序列化的字典"""
+        report = asdict(self)
+        report["records_per_second"] = (
+            round(self.records / self.elapsed_seconds, 1) if self.elapsed_seconds else None
+        )
+        return report
+
+
+def triage_record(record: Dict, service: EmergencyDetectionService) -> EmergencyLevel:
+    """
+    判定单条记录的紧急程度（多轮对话取最高等级）
+
+    Args:
+        record: 语料记录
+        service: 紧急检测服务
+
+    Returns:
+        紧急程度
+    """
+    if "text" in record:
+        return service.classify(record["text"])
+
+    level = EmergencyLevel.GREEN
+    history = record.get("conversation_history", [])
+    if isinstance(history, dict):
+        history = history.get("turns", [])
+    for item in history:
+        turn = parse_turn(item)
+        if turn.role == Role.ASSISTANT:
+            continue
+        found = service.classify(turn.text)
+        if LEVEL_SEVERITY[found] > LEVEL_SEVERITY[level]:
+            level = found
+            if level == EmergencyLevel.RED:
+                break
+    return level
+
+
+def triage_lines(
+    start: int,
+    lines: List[str],
+    service: EmergencyDetectionService
+) -> Tuple[List[str], TriageReport]:
+    """
+    分诊一块语料
+
+    Args:
+        start: 块首行的行号（记录无 ID 时作为 ID）
+        lines: JSONL 行
+        service: 紧急检测服务
+
+    Returns:
+        (输出行, 本块统计)
+    """
+    report = TriageReport(lexicon_version=service.lexicons.current.version)
+    output = []
+    for number, line in enumerate(lines, start):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            level = triage_record(record, service)
+        except (ValueError, TypeError, AttributeError):
+            report.errors += 1
+            continue
+        was_flagged = bool(record.get("emergency_flag")) or record.get("level") in _FLAGGED_LEVELS
+        missed = level != EmergencyLevel.GREEN and not was_flagged
+        report.records += 1
+        report.levels[level.value] += 1
+        report.missed_escalations += missed
+        record_id = record.get("id", record.get("session_id", number))
+        output.append(json.dumps(
+            {"id": record_id, "level": level.value, "missed": missed}, ensure_ascii=False
+        ))
+    return output, report
+
+
+# 工作进程内的检测服务（进程初始化时创建一次）
+_worker_service: Optional[EmergencyDetectionService] = None
+
+
+def _init_worker(lexicon_path: Optional[str]) -> None:
+    """工作进程初始化：加载并编译词表"""
+    global _worker_service
+    _worker_service = _make_service(lexicon_path)
+
+
+def _triage_chunk(start: int, lines: List[str]) -> Tuple[List[str], TriageReport]:
+    """工作进程入口"""
+    return triage_lines(start, lines, _worker_service)
+
+
+def _make_service(lexicon_path: Optional[str]) -> EmergencyDetectionService:
+    """按指定词表文件（为空使用全局词表）创建检测服务"""
+    return EmergencyDetectionService(LexiconRegistry(lexicon_path) if lexicon_path else None)
+
+
+def _chunks(lines: Iterable[str], chunk_size: int) -> Iterator[Tuple[int, List[str]]]:
+    """按块切分输入，产出 (首行行号, 行列表)"""
+    iterator = iter(lines)
+    start = 1
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def bulk_triage(
+    lines: Iterable[str],
+    output: TextIO,
+    workers: int = 1,
+    chunk_size: int = 1000,
+    lexicon_path: Optional[str] = None,
+) -> TriageReport:
+    """
+    批量重新分诊
+
+    Args:
+        lines: JSONL 语料行（可为文件对象，流式读取）
+        output: 逐条结果的写入目标（JSONL）
+        workers: 进程数，1 表示在当前进程执行
+        chunk_size: 每块行数
+        lexicon_path: 词表文件，为空使用当前生效的词表
+
+    Returns:
+        汇总统计
+    """
+    started = time.perf_counter()
+    report = TriageReport()
+
+    def consume(result: Tuple[List[str], TriageReport]) -> None:
+        rows, chunk_report = result
+        for row in rows:
+            output.write(row + "\n")
+        report.merge(chunk_report)
+
+    if workers <= 1:
+        service = _make_service(lexicon_path)
+        for start, chunk in _chunks(lines, chunk_size):
+            consume(triage_lines(start, chunk, service))
+    else:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(lexicon_path,)) as pool:
+            pending = deque()
+            for start, chunk in _chunks(lines, chunk_size):
+                pending.append(pool.submit(_triage_chunk, start, chunk))
+                if len(pending) >= workers * 2:
+                    consume(pending.popleft().result())
+            while pending:
+                consume(pending.popleft().result())
+
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
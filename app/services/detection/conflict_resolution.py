@@ -3,6 +3,8 @@ from enum import Enum
 from dataclasses import dataclass
 from typing import Optional, Dict
 
+from app.services.lexicon import LexiconRegistry, default_registry
+
 
 class ConflictRisk(Enum):
     """冲突风险等级"""
@@ -26,13 +28,22 @@ class ConflictResolutionService:
     # 高风险字段
     HIGH_RISK_FIELDS = ["allergies", "past_history", "medications"]
 
-    # 矛盾指示词
-    CONTRADICTION_INDICATORS = [
-        "不是", "不对", "没有", "无", "否",
-        "其实", "应该是", "准确说是"
-    ]
+    def __init__(self, lexicons: Optional[LexiconRegistry] = None):
+        """
+        初始化服务
 
-    def detect(self, existing_data: Dict, new_input: str, field_name: str) -> Optional[Conflict]:
+        Args:
+            lexicons: 词表注册表（矛盾指示词见词表 contradiction 段），默认使用全局词表
+        """
+        self.lexicons = lexicons or default_registry()
+
+    def detect(
+        self,
+        existing_data: Dict,
+        new_input: str,
+        field_name: str,
+        has_contradiction: Optional[bool] = None
+    ) -> Optional[Conflict]:
         """
         检测冲突
 
@@ -40,6 +51,7 @@ class ConflictResolutionService:
             existing_data: 已采集的数据
             new_input: 新输入
             field_name: 字段名
+            has_contradiction: 预先分析得到的矛盾标记，为空时自行扫描新输入
 
         Returns:
             冲突对象，无冲突返回 None
@@ -50,10 +62,8 @@ class ConflictResolutionService:
         existing_value = str(existing_data[field_name])
 
         # 简单冲突检测：检查是否包含矛盾指示词
-        has_contradiction = any(
-            indicator in new_input
-            for indicator in self.CONTRADICTION_INDICATORS
-        )
+        if has_contradiction is None:
+            has_contradiction = self.lexicons.current.matcher("contradiction").contains_any(new_input)
 
         if not has_contradiction:
             return None
@@ -1,7 +1,9 @@
 # app/services/emergency_detection.py
 from enum import Enum
 from dataclasses import dataclass
-from typing import List
+from typing import Optional, Set
+
+from app.services.lexicon import LexiconRegistry, default_registry
 
 
 class EmergencyLevel(Enum):
@@ -11,6 +13,10 @@ class EmergencyLevel(Enum):
     GREEN = "green"   # 绿色预警：常规问诊
 
 
+# 等级由低到高的严重程度
+LEVEL_SEVERITY = {EmergencyLevel.GREEN: 0, EmergencyLevel.YELLOW: 1, EmergencyLevel.RED: 2}
+
+
 @dataclass
 class EmergencyDetectionResult:
     """紧急检测结果"""
@@ -22,21 +28,14 @@ class EmergencyDetectionResult:
 class EmergencyDetectionService:
     """紧急症状检测服务"""
 
-    # 红色预警关键词
-    RED_FLAGS = [
-        "胸痛", "胸闷", "心慌",
-        "呼吸困难", "呼吸急促", "喘不上气",
-        "意识模糊", "昏迷", "昏厥",
-        "大出血", "大量出血",
-        "剧烈疼痛", "无法忍受"
-    ]
-
-    # 黄色预警关键词
-    YELLOW_FLAGS = [
-        "高热", "高烧", "发烧40度", "发烧39度",
-        "严重脱水", "虚脱",
-        "持续呕吐", "无法进食"
-    ]
+    def __init__(self, lexicons: Optional[LexiconRegistry] = None):
+        """
+        初始化服务
+
+        Args:
+            lexicons: 词表注册表（红/黄预警词见词表 emergency 段），默认使用全局词表
+        """
+        self.lexicons = lexicons or default_registry()
 
     def detect(self, text: str) -> EmergencyDetectionResult:
         """
@@ -48,16 +47,55 @@ class EmergencyDetectionService:
         Returns:
             紧急检测结果
         """
-        # 检查红色预警
-        if self._contains_any(text, self.RED_FLAGS):
+        return self.assess(self.classify(text))
+
+    def classify(self, text: str) -> EmergencyLevel:
+        """
+        只判定紧急程度（批量分诊等不需要建议文本的场景）
+
+        Args:
+            text: 用户输入文本
+
+        Returns:
+            紧急程度
+        """
+        return self.level_for(self.lexicons.current.matcher("emergency").labels(text))
+
+    def level_for(self, labels: Set[str]) -> EmergencyLevel:
+        """
+        由命中的词表标签确定紧急程度
+
+        Args:
+            labels: 命中的 emergency 词表标签
+
+        Returns:
+            紧急程度（红色优先于黄色）
+        """
+        for level in (EmergencyLevel.RED, EmergencyLevel.YELLOW):
+            if level.value in labels:
+                return level
+        return EmergencyLevel.GREEN
+
+    def assess(self, level: EmergencyLevel) -> EmergencyDetectionResult:
+        """
+        生成紧急程度对应的检测结果
+
+        Args:
+            level: 紧急程度
+
+        Returns:
+            紧急检测结果
+        """
+        # 红色预警
+        if level == EmergencyLevel.RED:
             return EmergencyDetectionResult(
                 is_emergency=True,
                 level=EmergencyLevel.RED,
                 recommendation=self._get_red_recommendation()
             )
 
-        # 检查黄色预警
-        if self._contains_any(text, self.YELLOW_FLAGS):
+        # 黄色预警
+        if level == EmergencyLevel.YELLOW:
             return EmergencyDetectionResult(
                 is_emergency=True,
                 level=EmergencyLevel.YELLOW,
@@ -71,10 +109,6 @@ class EmergencyDetectionService:
             recommendation=""
         )
 
-    def _contains_any(self, text: str, keywords: List[str]) -> bool:
-        """检查文本是否包含任何关键词"""
-        return any(keyword in text for keyword in keywords)
-
     def _get_red_recommendation(self) -> str:
         """获取红色预警建议"""
         return "您描述的症状需要立即就医，建议您立即前往最近医院的急诊科就诊。如有需要，请拨打120急救电话。"
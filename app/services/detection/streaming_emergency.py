@@ -0,0 +1,62 @@
+# app/services/detection/streaming_emergency.py
+from typing import Optional
+
+from app.services.detection.emergency_detection import (
+    LEVEL_SEVERITY,
+    EmergencyDetectionResult,
+    EmergencyDetectionService,
+    EmergencyLevel,
+)
+
+
+class StreamingEmergencyDetector:
+    """流式紧急检测
+
+    语音转写或输入中的文本按分片送入，匹配器状态跨分片保留，
+    预警词在某个分片内一完整出现就立即给出结果，无需等待整句结束。
+    """
+
+    def __init__(self, service: Optional[EmergencyDetectionService] = None):
+        """
+        初始化检测器（一个检测器对应一段输入）
+
+        Args:
+            service: 紧急检测服务，默认新建；整段输入使用开始时生效的词表
+        """
+        self.service = service or EmergencyDetectionService()
+        self._stream = self.service.lexicons.current.matcher("emergency").stream()
+        self.level = EmergencyLevel.GREEN
+        self.alert_offset: Optional[int] = None
+
+    def feed(self, chunk: str) -> Optional[EmergencyDetectionResult]:
+        """
+        输入一个文本分片
+
+        Args:
+            chunk: 文本分片
+
+        Returns:
+            紧急程度升级（绿 -> 黄/红，黄 -> 红）时返回检测结果，否则 None
+        """
+        if self.level == EmergencyLevel.RED:
+            return None
+
+        escalated_at = None
+        for hit in self._stream.feed(chunk):
+            level = self.service.level_for(set(hit.labels))
+            if LEVEL_SEVERITY[level] > LEVEL_SEVERITY[self.level]:
+                self.level = level
+                escalated_at = hit.end
+        if escalated_at is None:
+            return None
+        self.alert_offset = escalated_at
+        return self.service.assess(self.level)
+
+    def result(self) -> EmergencyDetectionResult:
+        """到目前为止输入内容的检测结果"""
+        return self.service.assess(self.level)
+
+    @property
+    def consumed(self) -> int:
+        """已输入的字符数"""
+        return self._stream.position
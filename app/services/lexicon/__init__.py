@@ -0,0 +1,25 @@
+# app/services/lexicon/__init__.py
+"""词表匹配模块
+
+- keyword_matcher  多关键词 Aho-Corasick 匹配器
+- registry         从数据文件加载、编译并原子替换的词表注册表
+- watcher          词表文件变化的后台轮询
+"""
+from app.services.lexicon.keyword_matcher import KeywordMatch, KeywordMatcher
+from app.services.lexicon.registry import (
+    CompiledLexicons,
+    LexiconRegistry,
+    compile_lexicons,
+    default_registry,
+)
+from app.services.lexicon.watcher import LexiconWatcher
+
+__all__ = [
+    "CompiledLexicons",
+    "KeywordMatch",
+    "KeywordMatcher",
+    "LexiconRegistry",
+    "LexiconWatcher",
+    "compile_lexicons",
+    "default_registry",
+]
@@ -0,0 +1,179 @@
+# app/services/lexicon/keyword_matcher.py
+"""多模式关键词匹配（Aho-Corasick 自动机）
+
+将整张词表编译为一个自动机，对输入文本只做一次线性扫描即可找到所有命中
+（包括重叠命中）及其位置，扫描成本与词表大小无关。
+"""
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Mapping, Set, Tuple, Union
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    """一次关键词命中"""
+    start: int
+    end: int
+    keyword: str
+    labels: Tuple[str, ...]
+
+
+class KeywordMatcher:
+    """编译后的多关键词匹配器"""
+
+    def __init__(self, keywords: Union[Iterable[str], Mapping[str, Iterable[str]]]):
+        """
+        编译词表
+
+        Args:
+            keywords: 关键词序列，或 关键词 -> 标签序列 的映射；
+                关键词的先后顺序即 matched() 的输出顺序
+        """
+        if isinstance(keywords, Mapping):
+            items = [(k, tuple(labels)) for k, labels in keywords.items()]
+        else:
+            items = [(k, ()) for k in dict.fromkeys(keywords)]
+        self._keywords: List[str] = [k for k, _ in items if k]
+        self._labels: List[Tuple[str, ...]] = [labels for k, labels in items if k]
+        self._index: Dict[str, int] = {k: i for i, k in enumerate(self._keywords)}
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Tuple[int, ...]] = [()]
+        for index, keyword in enumerate(self._keywords):
+            self._insert(keyword, index)
+        self._link()
+
+    @classmethod
+    def from_groups(cls, groups: Mapping[str, Iterable[str]]) -> "KeywordMatcher":
+        """
+        由 标签 -> 关键词列表 构造匹配器（同一关键词可属于多个标签）
+
+        Args:
+            groups: 分组词表
+
+        Returns:
+            匹配器
+        """
+        labelled: Dict[str, List[str]] = {}
+        for label, keywords in groups.items():
+            for keyword in keywords:
+                labelled.setdefault(keyword, []).append(label)
+        return cls(labelled)
+
+    def __len__(self) -> int:
+        return len(self._keywords)
+
+    def finditer(self, text: str) -> Iterator[KeywordMatch]:
+        """按结束位置依次产出全部命中"""
+        for end, index in self._scan(text):
+            keyword = self._keywords[index]
+            yield KeywordMatch(end - len(keyword), end, keyword, self._labels[index])
+
+    def matched(self, text: str) -> List[str]:
+        """文本中出现的关键词（去重，按词表顺序）"""
+        found = {index for _, index in self._scan(text)}
+        return [self._keywords[index] for index in sorted(found)]
+
+    def order(self, keywords: Iterable[str]) -> List[str]:
+        """将词表内的关键词去重并按词表顺序排列"""
+        return sorted(set(keywords), key=self._index.__getitem__)
+
+    def labels(self, text: str) -> Set[str]:
+        """文本命中的全部标签"""
+        found: Set[str] = set()
+        for _, index in self._scan(text):
+            found.update(self._labels[index])
+        return found
+
+    def stream(self) -> "KeywordStream":
+        """创建跨分片保持自动机状态的流式扫描器"""
+        return KeywordStream(self)
+
+    def contains_any(self, text: str) -> bool:
+        """文本是否包含任一关键词（命中即停止扫描）"""
+        for _ in self._scan(text):
+            return True
+        return False
+
+    def _scan(self, text: str) -> Iterator[Tuple[int, int]]:
+        """产出 (命中结束位置, 关键词序号)"""
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for position, char in enumerate(text, 1):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                yield position, index
+
+    def _insert(self, keyword: str, index: int) -> None:
+        """将关键词插入字典树"""
+        state = 0
+        for char in keyword:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = nxt
+        self._out[state] += (index,)
+
+    def _link(self) -> None:
+        """广度优先构造失配链接，并合并后缀节点的输出"""
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] += self._out[self._fail[nxt]]
+
+
+class KeywordStream:
+    """流式扫描：逐片输入文本，关键词跨分片边界也能命中"""
+
+    def __init__(self, matcher: KeywordMatcher):
+        """
+        初始化
+
+        Args:
+            matcher: 使用的匹配器（整个流内保持不变）
+        """
+        self.matcher = matcher
+        self.position = 0
+        self._state = 0
+
+    def feed(self, chunk: str) -> List[KeywordMatch]:
+        """
+        输入一个分片
+
+        Args:
+            chunk: 文本分片
+
+        Returns:
+            在本分片内完成的命中（位置相对于整个流）
+        """
+        m = self.matcher
+        goto, fail, out = m._goto, m._fail, m._out
+        state, position = self._state, self.position
+        hits = []
+        for char in chunk:
+            position += 1
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for index in out[state]:
+                keyword = m._keywords[index]
+                hits.append(KeywordMatch(position - len(keyword), position, keyword, m._labels[index]))
+        self._state, self.position = state, position
+        return hits
+
+    def reset(self) -> None:
+        """丢弃已输入的内容，从头开始"""
+        self.position = 0
+        self._state = 0
@@ -0,0 +1,200 @@
+# app/services/lexicon/registry.py
+"""可热更新的医学词表
+
+词表来自带版本号的 JSON 数据文件（默认 data/lexicons.json），加载时一次性
+编译为各服务使用的匹配器并组成不可变的 CompiledLexicons；重新加载在后台
+线程完成，随后整体替换引用，请求始终读到完整的某一版词表。
+编译结果按文件内容摘要缓存到磁盘，worker 冷启动时直接读取，无需重新编译。
+"""
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.lexicon.keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+BUNDLED_PATH = os.path.join(os.path.dirname(__file__), "data", "lexicons.json")
+# 编译格式变化时递增，使旧的磁盘缓存失效
+COMPILER_VERSION = 1
+
+# 分组词表：{标签: [关键词]}
+GROUPED_SECTIONS = ("emergency", "emotion", "intent", "certainty")
+REQUIRED_SECTIONS = GROUPED_SECTIONS + (
+    "contradiction", "symptom_priority", "symptom_synonyms", "terminology", "extraction",
+)
+
+
+@dataclass(frozen=True)
+class CompiledLexicons:
+    """某一版本词表及其编译后的匹配器"""
+    version: str
+    digest: str
+    data: Dict[str, Any]
+    matchers: Dict[str, KeywordMatcher]
+
+    def __getitem__(self, section: str) -> Any:
+        return self.data[section]
+
+    def matcher(self, name: str) -> KeywordMatcher:
+        """按名称获取匹配器（各词表段名，以及合并的 "analysis"）"""
+        return self.matchers[name]
+
+
+def compile_lexicons(data: Dict[str, Any], digest: str = "") -> CompiledLexicons:
+    """
+    校验并编译词表
+
+    Args:
+        data: 词表文件内容
+        digest: 文件内容摘要
+
+    Returns:
+        编译结果
+
+    Raises:
+        ValueError: 缺少必需的词表段
+    """
+    missing = [name for name in REQUIRED_SECTIONS if name not in data]
+    if missing or "version" not in data:
+        raise ValueError(f"词表文件缺少字段: {', '.join(missing or ['version'])}")
+
+    symptom_keywords = [*data["symptom_priority"], *data["symptom_synonyms"]]
+    extraction = data["extraction"]
+    matchers = {name: KeywordMatcher.from_groups(data[name]) for name in GROUPED_SECTIONS}
+    matchers["contradiction"] = KeywordMatcher(data["contradiction"])
+    matchers["symptom"] = KeywordMatcher(symptom_keywords)
+    matchers["extraction"] = KeywordMatcher([*extraction["symptoms"], *extraction["chronic_diseases"]])
+
+    # 统一分析使用的合并匹配器，标签形如 "服务:标签"
+    groups: Dict[str, List[str]] = {}
+    for name in GROUPED_SECTIONS:
+        for label, keywords in data[name].items():
+            groups[f"{name}:{label}"] = keywords
+    groups["contradiction:"] = data["contradiction"]
+    groups["symptom:"] = symptom_keywords
+    matchers["analysis"] = KeywordMatcher.from_groups(groups)
+
+    return CompiledLexicons(str(data["version"]), digest, data, matchers)
+
+
+class LexiconRegistry:
+    """词表注册表，持有当前生效的 CompiledLexicons"""
+
+    def __init__(self, path: str = BUNDLED_PATH, cache_dir: Optional[str] = None):
+        """
+        初始化并加载词表
+
+        Args:
+            path: 词表数据文件路径
+            cache_dir: 编译结果缓存目录，为空不缓存
+        """
+        self.path = path
+        self.cache_dir = cache_dir
+        self._lock = threading.Lock()
+        self._signature: Optional[Tuple[float, int]] = None
+        self._stats = {"reloads": 0, "cache_hits": 0}
+        self._current = self._load()
+
+    @property
+    def current(self) -> CompiledLexicons:
+        """当前生效的词表（整体替换，读取无需加锁）"""
+        return self._current
+
+    def reload(self) -> CompiledLexicons:
+        """
+        重新读取并编译词表，成功后原子替换
+
+        Raises:
+            ValueError: 文件内容无效（当前词表保持不变）
+        """
+        with self._lock:
+            compiled = self._load()
+            self._current = compiled
+            self._stats["reloads"] += 1
+            return compiled
+
+    def reload_if_changed(self) -> bool:
+        """文件修改时间或大小变化时重新加载，返回是否发生替换"""
+        if self._file_signature() == self._signature:
+            return False
+        previous = self._current.digest
+        return self.reload().digest != previous
+
+    def metrics(self) -> Dict:
+        """词表版本与加载统计"""
+        return {"version": self._current.version, "digest": self._current.digest[:12], **self._stats}
+
+    def _load(self) -> CompiledLexicons:
+        """读取文件，优先使用磁盘缓存的编译结果"""
+        signature = self._file_signature()
+        with open(self.path, "rb") as f:
+            raw = f.read()
+        digest = hashlib.sha256(raw + bytes([COMPILER_VERSION])).hexdigest()
+
+        cache_path = (
+            os.path.join(self.cache_dir, f"lexicons-{digest[:16]}.pkl") if self.cache_dir else None
+        )
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, "rb") as f:
+                    compiled = pickle.load(f)
+                if not isinstance(compiled, CompiledLexicons):
+                    raise TypeError(f"缓存内容不是编译后的词表: {type(compiled).__name__}")
+                self._stats["cache_hits"] += 1
+                self._signature = signature
+                return compiled
+            except Exception:
+                logger.warning("词表缓存损坏或无法读取，重新编译: %s", cache_path, exc_info=True)
+
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"词表文件不是有效的 JSON: {self.path}") from exc
+        compiled = compile_lexicons(data, digest)
+        if cache_path:
+            self._write_cache(cache_path, compiled)
+        self._signature = signature
+        return compiled
+
+    def _write_cache(self, cache_path: str, compiled: CompiledLexicons) -> None:
+        """原子写入编译缓存（失败只记录日志：缓存只是加速，不影响加载）"""
+        tmp_path = None
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # 多个 worker 同时冷启动时各自写独立的临时文件
+            fd, tmp_path = tempfile.mkstemp(suffix=".tmp", dir=self.cache_dir)
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, cache_path)
+        except Exception:
+            logger.warning("词表编译缓存写入失败: %s", cache_path, exc_info=True)
+            if tmp_path and os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _file_signature(self) -> Tuple[float, int]:
+        """文件修改时间与大小"""
+        stat = os.stat(self.path)
+        return stat.st_mtime, stat.st_size
+
+
+_default_registry: Optional[LexiconRegistry] = None
+_default_lock = threading.Lock()
+
+
+def default_registry() -> LexiconRegistry:
+    """进程级默认词表注册表（按配置惰性创建）"""
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = LexiconRegistry(
+                settings.lexicon_path or BUNDLED_PATH, settings.lexicon_cache_dir
+            )
+        return _default_registry
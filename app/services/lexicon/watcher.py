@@ -0,0 +1,54 @@
+# app/services/lexicon/watcher.py
+import asyncio
+import logging
+from typing import Optional
+
+from app.services.lexicon.registry import LexiconRegistry
+
+logger = logging.getLogger(__name__)
+
+
+class LexiconWatcher:
+    """后台轮询词表文件，变化时在线程中重新编译并替换"""
+
+    def __init__(self, registry: LexiconRegistry, interval_seconds: float = 30.0):
+        """
+        初始化轮询任务
+
+        Args:
+            registry: 词表注册表
+            interval_seconds: 检查间隔（秒）
+        """
+        self.registry = registry
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        """在当前事件循环中启动后台任务"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """停止后台任务"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def check_once(self) -> bool:
+        """检查一次，返回词表是否被替换"""
+        return await asyncio.to_thread(self.registry.reload_if_changed)
+
+    async def _run(self) -> None:
+        """后台循环；新词表无效时记录日志并保留当前版本"""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                if await self.check_once():
+                    logger.info("词表已更新到版本 %s", self.registry.current.version)
+            except Exception:
+                logger.exception("词表重新加载失败，继续使用版本 %s", self.registry.current.version)
@@ -0,0 +1,35 @@
+# app/services/llm/__init__.py
+"""大模型服务模块
+
+- schema     结构化提取的字段定义、提示词与输出解析
+- client     OpenAI 兼容接口的异步提取客户端（共享连接池、限制并发）
+- batcher    短窗口内的并发任务合并为一批交给批处理函数的调度器
+- context    按 token 预算构造模型上下文（已采集信息摘要 + 最近对话）
+- resilience 熔断器与随请求传递的截止时间
+- extractor  病历字段提取入口（大模型或关键词提取，失败时降级）
+- refiner    先返回关键词提取的病历，后台用大模型精修并写回会话
+"""
+from app.services.llm.batcher import MicroBatcher
+from app.services.llm.client import ExtractionJob, LLMExtractionClient, LLMExtractionError
+from app.services.llm.context import ContextBuilder, ModelContext, estimate_tokens
+from app.services.llm.extractor import ExtractionOutcome, RecordExtractor
+from app.services.llm.refiner import RecordRefiner, field_conflicts
+from app.services.llm.resilience import CircuitBreaker, deadline, remaining, stage_timeout
+
+__all__ = [
+    "CircuitBreaker",
+    "ContextBuilder",
+    "ExtractionJob",
+    "ExtractionOutcome",
+    "LLMExtractionClient",
+    "LLMExtractionError",
+    "MicroBatcher",
+    "ModelContext",
+    "RecordExtractor",
+    "RecordRefiner",
+    "deadline",
+    "estimate_tokens",
+    "field_conflicts",
+    "remaining",
+    "stage_timeout",
+]
@@ -0,0 +1,99 @@
+# app/services/llm/batcher.py
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class MicroBatcher(Generic[T, R]):
+    """请求合并调度
+
+    并发请求各自提交一个任务并等待结果；第一个任务到达后最多再等待 max_wait 秒，
+    期间到达的任务（至多 max_batch_size 个）合并为一批交给 dispatch 一次处理，
+    结果按顺序分发回各等待方。批次满时立即发出，不等待窗口结束。
+    dispatch 失败时，同批所有等待方收到同一异常。
+    """
+
+    def __init__(
+        self,
+        dispatch: Callable[[List[T]], Awaitable[List[R]]],
+        max_batch_size: int = 8,
+        max_wait: float = 0.01,
+    ):
+        """
+        初始化调度器
+
+        Args:
+            dispatch: 批处理函数，返回与输入顺序一致的结果
+            max_batch_size: 单批最大任务数
+            max_wait: 凑批等待窗口（秒）
+        """
+        self.dispatch = dispatch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._pending: List[Tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._inflight: set = set()
+        self.batches = 0
+        self.items = 0
+        self.largest_batch = 0
+
+    async def submit(self, item: T) -> R:
+        """
+        提交一个任务并等待其结果
+
+        Args:
+            item: 任务
+
+        Returns:
+            该任务的结果
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        """发出当前累积的任务"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+        self.batches += 1
+        self.items += len(batch)
+        self.largest_batch = max(self.largest_batch, len(batch))
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _run(self, batch: List[Tuple[T, asyncio.Future]]) -> None:
+        """执行一批并分发结果"""
+        try:
+            results = await self.dispatch([item for item, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError("批处理结果数与任务数不符")
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> Dict:
+        """批次统计"""
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else None,
+            "largest_batch": self.largest_batch,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,149 @@
+# app/services/llm/client.py
+import asyncio
+import copy
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from app.services.llm.schema import FIELD_SCHEMAS, build_messages, parse_fields, response_schema
+
+# 一个提取任务：(对话文本, 字段名)
+ExtractionJob = Tuple[str, Tuple[str, ...]]
+
+
+class LLMExtractionError(RuntimeError):
+    """模型调用失败或输出无法解析"""
+
+
+class LLMExtractionClient:
+    """基于 OpenAI 兼容接口的结构化提取客户端
+
+    进程内共享一个 HTTP 连接池（keep-alive），并发请求数由信号量限制，
+    超出的调用排队等待而不是新建连接；请求的全部字段在一次调用中返回。
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        model: str,
+        max_concurrency: int = 8,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        """
+        初始化客户端
+
+        Args:
+            base_url: 接口地址（如 https://api.openai.com/v1）
+            api_key: API 密钥
+            model: 模型名称
+            max_concurrency: 最大并发请求数（同时也是连接池大小）
+            timeout: 单次请求超时（秒）
+            transport: 自定义传输层（测试用）
+        """
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self._client = httpx.AsyncClient(
+            base_url=base_url.rstrip("/"),
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_concurrency,
+                max_keepalive_connections=max_concurrency,
+            ),
+            transport=transport,
+        )
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self.requests = 0
+        self.in_flight = 0
+
+    async def extract(self, conversation: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """
+        一次调用提取全部请求字段
+
+        Args:
+            conversation: 对话文本（已脱敏）
+            fields: 字段名，默认全部（chief_complaint, present_illness, past_history）
+
+        Returns:
+            字段 -> 属性字典，结构与关键词提取一致
+
+        Raises:
+            LLMExtractionError: 请求失败、超时或输出无法解析
+        """
+        fields = list(fields or FIELD_SCHEMAS)
+        content = await self._complete(
+            build_messages(conversation, fields), response_schema(fields)
+        )
+        return self._parse(parse_fields, content, fields)
+
+    async def extract_jobs(self, jobs: List[ExtractionJob]) -> List[Dict[str, Dict]]:
+        """
+        执行一批提取任务：同一段对话的任务合并为一次调用（字段取并集），
+        不同对话各自单独调用（不放入同一提示词），经共享连接池并发发出
+
+        Args:
+            jobs: 提取任务
+
+        Returns:
+            与任务顺序一致的结果（各任务只含自己请求的字段）
+
+        Raises:
+            LLMExtractionError: 任一调用失败
+        """
+        groups: Dict[str, List[str]] = {}
+        for conversation, fields in jobs:
+            merged = groups.setdefault(conversation, [])
+            merged.extend(name for name in fields if name not in merged)
+        outputs = await asyncio.gather(*(
+            self.extract(conversation, fields) for conversation, fields in groups.items()
+        ))
+        results = dict(zip(groups, outputs))
+        return [
+            {name: copy.deepcopy(results[conversation][name]) for name in fields}
+            for conversation, fields in jobs
+        ]
+
+    async def _complete(self, messages: List[Dict], schema: Dict) -> str:
+        """发送一次 chat completions 请求，返回模型输出文本"""
+        payload = {
+            "model": self.model,
+            "messages": messages,
+            "temperature": 0,
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {"name": "medical_record", "schema": schema},
+            },
+        }
+        async with self._semaphore:
+            self.in_flight += 1
+            self.requests += 1
+            try:
+                response = await self._client.post("/chat/completions", json=payload)
+                response.raise_for_status()
+                return response.json()["choices"][0]["message"]["content"]
+            except (httpx.HTTPError, KeyError, IndexError, TypeError, ValueError) as exc:
+                raise LLMExtractionError(f"结构化提取失败: {exc!r}") from exc
+            finally:
+                self.in_flight -= 1
+
+    @staticmethod
+    def _parse(parser, content: str, *args):
+        """解析模型输出，格式错误转换为 LLMExtractionError"""
+        try:
+            return parser(content, *args)
+        except (AttributeError, TypeError, ValueError) as exc:
+            raise LLMExtractionError(f"模型输出无法解析: {exc!r}") from exc
+
+    def stats(self) -> Dict:
+        """调用统计"""
+        return {
+            "requests": self.requests,
+            "in_flight": self.in_flight,
+            "max_concurrency": self.max_concurrency,
+        }
+
+    async def aclose(self) -> None:
+        """关闭连接池"""
+        await self._client.aclose()
@@ -0,0 +1,180 @@
+# app/services/llm/context.py
+import json
+import threading
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict
+
+from app.models.consultation_state import ConsultationState
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    估算文本的 token 数（无需分词器）
+
+    中日韩字符按每字 1 个 token，其余字符按每 4 个 1 个 token 计，
+    与常见 BPE 分词器对中文问诊文本的计数接近且偏保守。
+
+    Args:
+        text: 文本
+
+    Returns:
+        估算的 token 数
+    """
+    cjk = sum(1 for char in text if "\u2e80" <= char <= "\u9fff" or "\uff00" <= char <= "\uffef")
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+@dataclass
+class ModelContext:
+    """一次调用的上下文"""
+    text: str
+    tokens: int
+    full_tokens: int
+    turns_included: int
+    turns_total: int
+
+    @property
+    def tokens_saved(self) -> int:
+        """相比发送完整对话节省的 token 数"""
+        return max(self.full_tokens - self.tokens, 0)
+
+
+@dataclass
+class _SessionEntry:
+    """会话的缓存：已采集信息摘要与各轮 token 数"""
+    fingerprint: str = ""
+    summary: str = ""
+    summary_tokens: int = 0
+    counted: int = 0
+    turn_tokens: Deque[int] = field(default_factory=deque)
+    total_turn_tokens: int = 0
+
+
+class ContextBuilder:
+    """按 token 预算构造模型上下文
+
+    上下文 = 已采集信息（collected_data）摘要 + 预算内最近的原始对话轮次。
+    摘要按会话缓存，collected_data 不变时直接复用；各轮 token 数只在追加时计算一次。
+    """
+
+    SUMMARY_HEADER = "已采集信息："
+    TURNS_HEADER = "最近对话："
+
+    def __init__(
+        self,
+        budget_tokens: int = 2000,
+        counter: Callable[[str], int] = estimate_tokens,
+        max_sessions: int = 10000,
+    ):
+        """
+        初始化
+
+        Args:
+            budget_tokens: 每次调用的上下文 token 预算（至少包含最近一轮）
+            counter: token 计数函数
+            max_sessions: 缓存的会话数上限（LRU）
+        """
+        self.budget_tokens = budget_tokens
+        self.counter = counter
+        self.max_sessions = max_sessions
+        self._sessions: "OrderedDict[str, _SessionEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.tokens_sent = 0
+        self.tokens_saved = 0
+        self.summary_reused = 0
+
+    def build(self, state: ConsultationState) -> ModelContext:
+        """
+        构造会话当前的上下文
+
+        Args:
+            state: 会话状态
+
+        Returns:
+            上下文及 token 统计
+        """
+        with self._lock:
+            entry = self._entry(state.session_id)
+            self._refresh_summary(entry, state.collected_data)
+            self._count_new_turns(entry, state)
+
+        history = state.conversation_history
+        counts = entry.turn_tokens
+        tokens = entry.summary_tokens
+        parts = [entry.summary] if entry.summary else []
+        included = 0
+        if counts:
+            tokens += self.counter(self.TURNS_HEADER)
+            while included < len(counts) and (
+                included == 0 or tokens + counts[-1 - included] <= self.budget_tokens
+            ):
+                tokens += counts[-1 - included]
+                included += 1
+            parts.append(self.TURNS_HEADER)
+            parts.extend(turn.render() for turn in history.tail(included))
+
+        context = ModelContext(
+            text="\n".join(parts),
+            tokens=tokens,
+            full_tokens=entry.total_turn_tokens,
+            turns_included=included,
+            turns_total=len(history),
+        )
+        self.calls += 1
+        self.tokens_sent += context.tokens
+        self.tokens_saved += context.tokens_saved
+        return context
+
+    def forget(self, session_id: str) -> None:
+        """丢弃会话的缓存（会话过期或淘汰时调用）"""
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def stats(self) -> Dict:
+        """token 统计"""
+        return {
+            "calls": self.calls,
+            "tokens_sent": self.tokens_sent,
+            "tokens_saved": self.tokens_saved,
+            "summary_reused": self.summary_reused,
+            "cached_sessions": len(self._sessions),
+        }
+
+    def _entry(self, session_id: str) -> _SessionEntry:
+        """取出（或新建）会话缓存并标记为最近使用"""
+        entry = self._sessions.pop(session_id, None) or _SessionEntry()
+        self._sessions[session_id] = entry
+        while len(self._sessions) > self.max_sessions:
+            self._sessions.popitem(last=False)
+        return entry
+
+    def _refresh_summary(self, entry: _SessionEntry, collected: Dict) -> None:
+        """collected_data 变化时重建摘要，否则复用"""
+        fingerprint = json.dumps(collected, ensure_ascii=False, sort_keys=True, default=str)
+        if fingerprint == entry.fingerprint:
+            self.summary_reused += 1
+            return
+        lines = [
+            f"- {name}: {json.dumps(value, ensure_ascii=False, default=str)}"
+            for name, value in collected.items()
+        ]
+        entry.fingerprint = fingerprint
+        entry.summary = "\n".join([self.SUMMARY_HEADER, *lines]) if lines else ""
+        entry.summary_tokens = self.counter(entry.summary) if lines else 0
+
+    def _count_new_turns(self, entry: _SessionEntry, state: ConsultationState) -> None:
+        """只为新追加的轮次计数，与对话记录同步淘汰最早的轮次"""
+        history = state.conversation_history
+        new_turns = history.appended - entry.counted
+        if new_turns < 0 or entry.turn_tokens.maxlen != history.maxlen:
+            entry.turn_tokens, entry.total_turn_tokens = deque(maxlen=history.maxlen), 0
+            new_turns = len(history)
+        for turn in history.tail(new_turns):
+            if len(entry.turn_tokens) == entry.turn_tokens.maxlen:
+                entry.total_turn_tokens -= entry.turn_tokens[0]
+            count = self.counter(turn.render())
+            entry.turn_tokens.append(count)
+            entry.total_turn_tokens += count
+        entry.counted = history.appended
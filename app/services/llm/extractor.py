@@ -0,0 +1,200 @@
+# app/services/llm/extractor.py
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+from app.models.consultation_state import ConsultationState
+from app.models.conversation import Role
+from app.services.analysis.extraction_cache import ExtractionCache
+from app.services.analysis.structured_extraction import StructuredExtractionService
+from app.services.llm.batcher import MicroBatcher
+from app.services.llm.client import ExtractionJob, LLMExtractionClient, LLMExtractionError
+from app.services.llm.context import ContextBuilder
+from app.services.llm.resilience import CircuitBreaker, stage_timeout
+from app.services.llm.schema import FIELD_SCHEMAS, merge_record
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ExtractionOutcome:
+    """一次提取的结果"""
+    fields: Dict[str, Dict]
+    # 大模型不可用而改用关键词提取时为 True，reason 为 circuit_open / deadline / error
+    degraded: bool = False
+    reason: Optional[str] = None
+
+
+class RecordExtractor:
+    """病历字段提取
+
+    配置了大模型客户端时，一次调用提取全部请求字段；否则逐字段使用关键词提取。
+    配置缓存时，大模型结果按字段缓存，只为未命中的字段发起调用；
+    配置合并调度时，窗口内同一段对话的调用合并为一次请求（不同会话仍各自单独请求）；
+    配置上下文构造器时，整理病历只发送已采集信息摘要与预算内的最近对话。
+    大模型调用受熔断器与请求截止时间约束，出错、超时或熔断时降级为关键词提取（不缓存）。
+    """
+
+    def __init__(
+        self,
+        client: Optional[LLMExtractionClient] = None,
+        keywords: Optional[StructuredExtractionService] = None,
+        cache: Optional[ExtractionCache] = None,
+        batcher: Optional[MicroBatcher[ExtractionJob, Dict[str, Dict]]] = None,
+        context: Optional[ContextBuilder] = None,
+        breaker: Optional[CircuitBreaker] = None,
+        stage_limit: Optional[float] = None,
+    ):
+        """
+        初始化
+
+        Args:
+            client: 大模型提取客户端，为空时只使用关键词提取
+            keywords: 关键词提取服务，默认新建
+            cache: 大模型结果缓存，为空不缓存
+            batcher: 大模型调用的合并调度器（dispatch 为 client.extract_jobs），为空逐个调用
+            context: 上下文构造器，为空时发送完整对话
+            breaker: 大模型调用的熔断器，默认新建
+            stage_limit: 大模型阶段的超时上限（秒），同时受请求剩余时间约束
+        """
+        self.client = client
+        self.keywords = keywords or StructuredExtractionService()
+        self.cache = cache
+        self.batcher = batcher
+        self.context = context
+        self.breaker = breaker or CircuitBreaker()
+        self.stage_limit = stage_limit
+        self.degraded: Dict[str, int] = {"circuit_open": 0, "deadline": 0, "error": 0}
+
+    @property
+    def uses_llm(self) -> bool:
+        """是否启用大模型提取"""
+        return self.client is not None
+
+    async def extract(self, conversation: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """
+        提取病历字段
+
+        Args:
+            conversation: 对话文本（已脱敏）
+            fields: 字段名，默认全部
+
+        Returns:
+            字段 -> 属性字典
+        """
+        return (await self.extract_outcome(conversation, fields)).fields
+
+    async def extract_outcome(
+        self, conversation: str, fields: Optional[Iterable[str]] = None
+    ) -> ExtractionOutcome:
+        """
+        提取病历字段，并标明是否降级
+
+        Args:
+            conversation: 对话文本（已脱敏）
+            fields: 字段名，默认全部
+
+        Returns:
+            提取结果
+        """
+        fields = list(fields or FIELD_SCHEMAS)
+        if self.client is None:
+            return ExtractionOutcome(self._keywords(conversation, fields))
+
+        keys: Dict[str, str] = {}
+        result: Dict[str, Dict] = {}
+        if self.cache is not None:
+            namespace = f"llm:{self.client.model}"
+            keys = {name: self.cache.key(conversation, name, namespace) for name in fields}
+            result = {name: self.cache.get(key) for name, key in keys.items()}
+        missing = [name for name in fields if result.get(name) is None]
+        if not missing:
+            return ExtractionOutcome(result)
+
+        reason = await self._guarded_call(conversation, missing, result)
+        if reason is not None:
+            self.degraded[reason] += 1
+            result.update(self._keywords(conversation, missing))
+            return ExtractionOutcome(result, degraded=True, reason=reason)
+        for name in missing:
+            if name in keys:
+                self.cache.put(keys[name], result[name])
+        return ExtractionOutcome(result)
+
+    async def complete_record(self, state: ConsultationState) -> Optional[ExtractionOutcome]:
+        """
+        问诊完成时用大模型整理整段对话，覆盖逐轮记录的原始回答
+
+        Args:
+            state: 已完成的会话状态（原地更新 collected_data）
+
+        Returns:
+            提取结果；未启用大模型或紧急终止的会话不处理，返回 None
+        """
+        if self.client is None or state.emergency_flag:
+            return None
+        outcome = await self.extract_outcome(self.conversation_of(state))
+        merge_record(state.collected_data, outcome.fields, keep_empty=not outcome.degraded)
+        return outcome
+
+    def quick_record(self, state: ConsultationState) -> Dict[str, Dict]:
+        """
+        用关键词提取从患者的回答中整理病历（不调用大模型）
+
+        Args:
+            state: 会话状态（原地并入 collected_data 的非空属性）
+
+        Returns:
+            关键词提取的 字段 -> 属性字典
+        """
+        turns = state.conversation_history.records()
+        answers = "\n".join(turn.text for turn in turns if turn.role == Role.USER)
+        fields = self._keywords(answers, list(FIELD_SCHEMAS))
+        merge_record(state.collected_data, fields, keep_empty=False)
+        return fields
+
+    def conversation_of(self, state: ConsultationState) -> str:
+        """发送给大模型的对话文本（配置上下文构造器时为预算内的上下文）"""
+        if self.context is not None:
+            return self.context.build(state).text
+        return "\n".join(state.conversation_history)
+
+    def stats(self) -> Dict:
+        """降级与熔断统计"""
+        return {"degraded": dict(self.degraded), "breaker": self.breaker.stats()}
+
+    async def _guarded_call(self, conversation: str, fields: List[str], into: Dict) -> Optional[str]:
+        """在熔断器与截止时间约束下调用大模型；成功时写入 into，失败返回降级原因"""
+        timeout = stage_timeout(self.stage_limit)
+        if timeout is not None and timeout <= 0:
+            return "deadline"
+        if not self.breaker.allow():
+            return "circuit_open"
+        try:
+            into.update(await asyncio.wait_for(self._call_llm(conversation, fields), timeout))
+        except asyncio.TimeoutError:
+            self.breaker.record_failure()
+            return "deadline"
+        except LLMExtractionError:
+            self.breaker.record_failure()
+            return "error"
+        except Exception:
+            logger.exception("大模型提取出现意外错误")
+            self.breaker.record_failure()
+            return "error"
+        finally:
+            # 调用被取消时同样归还试探名额，否则熔断器会一直停在 half_open
+            self.breaker.release()
+        self.breaker.record_success()
+        return None
+
+    async def _call_llm(self, conversation: str, fields: List[str]) -> Dict[str, Dict]:
+        """调用大模型（经合并调度或直接调用）"""
+        if self.batcher is None:
+            return await self.client.extract(conversation, fields)
+        return await self.batcher.submit((conversation, tuple(fields)))
+
+    def _keywords(self, conversation: str, fields: List[str]) -> Dict[str, Dict]:
+        """关键词提取"""
+        return {name: self.keywords.extract(conversation, name) for name in fields}
@@ -0,0 +1,190 @@
+# app/services/llm/refiner.py
+import asyncio
+import contextvars
+import logging
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.consultation_state import ConsultationState
+from app.services.core.session_locks import SessionLockRegistry
+from app.services.core.session_manager import SessionManager
+from app.services.llm.extractor import ExtractionOutcome, RecordExtractor
+from app.services.llm.schema import merge_record
+
+logger = logging.getLogger(__name__)
+
+
+def _normalized(value: Any) -> Any:
+    """比较用的属性值：空值统一为 None，列表按集合比较"""
+    if value in (None, "", [], {}):
+        return None
+    if isinstance(value, list):
+        return frozenset(map(str, value))
+    return value
+
+
+def field_conflicts(quick: Dict[str, Dict], refined: Dict[str, Dict]) -> List[Tuple[str, str]]:
+    """
+    两种提取结果都有值但不一致的属性
+
+    Args:
+        quick: 关键词提取结果
+        refined: 大模型提取结果
+
+    Returns:
+        (字段, 属性) 列表
+    """
+    conflicts = []
+    for name, attrs in refined.items():
+        for attr, value in attrs.items():
+            left, right = _normalized(quick.get(name, {}).get(attr)), _normalized(value)
+            if left is not None and right is not None and left != right:
+                conflicts.append((name, attr))
+    return conflicts
+
+
+class RecordRefiner:
+    """病历的推测式快速返回与后台精修
+
+    问诊完成时先用关键词提取整理病历并立即返回，同时在后台调用大模型提取；
+    完成后在会话锁内把结果合并回会话。同一会话的下一次请求（或查询病历）
+    先等待未完成的精修，保证读到精修后的病历。
+    两种结果不一致的属性记录日志并按字段计数。
+    """
+
+    def __init__(
+        self,
+        extractor: RecordExtractor,
+        sessions: SessionManager,
+        locks: SessionLockRegistry,
+        max_pending: int = 1000,
+    ):
+        """
+        初始化
+
+        Args:
+            extractor: 病历字段提取入口
+            sessions: 会话管理器（精修结果写回）
+            locks: 会话锁注册表（写回与对话轮次串行）
+            max_pending: 同时进行的精修上限，超出时只返回关键词结果
+        """
+        self.extractor = extractor
+        self.sessions = sessions
+        self.locks = locks
+        self.max_pending = max_pending
+        self._pending: Dict[str, asyncio.Task] = {}
+        self.scheduled = 0
+        self.skipped = 0
+        self.refined = 0
+        self.degraded = 0
+        self.compared_attrs = 0
+        self.conflicts: Counter = Counter()
+        self.settle_timeouts = 0
+
+    def speculate(self, state: ConsultationState) -> bool:
+        """
+        用关键词提取整理病历，并安排后台大模型精修
+
+        Args:
+            state: 已完成的会话状态（原地更新 collected_data）
+
+        Returns:
+            是否安排了精修（未启用大模型或紧急终止的会话不处理）
+        """
+        if not self.extractor.uses_llm or state.emergency_flag:
+            return False
+        conversation = self.extractor.conversation_of(state)
+        quick = self.extractor.quick_record(state)
+        if len(self._pending) >= self.max_pending:
+            self.skipped += 1
+            return False
+        # 精修不受本次请求截止时间约束，在空上下文中运行
+        task = contextvars.Context().run(
+            asyncio.get_running_loop().create_task, self._refine(state.session_id, conversation, quick)
+        )
+        self._pending[state.session_id] = task
+        task.add_done_callback(lambda done, sid=state.session_id: self._done(sid, done))
+        self.scheduled += 1
+        return True
+
+    async def complete(self, state: ConsultationState, background: bool = True) -> Optional[ExtractionOutcome]:
+        """
+        问诊完成时整理病历
+
+        Args:
+            state: 已完成的会话状态（原地更新 collected_data）
+            background: 为 True 时返回关键词结果并安排后台精修（精修已满时同步等待大模型）
+
+        Returns:
+            提取结果；未启用大模型或紧急终止的会话不处理，返回 None
+        """
+        if background and self.speculate(state):
+            return ExtractionOutcome(state.collected_data)
+        return await self.extractor.complete_record(state)
+
+    async def settle(self, session_id: str, timeout: Optional[float] = None) -> bool:
+        """
+        等待会话未完成的精修写回（调用方不得持有该会话的锁）
+
+        Args:
+            session_id: 会话 ID
+            timeout: 最长等待秒数，None 不限制
+
+        Returns:
+            精修是否已写回（没有进行中的精修时为 True）
+        """
+        task = self._pending.get(session_id)
+        if task is None:
+            return True
+        try:
+            await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self.settle_timeouts += 1
+            return False
+        return True
+
+    async def aclose(self) -> None:
+        """等待全部进行中的精修（关闭服务时调用）"""
+        await asyncio.gather(*self._pending.values(), return_exceptions=True)
+
+    def stats(self) -> Dict:
+        """精修与冲突统计"""
+        conflicts = sum(self.conflicts.values())
+        return {
+            "scheduled": self.scheduled,
+            "skipped": self.skipped,
+            "refined": self.refined,
+            "degraded": self.degraded,
+            "pending": len(self._pending),
+            "settle_timeouts": self.settle_timeouts,
+            "conflicts": dict(self.conflicts),
+            "conflict_rate": round(conflicts / self.compared_attrs, 4) if self.compared_attrs else None,
+        }
+
+    async def _refine(self, session_id: str, conversation: str, quick: Dict[str, Dict]) -> None:
+        """后台调用大模型，比较结果并写回会话"""
+        try:
+            outcome = await self.extractor.extract_outcome(conversation)
+            if outcome.degraded:
+                self.degraded += 1
+                return
+            self.compared_attrs += sum(len(attrs) for attrs in outcome.fields.values())
+            for name, attr in field_conflicts(quick, outcome.fields):
+                self.conflicts[name] += 1
+                # 只记录字段名，不写入临床取值
+                logger.info("病历精修结果与关键词提取不一致: session=%s field=%s.%s", session_id, name, attr)
+            async with self.locks.lock(session_id):
+                # 会话已安排了更新的精修，或会话已过期：丢弃本次结果
+                state = self.sessions.get(session_id)
+                if state is None or self._pending.get(session_id) is not asyncio.current_task():
+                    return
+                merge_record(state.collected_data, outcome.fields)
+                self.sessions.update(session_id, state)
+            self.refined += 1
+        except Exception:
+            logger.exception("病历后台精修失败: session=%s", session_id)
+
+    def _done(self, session_id: str, task: asyncio.Task) -> None:
+        """精修结束后移出进行中列表（同一会话已安排了新的精修时保留新的）"""
+        if self._pending.get(session_id) is task:
+            del self._pending[session_id]
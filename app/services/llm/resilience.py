@@ -0,0 +1,147 @@
+# app/services/llm/resilience.py
+"""外部调用的熔断与截止时间
+
+- CircuitBreaker：连续失败达到阈值后熔断，冷却期内直接拒绝调用；
+  冷却结束后放行一次试探调用，成功则恢复，失败则重新熔断。
+- 截止时间：请求入口通过 deadline() 设定整体截止时间，保存在 contextvar 中，
+  随 await 链（包括其中创建的任务）自动传递；各阶段用 stage_timeout() 取得
+  本阶段可用的时间，嵌套设定时取更早的截止时间。
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+
+
+@contextmanager
+def deadline(seconds: Optional[float]) -> Iterator[None]:
+    """
+    在当前上下文内设定截止时间（相对现在的秒数，None 不限制）
+
+    Args:
+        seconds: 可用时间
+    """
+    if seconds is None:
+        yield
+        return
+    at = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(at if current is None else min(at, current))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> Optional[float]:
+    """距截止时间的剩余秒数（未设定返回 None，已过期返回 0）"""
+    at = _deadline.get()
+    return None if at is None else max(at - time.monotonic(), 0.0)
+
+
+def stage_timeout(limit: Optional[float] = None, reserve: float = 0.0) -> Optional[float]:
+    """
+    本阶段可用的时间：阶段上限与（剩余时间 - 为后续阶段保留的时间）中的较小者
+
+    Args:
+        limit: 阶段自身的超时上限
+        reserve: 为后续阶段保留的秒数
+
+    Returns:
+        可用秒数（均未限制时为 None）
+    """
+    left = remaining()
+    if left is not None:
+        left = max(left - reserve, 0.0)
+    if limit is None:
+        return left
+    return limit if left is None else min(limit, left)
+
+
+class CircuitBreaker:
+    """熔断器（closed -> open -> half_open -> closed/open）"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        初始化熔断器
+
+        Args:
+            failure_threshold: 连续失败多少次后熔断
+            reset_seconds: 熔断后的冷却时间（秒）
+            clock: 时钟函数（测试用）
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self.opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """当前状态（冷却结束的熔断状态视为 half_open）"""
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """是否放行一次调用（放行后必须调用 record_success、record_failure 或 release）"""
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_seconds:
+                self._state = self.HALF_OPEN
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        """记录一次成功调用"""
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def release(self) -> None:
+        """放行的调用未得出结果（被取消）时归还试探名额，不计成功或失败"""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """记录一次失败调用"""
+        with self._lock:
+            self._failures += 1
+            trip = self._state == self.HALF_OPEN or self._failures >= self.failure_threshold
+            if trip and self._state != self.OPEN:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+                self.opened += 1
+            self._trial_in_flight = False
+
+    def stats(self) -> Dict:
+        """熔断统计"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+        }
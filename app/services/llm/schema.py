@@ -0,0 +1,147 @@
+# app/services/llm/schema.py
+"""结构化提取的字段定义与提示词
+
+字段结构与关键词提取（StructuredExtractionService）的输出保持一致，
+两种后端的结果可以互相替换。
+"""
+import json
+from typing import Dict, Iterable, List
+
+_TEXT = {"type": ["string", "null"]}
+_LIST = {"type": "array", "items": {"type": "string"}}
+
+# 字段 -> 各属性的 JSON Schema
+FIELD_SCHEMAS: Dict[str, Dict[str, Dict]] = {
+    "chief_complaint": {
+        "symptom": _TEXT,
+        "duration": _TEXT,
+        "severity": {"type": ["integer", "null"], "minimum": 1, "maximum": 10},
+    },
+    "present_illness": {
+        "onset_time": _TEXT,
+        "progression": _TEXT,
+        "associated_symptoms": _LIST,
+    },
+    "past_history": {
+        "chronic_diseases": _LIST,
+        "surgeries": _LIST,
+        "allergies": _LIST,
+        "medications": _LIST,
+    },
+}
+
+FIELD_DESCRIPTIONS = {
+    "chief_complaint": "主诉：最主要的症状（标准医学术语）、持续时间、严重程度（1-10）",
+    "present_illness": "现病史：起病时间、病情进展、伴随症状",
+    "past_history": "既往史：慢性病、手术史、过敏史、正在使用的药物",
+}
+
+SYSTEM_PROMPT = (
+    "你是医疗预问诊的病历整理助手。根据患者与助手的对话提取以下字段，"
+    "只使用对话中明确出现的信息，未提及的属性填 null 或空列表，不要推测。\n"
+)
+
+
+def response_schema(fields: Iterable[str]) -> Dict:
+    """
+    请求字段对应的响应 JSON Schema（所有字段一次返回）
+
+    Args:
+        fields: 字段名
+
+    Returns:
+        JSON Schema
+    """
+    properties = {
+        name: {
+            "type": "object",
+            "properties": FIELD_SCHEMAS[name],
+            "required": list(FIELD_SCHEMAS[name]),
+            "additionalProperties": False,
+        }
+        for name in fields
+    }
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def build_messages(conversation: str, fields: Iterable[str]) -> List[Dict[str, str]]:
+    """
+    构造对话消息
+
+    Args:
+        conversation: 对话文本（已脱敏）
+        fields: 字段名
+
+    Returns:
+        chat completions 消息列表
+    """
+    lines = [f"- {name}：{FIELD_DESCRIPTIONS[name]}" for name in fields]
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT + "\n".join(lines)},
+        {"role": "user", "content": conversation},
+    ]
+
+
+def empty_field(name: str) -> Dict:
+    """字段的空值（与关键词提取未命中时一致）"""
+    return {
+        key: [] if schema.get("type") == "array" else None
+        for key, schema in FIELD_SCHEMAS[name].items()
+    }
+
+
+def merge_record(collected: Dict[str, Dict], fields: Dict[str, Dict], keep_empty: bool = True) -> None:
+    """
+    把提取结果逐属性并入已采集信息，保留字段中的其他属性（如阶段规则记录的 notes）
+
+    Args:
+        collected: 会话已采集信息（原地更新，字段替换为新字典）
+        fields: 字段 -> 属性字典
+        keep_empty: 为 False 时跳过空属性（关键词提取未命中不覆盖已有信息）
+    """
+    for name, attrs in fields.items():
+        if not keep_empty:
+            attrs = {key: value for key, value in attrs.items() if value not in (None, "", [], {})}
+        collected[name] = {**collected.get(name, {}), **attrs}
+
+
+def parse_fields(content: str, fields: Iterable[str]) -> Dict[str, Dict]:
+    """
+    解析模型输出，缺失的属性补为空值，多余的属性丢弃
+
+    Args:
+        content: 模型返回的 JSON 文本
+        fields: 请求的字段名
+
+    Returns:
+        字段 -> 属性字典
+
+    Raises:
+        ValueError: 输出不是 JSON 对象
+    """
+    return _fields_from(_load_object(content), fields)
+
+
+def _load_object(content: str) -> Dict:
+    """解析 JSON 对象"""
+    data = json.loads(content)
+    if not isinstance(data, dict):
+        raise ValueError("模型输出不是 JSON 对象")
+    return data
+
+
+def _fields_from(data: Dict, fields: Iterable[str]) -> Dict[str, Dict]:
+    """按字段结构取值，缺失的属性补为空值，多余的属性丢弃"""
+    result = {}
+    for name in fields:
+        value = data.get(name)
+        field = empty_field(name)
+        if isinstance(value, dict):
+            field.update({key: value[key] for key in field if key in value})
+        result[name] = field
+    return result
@@ -0,0 +1,43 @@
+# app/services/storage/__init__.py
+"""会话存储模块
+
+- base          存储接口 SessionStore
+- memory_store  单进程内存存储
+- sqlite_store  基于 SQLite WAL 的多进程共享存储
+"""
+from typing import Callable, Optional
+
+from app.services.storage.base import SessionStore
+from app.services.storage.memory_store import MemorySessionStore
+from app.services.storage.sqlite_store import SQLiteSessionStore
+
+
+def create_session_store(
+    path: Optional[str] = None,
+    max_bytes: Optional[int] = None,
+    spill_dir: Optional[str] = None,
+    is_active: Optional[Callable[[str], bool]] = None,
+) -> SessionStore:
+    """
+    根据配置创建会话存储
+
+    Args:
+        path: SQLite 数据库路径，为空时使用进程内存储
+        max_bytes: 进程内存储的内存预算（字节）
+        spill_dir: 进程内存储超出预算时的落盘目录
+        is_active: 判断会话是否正在处理请求的回调
+
+    Returns:
+        会话存储实例
+    """
+    if path:
+        return SQLiteSessionStore(path)
+    return MemorySessionStore(max_bytes=max_bytes, spill_dir=spill_dir, is_active=is_active)
+
+
+__all__ = [
+    "SessionStore",
+    "MemorySessionStore",
+    "SQLiteSessionStore",
+    "create_session_store",
+]
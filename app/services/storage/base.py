@@ -0,0 +1,60 @@
+# app/services/storage/base.py
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional
+
+from app.models.consultation_state import ConsultationState
+
+
+class SessionStore(ABC):
+    """会话存储接口
+
+    SessionManager 通过该接口读写会话，具体后端可以是进程内字典，
+    也可以是多个 worker 共享的持久化存储。
+    """
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[ConsultationState]:
+        """读取会话，不存在返回 None"""
+
+    @abstractmethod
+    def put(self, session_id: str, state: ConsultationState) -> None:
+        """写入会话（后端可以缓冲，调用 flush 后保证可见）"""
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """删除会话"""
+
+    @abstractmethod
+    def expire(self, cutoff: float, limit: Optional[int] = None) -> List[str]:
+        """
+        删除最后更新时间早于 cutoff 的会话
+
+        Args:
+            cutoff: 截止时间戳（POSIX 秒）
+            limit: 本次最多删除的会话数
+
+        Returns:
+            被删除的会话 ID 列表
+        """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """存活会话数"""
+
+    @abstractmethod
+    def __iter__(self) -> Iterator[str]:
+        """遍历会话 ID"""
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def footprint(self) -> Dict:
+        """存储占用情况（后端可补充更多指标）"""
+        return {"sessions": len(self)}
+
+    def flush(self) -> None:
+        """将缓冲的写入落盘（默认无缓冲）"""
+
+    def close(self) -> None:
+        """关闭存储并释放资源"""
+        self.flush()
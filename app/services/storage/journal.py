@@ -0,0 +1,199 @@
+# app/services/storage/journal.py
+"""会话变更日志（追加写）
+
+每次 SessionManager.update 只追加一条增量记录（JSON 行），例如::
+
+    {"s": "<会话ID>", "set": {"current_phase": "past_history", "last_update": "..."},
+     "append": {"conversation_history": [["user", "..."], ["assistant", "..."]]},
+     "merge": {"collected_data": {"present_illness": {...}}}}
+
+日志按段（segment）滚动，JournalCompactor 在后台把已关闭的段与上一个检查点
+合并为新的检查点（复用会话快照格式），随后删除旧段。
+崩溃恢复 = 检查点 + 重放剩余日志段。
+"""
+import glob
+import json
+import os
+import threading
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.models.consultation_state import ConsultationState
+from app.models.conversation import ConversationHistory
+
+LIST_FIELDS = ("conversation_history", "conflict_history")
+DICT_FIELDS = ("collected_data", "confidence_scores", "extraction_progress")
+SCALAR_FIELDS = tuple(
+    name for name in ConsultationState.model_fields
+    if name not in LIST_FIELDS + DICT_FIELDS + ("session_id",)
+)
+
+
+def _jsonable(value: Any) -> Any:
+    """将标量字段转为 JSON 可序列化的值"""
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _appended(items: Any) -> int:
+    """列表字段累计追加的条数（环形对话记录不随淘汰减少）"""
+    if isinstance(items, ConversationHistory):
+        return items.appended
+    return len(items)
+
+
+def _tail(items: Any, count: Optional[int] = None) -> Any:
+    """列表字段最近 count 条的 JSON 形式（count 为空时为整体替换的形式，对话记录带累计追加轮数）"""
+    if isinstance(items, ConversationHistory):
+        if count is None:
+            return items.dump()
+        return [[turn.role.value, turn.text] for turn in items.tail(count)]
+    return list(items) if count is None else list(items[len(items) - count:])
+
+
+def _fingerprint(value: Any) -> str:
+    """字典项的比较指纹"""
+    return json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+
+
+class SessionJournal:
+    """按段滚动的会话增量日志"""
+
+    def __init__(self, directory: str, max_segment_bytes: int = 16 * 1024 * 1024):
+        """
+        初始化日志
+
+        Args:
+            directory: 日志与检查点目录
+            max_segment_bytes: 单个日志段的最大字节数，超过后滚动
+        """
+        self.directory = directory
+        self.max_segment_bytes = max_segment_bytes
+        self._lock = threading.Lock()
+        self._shadows: Dict[str, Dict] = {}
+        os.makedirs(directory, exist_ok=True)
+        existing = self._list("journal-*.log") + self._list("checkpoint-*.snap")
+        self._seq = max((self._seq_of(p) for p in existing), default=0) + 1
+        self._file = None
+
+    def record(self, session_id: str, state: ConsultationState) -> None:
+        """
+        追加会话相对上次记录的增量（无变化时不写）
+
+        Args:
+            session_id: 会话 ID
+            state: 当前会话状态
+        """
+        shadow = self._shadows.get(session_id)
+        delta: Dict[str, Any] = {}
+        new_shadow: Dict[str, Any] = {}
+
+        for name in SCALAR_FIELDS:
+            value = _jsonable(getattr(state, name))
+            new_shadow[name] = value
+            if shadow is None or shadow[name] != value:
+                delta.setdefault("set", {})[name] = value
+
+        for name in LIST_FIELDS:
+            items = getattr(state, name)
+            total = _appended(items)
+            counted = shadow[name] if shadow is not None else 0
+            new_shadow[name] = total
+            if shadow is None or total < counted or total - counted > len(items):
+                delta.setdefault("set", {})[name] = _tail(items)
+            elif total > counted:
+                delta.setdefault("append", {})[name] = _tail(items, total - counted)
+
+        for name in DICT_FIELDS:
+            entries = getattr(state, name)
+            prints = {key: _fingerprint(value) for key, value in entries.items()}
+            old = shadow[name] if shadow is not None else {}
+            new_shadow[name] = prints
+            changed = {k: entries[k] for k, fp in prints.items() if old.get(k) != fp}
+            removed = [k for k in old if k not in prints]
+            if changed:
+                delta.setdefault("merge", {})[name] = changed
+            if removed:
+                delta.setdefault("unset", {})[name] = removed
+
+        self._shadows[session_id] = new_shadow
+        if delta:
+            delta["s"] = session_id
+            self._append(delta)
+
+    def forget(self, session_id: str) -> None:
+        """记录会话删除"""
+        if self._shadows.pop(session_id, None) is not None:
+            self._append({"s": session_id, "d": 1})
+
+    def rotate(self) -> int:
+        """
+        关闭当前日志段，后续写入进入新段
+
+        Returns:
+            最后一个已关闭日志段的序列号
+        """
+        with self._lock:
+            if self._file is not None:
+                self._close_segment()
+            return self._seq - 1
+
+    def latest_checkpoint(self) -> Tuple[Optional[str], int]:
+        """
+        最新检查点
+
+        Returns:
+            (检查点路径, 已折叠到的日志段序列号)，没有检查点时为 (None, 0)
+        """
+        checkpoints = self._list("checkpoint-*.snap")
+        if not checkpoints:
+            return None, 0
+        return checkpoints[-1], self._seq_of(checkpoints[-1])
+
+    def segments(self, after: int = 0, upto: Optional[int] = None) -> List[str]:
+        """序列号在 (after, upto] 区间内的日志段，按序排列"""
+        return [
+            p for p in self._list("journal-*.log")
+            if after < self._seq_of(p) and (upto is None or self._seq_of(p) <= upto)
+        ]
+
+    def checkpoint_path(self, seq: int) -> str:
+        """序列号对应的检查点路径"""
+        return os.path.join(self.directory, f"checkpoint-{seq:010d}.snap")
+
+    def close(self) -> None:
+        """关闭当前日志段"""
+        with self._lock:
+            if self._file is not None:
+                self._close_segment()
+
+    def _append(self, record: Dict) -> None:
+        """追加一行并交给操作系统（进程崩溃不丢失）"""
+        line = json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        with self._lock:
+            if self._file is None:
+                path = os.path.join(self.directory, f"journal-{self._seq:010d}.log")
+                self._file = open(path, "a", encoding="utf-8")
+            self._file.write(line)
+            self._file.flush()
+            if self._file.tell() >= self.max_segment_bytes:
+                self._close_segment()
+
+    def _close_segment(self) -> None:
+        """关闭当前段，序列号前进"""
+        self._file.close()
+        self._file = None
+        self._seq += 1
+
+    def _list(self, pattern: str) -> List[str]:
+        """按文件名（即序列号）排序列出目录下的文件"""
+        return sorted(glob.glob(os.path.join(self.directory, pattern)))
+
+    @staticmethod
+    def _seq_of(path: str) -> int:
+        """从文件名解析序列号"""
+        return int(os.path.basename(path).split("-")[1].split(".")[0])
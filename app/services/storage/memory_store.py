@@ -0,0 +1,162 @@
+# app/services/storage/memory_store.py
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Callable, Dict, Iterator, List, Optional
+
+from app.models.consultation_state import ConsultationState
+from app.services.core.expiry_index import ExpiryIndex
+from app.services.storage.base import SessionStore
+from app.services.storage.size_estimator import SessionSizeTracker
+
+
+class MemorySessionStore(SessionStore):
+    """进程内会话存储
+
+    - 使用过期索引实现 O(log n) 过期清理
+    - 可选内存预算：超出时按 LRU 淘汰非活跃会话，配置 spill_dir 时写入磁盘，
+      下次访问再加载回内存
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        spill_dir: Optional[str] = None,
+        is_active: Optional[Callable[[str], bool]] = None,
+    ):
+        """
+        初始化存储
+
+        Args:
+            max_bytes: 内存预算（字节），None 表示不限制
+            spill_dir: 淘汰会话的落盘目录，None 表示直接丢弃
+            is_active: 判断会话是否正在处理请求的回调，活跃会话不会被淘汰
+        """
+        self.sessions: "OrderedDict[str, ConsultationState]" = OrderedDict()
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.is_active = is_active
+        self._expiry = ExpiryIndex()
+        self._sizes = SessionSizeTracker()
+        self._bytes: Dict[str, int] = {}
+        self._total_bytes = 0
+        self._spilled: Dict[str, str] = {}
+        self._evictions = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def get(self, session_id: str) -> Optional[ConsultationState]:
+        state = self.sessions.get(session_id)
+        if state is not None:
+            self.sessions.move_to_end(session_id)
+            return state
+        if session_id in self._spilled:
+            return self._load_spilled(session_id)
+        return None
+
+    def put(self, session_id: str, state: ConsultationState) -> None:
+        self._drop_spilled(session_id)
+        self.sessions[session_id] = state
+        self.sessions.move_to_end(session_id)
+        self._expiry.touch(session_id, state.last_update.timestamp())
+
+        size = self._sizes.measure(session_id, state)
+        self._total_bytes += size - self._bytes.get(session_id, 0)
+        self._bytes[session_id] = size
+        self._enforce_budget(keep=session_id)
+
+    def delete(self, session_id: str) -> None:
+        self._forget(session_id)
+        self._drop_spilled(session_id)
+        self._expiry.discard(session_id)
+
+    def expire(self, cutoff: float, limit: Optional[int] = None) -> List[str]:
+        expired = self._expiry.pop_expired(
+            cutoff, limit=limit, current=self._last_update_of
+        )
+        for sid in expired:
+            self._forget(sid)
+            self._drop_spilled(sid)
+        return expired
+
+    def footprint(self) -> Dict:
+        """
+        获取存储占用情况
+
+        Returns:
+            内存中/已落盘会话数、估算字节数、预算及累计淘汰次数
+        """
+        return {
+            "sessions_in_memory": len(self.sessions),
+            "sessions_spilled": len(self._spilled),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self._evictions,
+        }
+
+    def __len__(self) -> int:
+        return len(self.sessions) + len(self._spilled)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self.sessions) + list(self._spilled))
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.sessions or session_id in self._spilled
+
+    def _enforce_budget(self, keep: str) -> None:
+        """超出预算时从最久未使用的一端淘汰非活跃会话（不淘汰刚写入的 keep）"""
+        if self.max_bytes is None or self._total_bytes <= self.max_bytes:
+            return
+        excess = self._total_bytes - self.max_bytes
+        victims = []
+        for sid in self.sessions:
+            if excess <= 0:
+                break
+            if sid == keep or (self.is_active is not None and self.is_active(sid)):
+                continue
+            victims.append(sid)
+            excess -= self._bytes.get(sid, 0)
+        for sid in victims:
+            self._evict(sid)
+
+    def _evict(self, session_id: str) -> None:
+        """淘汰单个会话，可选落盘"""
+        state = self.sessions[session_id]
+        self._forget(session_id)
+        self._evictions += 1
+        if self.spill_dir:
+            path = self._spill_path(session_id)
+            with open(path, "wb") as f:
+                f.write(state.model_dump_json().encode("utf-8"))
+            self._spilled[session_id] = path
+        else:
+            self._expiry.discard(session_id)
+
+    def _load_spilled(self, session_id: str) -> ConsultationState:
+        """从磁盘加载已淘汰会话并放回内存"""
+        with open(self._spilled[session_id], "rb") as f:
+            state = ConsultationState.model_validate_json(f.read())
+        self.put(session_id, state)
+        return state
+
+    def _forget(self, session_id: str) -> None:
+        """从内存和字节计数中移除会话"""
+        self.sessions.pop(session_id, None)
+        self._total_bytes -= self._bytes.pop(session_id, 0)
+        self._sizes.forget(session_id)
+
+    def _drop_spilled(self, session_id: str) -> None:
+        """删除落盘文件"""
+        path = self._spilled.pop(session_id, None)
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+    def _spill_path(self, session_id: str) -> str:
+        """会话落盘文件路径"""
+        digest = hashlib.sha1(session_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.spill_dir, f"{digest}.json")
+
+    def _last_update_of(self, session_id: str) -> Optional[float]:
+        """读取会话当前的最后更新时间戳（落盘会话按索引时间处理）"""
+        state = self.sessions.get(session_id)
+        return state.last_update.timestamp() if state else None
@@ -0,0 +1,62 @@
+# app/services/storage/size_estimator.py
+import sys
+from typing import Any
+
+from app.models.consultation_state import ConsultationState
+
+# ConsultationState 实例及其固定字段的大致开销（字节）
+BASE_OVERHEAD = 1024
+
+
+def deep_size(value: Any, depth: int = 4) -> int:
+    """
+    粗略估算容器对象的内存占用
+
+    Args:
+        value: 待估算对象（dict / list / 标量）
+        depth: 最大递归深度
+
+    Returns:
+        估算字节数
+    """
+    size = sys.getsizeof(value)
+    if depth <= 0:
+        return size
+    if isinstance(value, dict):
+        for key, item in value.items():
+            size += sys.getsizeof(key) + deep_size(item, depth - 1)
+    elif isinstance(value, (list, tuple, set)):
+        for item in value:
+            size += deep_size(item, depth - 1)
+    return size
+
+
+class SessionSizeTracker:
+    """估算会话内存占用
+
+    对话历史为定长环形记录，其字节数在追加时已增量维护（O(1) 读取）；
+    其余字段（已采集数据等）体积小，每次整体重算。
+    """
+
+    def measure(self, session_id: str, state: ConsultationState) -> int:
+        """
+        计算会话当前的估算字节数
+
+        Args:
+            session_id: 会话 ID
+            state: 会话状态
+
+        Returns:
+            估算字节数
+        """
+        return (
+            BASE_OVERHEAD
+            + state.conversation_history.nbytes
+            + deep_size(state.collected_data)
+            + deep_size(state.confidence_scores)
+            + deep_size(state.conflict_history)
+            + deep_size(state.extraction_progress)
+        )
+
+    def forget(self, session_id: str) -> None:
+        """移除会话的计数缓存（历史字节数随会话对象保存，无需处理）"""
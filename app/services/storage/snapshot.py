@@ -0,0 +1,169 @@
+# app/services/storage/snapshot.py
+"""会话快照文件
+
+二进制格式（小端）::
+
+    MAGIC(4) VERSION(1)
+    record*            每条记录为 zlib 压缩后的会话 JSON
+    index_entry*       按会话 ID 排序：
+                       [u16 id_len][id][u64 offset][u32 length][f64 last_update]
+    table              n 个 u64，依次指向每个 index_entry
+    [u64 table_offset][u32 n] MAGIC(4)
+
+读取时只解析文件尾部，按会话 ID 在 mmap 上二分查找，
+因此打开快照的耗时与会话数无关，会话在首次访问时才反序列化。
+"""
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from typing import Iterable, Iterator, Optional, Tuple
+
+from app.models.consultation_state import ConsultationState
+
+MAGIC = b"CSNP"
+VERSION = 1
+_ENTRY_TAIL = struct.Struct("<QId")
+_TRAILER = struct.Struct("<QI4s")
+
+
+def encode_state(state: ConsultationState) -> bytes:
+    """将会话序列化为压缩记录"""
+    return zlib.compress(state.model_dump_json().encode("utf-8"))
+
+
+def decode_state(blob: bytes) -> ConsultationState:
+    """从压缩记录还原会话"""
+    return ConsultationState.model_validate_json(zlib.decompress(blob))
+
+
+def write_snapshot(path: str, records: Iterable[Tuple[str, float, bytes]]) -> int:
+    """
+    写入快照文件（先写临时文件再原子替换）
+
+    Args:
+        path: 快照路径
+        records: (会话 ID, 最后更新时间戳, encode_state 生成的压缩记录) 序列
+
+    Returns:
+        写入的会话数
+    """
+    # 每次写入使用独立的临时文件，多个 worker 同时写快照不会互相覆盖
+    fd, tmp_path = tempfile.mkstemp(
+        prefix=f"{os.path.basename(path)}.", suffix=".tmp", dir=os.path.dirname(path) or "."
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            count = _write_body(f, records)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return count
+
+
+def _write_body(f, records: Iterable[Tuple[str, float, bytes]]) -> int:
+    """写入文件头、记录、索引与文件尾，返回会话数"""
+    index = []
+    f.write(MAGIC + bytes([VERSION]))
+    for session_id, last_update, blob in records:
+        index.append((session_id.encode("utf-8"), f.tell(), len(blob), last_update))
+        f.write(blob)
+
+    index.sort()
+    table = []
+    for key, offset, length, last_update in index:
+        table.append(f.tell())
+        f.write(
+            struct.pack("<H", len(key)) + key
+            + _ENTRY_TAIL.pack(offset, length, last_update)
+        )
+    table_offset = f.tell()
+    f.write(struct.pack(f"<{len(table)}Q", *table))
+    f.write(_TRAILER.pack(table_offset, len(table), MAGIC))
+    return len(index)
+
+
+class SessionSnapshot:
+    """只读快照，按需加载单个会话"""
+
+    def __init__(self, path: str):
+        """
+        打开快照文件
+
+        Args:
+            path: 快照路径
+
+        Raises:
+            ValueError: 文件格式不正确
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:4] != MAGIC or len(self._map) < 5 + _TRAILER.size:
+            self.close()
+            raise ValueError(f"不是有效的会话快照: {path}")
+        version = self._map[4]
+        if version != VERSION:
+            self.close()
+            raise ValueError(f"会话快照版本不支持（{version}）: {path}")
+        self._table_offset, self._count, magic = _TRAILER.unpack_from(
+            self._map, len(self._map) - _TRAILER.size
+        )
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"会话快照不完整: {path}")
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, session_id: str) -> bool:
+        return self._find(session_id) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for i in range(self._count):
+            yield self._entry(i)[0].decode("utf-8")
+
+    def records(self) -> Iterator[Tuple[str, float, bytes]]:
+        """按会话 ID 顺序产出 (会话 ID, 最后更新时间戳, 压缩记录)，不反序列化"""
+        for i in range(self._count):
+            key, offset, length, last_update = self._entry(i)
+            yield key.decode("utf-8"), last_update, self._map[offset:offset + length]
+
+    def load(self, session_id: str) -> Optional[ConsultationState]:
+        """加载单个会话，不存在返回 None"""
+        location = self._find(session_id)
+        if location is None:
+            return None
+        offset, length = location
+        return decode_state(self._map[offset:offset + length])
+
+    def close(self) -> None:
+        """关闭文件映射"""
+        if not self._map.closed:
+            self._map.close()
+        self._file.close()
+
+    def _entry(self, i: int) -> Tuple[bytes, int, int, float]:
+        """读取第 i 个索引项"""
+        (pos,) = struct.unpack_from("<Q", self._map, self._table_offset + 8 * i)
+        (key_len,) = struct.unpack_from("<H", self._map, pos)
+        key = self._map[pos + 2:pos + 2 + key_len]
+        offset, length, last_update = _ENTRY_TAIL.unpack_from(self._map, pos + 2 + key_len)
+        return key, offset, length, last_update
+
+    def _find(self, session_id: str) -> Optional[Tuple[int, int]]:
+        """二分查找会话记录位置"""
+        target = session_id.encode("utf-8")
+        low, high = 0, self._count - 1
+        while low <= high:
+            mid = (low + high) // 2
+            key, offset, length, _ = self._entry(mid)
+            if key == target:
+                return offset, length
+            if key < target:
+                low = mid + 1
+            else:
+                high = mid - 1
+        return None
@@ -0,0 +1,171 @@
+# app/services/storage/sqlite_store.py
+import random
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, Optional
+
+from app.models.consultation_state import ConsultationState
+from app.services.storage.base import SessionStore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id  TEXT PRIMARY KEY,
+    last_update REAL NOT NULL,
+    version     INTEGER NOT NULL,
+    data        BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_last_update ON sessions (last_update);
+"""
+
+
+class SQLiteSessionStore(SessionStore):
+    """基于 SQLite WAL 的共享会话存储
+
+    多个 uvicorn worker 打开同一个数据库文件即可共享会话：
+    - 写入先进入缓冲区，flush 时在一个事务内批量提交
+    - 读取走本地缓存，只在行版本号变化时才反序列化
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_pending: int = 64,
+        cache_size: int = 10_000,
+        busy_timeout: float = 5.0,
+    ):
+        """
+        初始化存储
+
+        Args:
+            path: 数据库文件路径
+            max_pending: 缓冲写入达到该数量时自动提交
+            cache_size: 本地读缓存的最大会话数
+            busy_timeout: 等待其他进程释放写锁的秒数
+        """
+        self.path = path
+        self.max_pending = max_pending
+        self.cache_size = cache_size
+        self._lock = threading.RLock()
+        self._pending: Dict[str, ConsultationState] = {}
+        self._cache: "OrderedDict[str, tuple[int, ConsultationState]]" = OrderedDict()
+        self._conn = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, session_id: str) -> Optional[ConsultationState]:
+        with self._lock:
+            if session_id in self._pending:
+                return self._pending[session_id]
+
+            cached = self._cache.get(session_id)
+            cached_version = cached[0] if cached else None
+            # 版本号未变化时不返回数据列，避免重复反序列化
+            row = self._conn.execute(
+                "SELECT version, CASE WHEN version = ? THEN NULL ELSE data END "
+                "FROM sessions WHERE session_id = ?",
+                (cached_version, session_id),
+            ).fetchone()
+
+            if row is None:
+                self._cache.pop(session_id, None)
+                return None
+            version, data = row
+            if data is None:
+                self._cache.move_to_end(session_id)
+                return cached[1]
+
+            state = ConsultationState.model_validate_json(data)
+            self._remember(session_id, version, state)
+            return state
+
+    def put(self, session_id: str, state: ConsultationState) -> None:
+        with self._lock:
+            self._pending[session_id] = state
+            if len(self._pending) >= self.max_pending:
+                self.flush()
+
+    def flush(self) -> None:
+        """在单个事务内提交全部缓冲写入"""
+        with self._lock:
+            if not self._pending:
+                return
+            rows = []
+            for sid, state in self._pending.items():
+                version = random.getrandbits(63)
+                rows.append((
+                    sid,
+                    state.last_update.timestamp(),
+                    version,
+                    state.model_dump_json().encode("utf-8"),
+                ))
+                self._remember(sid, version, state)
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO sessions (session_id, last_update, version, data) "
+                    "VALUES (?, ?, ?, ?) ON CONFLICT(session_id) DO UPDATE SET "
+                    "last_update = excluded.last_update, "
+                    "version = excluded.version, data = excluded.data",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._pending.clear()
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._pending.pop(session_id, None)
+            self._cache.pop(session_id, None)
+            self._conn.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            )
+
+    def expire(self, cutoff: float, limit: Optional[int] = None) -> List[str]:
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(
+                "DELETE FROM sessions WHERE session_id IN ("
+                "SELECT session_id FROM sessions WHERE last_update < ? "
+                "ORDER BY last_update LIMIT ?) RETURNING session_id",
+                (cutoff, -1 if limit is None else limit),
+            ).fetchall()
+            expired = [row[0] for row in rows]
+            for sid in expired:
+                self._cache.pop(sid, None)
+            return expired
+
+    def __len__(self) -> int:
+        with self._lock:
+            self.flush()
+            return self._conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute("SELECT session_id FROM sessions").fetchall()
+        return iter([row[0] for row in rows])
+
+    def footprint(self) -> Dict:
+        return {
+            "sessions": len(self),
+            "cached_sessions": len(self._cache),
+            "pending_writes": len(self._pending),
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def _remember(self, session_id: str, version: int, state: ConsultationState) -> None:
+        """写入本地缓存并按 LRU 淘汰"""
+        self._cache[session_id] = (version, state)
+        self._cache.move_to_end(session_id)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
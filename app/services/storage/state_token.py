@@ -0,0 +1,110 @@
+# app/services/storage/state_token.py
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import zlib
+from typing import Optional
+
+from app.models.consultation_state import ConsultationState
+
+logger = logging.getLogger(__name__)
+
+TOKEN_VERSION = b"\x01"
+# 进程内随机密钥签发的令牌，只有签发进程能校验
+EPHEMERAL_TOKEN_VERSION = b"\x81"
+SIGNATURE_BYTES = 16
+
+
+class InvalidStateToken(ValueError):
+    """状态令牌格式错误或签名校验失败"""
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+class StateTokenCodec:
+    """客户端携带的会话状态令牌
+
+    令牌 = base64url(版本 + zlib(精简 JSON)) + "." + base64url(HMAC-SHA256 截断签名)。
+    服务端无需保存会话，任意节点只要共享密钥即可续接对话。
+    """
+
+    def __init__(self, secret: Optional[str] = None):
+        """
+        初始化编解码器
+
+        Args:
+            secret: 签名密钥；为空时生成进程内随机密钥（令牌仅在本进程有效）
+        """
+        key = secret.encode("utf-8") if secret else secrets.token_bytes(32)
+        self._key = key
+        self._version = TOKEN_VERSION if secret else EPHEMERAL_TOKEN_VERSION
+        self._warned = False
+
+    def encode(self, state: ConsultationState) -> str:
+        """
+        将会话状态编码为签名令牌
+
+        Args:
+            state: 会话状态
+
+        Returns:
+            令牌字符串
+        """
+        document = state.model_dump(mode="json", exclude_defaults=True)
+        document["session_id"] = state.session_id
+        document["last_update"] = state.last_update.isoformat()
+        raw = json.dumps(document, ensure_ascii=False, separators=(",", ":"))
+        if self._version == EPHEMERAL_TOKEN_VERSION and not self._warned:
+            self._warned = True
+            logger.warning("未配置 STATE_TOKEN_SECRET：无状态令牌使用进程内随机密钥，其他 worker 与重启后均无法校验")
+        payload = self._version + zlib.compress(raw.encode("utf-8"), 9)
+        return f"{_b64encode(payload)}.{_b64encode(self._sign(payload))}"
+
+    def decode(self, token: str) -> ConsultationState:
+        """
+        校验并解码令牌
+
+        Args:
+            token: 令牌字符串
+
+        Returns:
+            会话状态
+
+        Raises:
+            InvalidStateToken: 令牌被篡改、格式错误或版本不支持
+        """
+        try:
+            body, signature = token.split(".", 1)
+            payload = _b64decode(body)
+            expected = _b64decode(signature)
+        except (ValueError, UnicodeEncodeError) as exc:
+            raise InvalidStateToken("令牌格式错误") from exc
+
+        if not hmac.compare_digest(self._sign(payload), expected):
+            if payload[:1] == EPHEMERAL_TOKEN_VERSION:
+                logger.error("收到其他进程用随机密钥签发的状态令牌：多 worker 部署必须配置 STATE_TOKEN_SECRET")
+                raise InvalidStateToken(
+                    "令牌由未配置 STATE_TOKEN_SECRET 的其他 worker（或重启前的进程）签发，无法校验"
+                )
+            raise InvalidStateToken("令牌签名无效")
+        if payload[:1] != self._version:
+            raise InvalidStateToken("令牌版本不支持")
+
+        try:
+            raw = zlib.decompress(payload[1:])
+            return ConsultationState.model_validate_json(raw)
+        except (zlib.error, ValueError) as exc:
+            raise InvalidStateToken("令牌内容无法解析") from exc
+
+    def _sign(self, payload: bytes) -> bytes:
+        """计算截断的 HMAC 签名"""
+        return hmac.new(self._key, payload, hashlib.sha256).digest()[:SIGNATURE_BYTES]
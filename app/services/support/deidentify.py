@@ -0,0 +1,153 @@
+# app/services/support/deidentify.py
+"""问诊记录归档的批量脱敏导出
+
+输入文件通过 mmap 按块切分，块边界只落在 ASCII 非单词字符（换行、空格、标点等）上：
+敏感信息模式不会匹配这些字符，因此任何敏感信息都不会被切断，逐块脱敏的结果与整个
+文件一次脱敏完全一致；这些字节也不会出现在 UTF-8 多字节字符内部，每块都能独立解码。
+
+各块分发到进程池处理（工作进程按偏移自行读取，不经进程间传递输入），输出按原顺序写出，
+在途块数有上限，内存占用只与块大小和进程数有关，与文件大小无关。
+"""
+import mmap
+import re
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import BinaryIO, Dict, Iterator, Tuple
+
+from app.services.support.input_sanitization import InputSanitizationService
+
+# 可作为块边界的字节（不在任何敏感信息模式中，也不属于 UTF-8 多字节字符）
+_BOUNDARY_BYTE = re.compile(rb"[^\w@.\x80-\xff]")
+# 向后查找块边界的最大字节数，找不到时退化为在字符边界切分
+BOUNDARY_SEARCH = 64 * 1024
+
+
+@dataclass
+class DeidentifyReport:
+    """批量脱敏汇总"""
+    bytes_in: int = 0
+    bytes_out: int = 0
+    chunks: int = 0
+    counts: Dict[str, int] = field(
+        default_factory=lambda: dict.fromkeys(InputSanitizationService.PATTERNS, 0)
+    )
+    elapsed_seconds: float = 0.0
+
+    def merge(self, other: "DeidentifyReport") -> None:
+        """合并另一块的统计"""
+        self.bytes_in += other.bytes_in
+        self.bytes_out += other.bytes_out
+        self.chunks += other.chunks
+        for kind, count in other.counts.items():
+            self.counts[kind] += count
+
+    def to_dict(self) -> Dict:
+        """转为可序列化的字典"""
+        report = asdict(self)
+        report["mb_per_second"] = (
+            round(self.bytes_in / self.elapsed_seconds / 1e6, 1) if self.elapsed_seconds else None
+        )
+        return report
+
+
+def redact_bytes(data: bytes, service: InputSanitizationService) -> Tuple[bytes, DeidentifyReport]:
+    """
+    脱敏一块数据（无法解码的字节原样保留）
+
+    Args:
+        data: 原始字节
+        service: 脱敏服务
+
+    Returns:
+        (脱敏后字节, 本块统计)
+    """
+    cleaned, spans = service.redact_pii(data.decode("utf-8", "surrogateescape"))
+    output = cleaned.encode("utf-8", "surrogateescape")
+    report = DeidentifyReport(bytes_in=len(data), bytes_out=len(output), chunks=1)
+    for span in spans:
+        report.counts[span.kind] += 1
+    return output, report
+
+
+def iter_chunks(data: mmap.mmap, chunk_bytes: int) -> Iterator[Tuple[int, int]]:
+    """
+    按约 chunk_bytes 切分，产出 (起始偏移, 结束偏移)
+
+    Args:
+        data: 输入文件映射
+        chunk_bytes: 目标块大小
+
+    Returns:
+        块范围迭代器
+    """
+    size = len(data)
+    start = 0
+    while start < size:
+        end = min(start + chunk_bytes, size)
+        if end < size:
+            found = _BOUNDARY_BYTE.search(data, end, min(end + BOUNDARY_SEARCH, size))
+            if found is not None:
+                end = found.end()
+            else:
+                end = min(end + BOUNDARY_SEARCH, size)
+                while end < size and data[end] & 0xC0 == 0x80:
+                    end += 1
+        yield start, end
+        start = end
+
+
+def _redact_range(path: str, start: int, end: int) -> Tuple[bytes, DeidentifyReport]:
+    """工作进程入口：读取并脱敏文件的一段"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        return redact_bytes(f.read(end - start), InputSanitizationService())
+
+
+def deidentify_file(
+    path: str,
+    output: BinaryIO,
+    workers: int = 1,
+    chunk_bytes: int = 4 * 1024 * 1024,
+) -> DeidentifyReport:
+    """
+    脱敏整个文件
+
+    Args:
+        path: 输入文件路径（任意文本格式，如 JSONL 导出或纯文本记录）
+        output: 脱敏结果的写入目标（二进制）
+        workers: 进程数，1 表示在当前进程执行
+        chunk_bytes: 每块字节数
+
+    Returns:
+        汇总统计
+    """
+    started = time.perf_counter()
+    report = DeidentifyReport()
+
+    def consume(result: Tuple[bytes, DeidentifyReport]) -> None:
+        data, chunk_report = result
+        output.write(data)
+        report.merge(chunk_report)
+
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return report
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if workers <= 1:
+                service = InputSanitizationService()
+                for start, end in iter_chunks(data, chunk_bytes):
+                    consume(redact_bytes(data[start:end], service))
+            else:
+                with ProcessPoolExecutor(workers) as pool:
+                    pending = deque()
+                    for start, end in iter_chunks(data, chunk_bytes):
+                        pending.append(pool.submit(_redact_range, path, start, end))
+                        if len(pending) >= workers * 2:
+                            consume(pending.popleft().result())
+                    while pending:
+                        consume(pending.popleft().result())
+
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
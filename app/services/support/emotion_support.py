@@ -1,6 +1,8 @@
 # app/services/emotion_support.py
 from enum import Enum
-from typing import List
+from typing import List, Optional, Set
+
+from app.services.lexicon import LexiconRegistry, default_registry
 
 
 class EmotionLevel(Enum):
@@ -14,14 +16,14 @@ class EmotionLevel(Enum):
 class EmotionSupportService:
     """情感支持服务"""
 
-    # 轻度焦虑关键词
-    MILD_KEYWORDS = ["担心", "有点怕", "紧张"]
-
-    # 中度焦虑关键词
-    MODERATE_KEYWORDS = ["害怕", "焦虑", "不安", "很担心"]
+    def __init__(self, lexicons: Optional[LexiconRegistry] = None):
+        """
+        初始化服务
 
-    # 重度痛苦关键词
-    SEVERE_KEYWORDS = ["太害怕了", "恐惧", "整晚睡不着", "一直在哭", "崩溃"]
+        Args:
+            lexicons: 词表注册表（情绪关键词见词表 emotion 段），默认使用全局词表
+        """
+        self.lexicons = lexicons or default_registry()
 
     def detect_emotion_level(self, text: str) -> EmotionLevel:
         """
@@ -33,17 +35,22 @@ class EmotionSupportService:
         Returns:
             情绪等级
         """
-        # 检查重度
-        if any(keyword in text for keyword in self.SEVERE_KEYWORDS):
-            return EmotionLevel.SEVERE
+        return self.level_for(self.lexicons.current.matcher("emotion").labels(text))
 
-        # 检查中度
-        if any(keyword in text for keyword in self.MODERATE_KEYWORDS):
-            return EmotionLevel.MODERATE
+    def level_for(self, levels: Set[str]) -> EmotionLevel:
+        """
+        由命中的词表标签确定情绪等级
 
-        # 检查轻度
-        if any(keyword in text for keyword in self.MILD_KEYWORDS):
-            return EmotionLevel.MILD
+        Args:
+            levels: 命中的 emotion 词表标签
+
+        Returns:
+            情绪等级
+        """
+        # 按重度、中度、轻度的顺序取最高等级
+        for level in (EmotionLevel.SEVERE, EmotionLevel.MODERATE, EmotionLevel.MILD):
+            if level.value in levels:
+                return level
 
         return EmotionLevel.NORMAL
 
@@ -1,17 +1,29 @@
 # app/services/input_sanitization.py
 import re
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.config import settings
+
+
+@dataclass(frozen=True)
+class PiiSpan:
+    """敏感信息片段（位置相对于原始文本）"""
+    kind: str
+    start: int
+    end: int
+    text: str
 
 
 class InputSanitizationService:
     """敏感信息脱敏与输入清洗服务"""
 
-    # 敏感信息正则模式
+    # 敏感信息正则模式（量词均有上限，单个位置的匹配成本有界，整体扫描为线性）
     PATTERNS = {
         "name": r"[\u4e00-\u9fa5]{2,4}(?:先生|女士)",
         "id_card": r"\d{15}|\d{17}[\dXx]",
         "phone": r"1[3-9]\d{9}",
-        "email": r"\w+@\w+\.\w+",
+        "email": r"\w{1,64}@\w{1,255}\.\w{1,63}",
     }
 
     # 危险模式（注入攻击）
@@ -20,9 +32,32 @@ class InputSanitizationService:
         r"javascript:",
         r"onerror=",
         r"ignore instructions",
-        r"print.*length",
+        r"print.{0,200}length",
     ]
 
+    # 分块扫描时每块向后多读的字符数，不小于任一模式的最大匹配长度
+    SCAN_OVERLAP = 512
+
+    # 所有敏感信息模式合并为一个带命名分组的正则，一次扫描完成定位与替换；
+    # 重叠时取最靠左的匹配，同一位置按 PATTERNS 顺序优先
+    _PII_REGEX = re.compile("|".join(f"(?P<{kind}>{pattern})" for kind, pattern in PATTERNS.items()))
+
+    _WORD_CHAR = re.compile(r"\w")
+
+    # 注入检测单独预编译为一个正则
+    _INJECTION_REGEX = re.compile(
+        "|".join(f"(?:{pattern})" for pattern in DANGEROUS_PATTERNS), re.IGNORECASE
+    )
+
+    def __init__(self, chunk_size: Optional[int] = None):
+        """
+        初始化
+
+        Args:
+            chunk_size: 分块扫描的块大小（字符），默认读取配置
+        """
+        self.chunk_size = max(chunk_size or settings.sanitization_chunk_chars, self.SCAN_OVERLAP)
+
     def sanitize(self, text: str) -> Tuple[str, Dict[str, List[str]]]:
         """
         清洗输入文本中的敏感信息
@@ -33,20 +68,56 @@ class InputSanitizationService:
         Returns:
             (清洗后文本, 检测到的敏感信息字典)
         """
-        detected = {}
-        cleaned_text = text
+        cleaned, spans = self.redact_pii(text)
+        return cleaned, self.group_spans(spans)
+
+    def redact_pii(self, text: str) -> Tuple[str, List[PiiSpan]]:
+        """
+        单次扫描定位并替换全部敏感信息
+
+        Args:
+            text: 原始文本
+
+        Returns:
+            (清洗后文本, 按位置排序的敏感信息片段)
+        """
+        spans = self.find_pii(text)
+        parts, position = [], 0
+        for span in spans:
+            parts.append(text[position:span.start])
+            parts.append(f"[{span.kind}_已脱敏]")
+            position = span.end
+        parts.append(text[position:])
+        return "".join(parts), spans
 
-        for key, pattern in self.PATTERNS.items():
-            matches = re.findall(pattern, cleaned_text)
-            if matches:
-                detected[key] = matches
-                cleaned_text = re.sub(
-                    pattern,
-                    f"[{key}_已脱敏]",
-                    cleaned_text
-                )
+    def find_pii(self, text: str) -> List[PiiSpan]:
+        """
+        定位文本中的敏感信息（不替换）
+
+        Args:
+            text: 原始文本
+
+        Returns:
+            按起始位置排序的敏感信息片段
+        """
+        spans: List[PiiSpan] = []
+        previous_end = 0
+        for match in self._scan(self._PII_REGEX, text):
+            start = match.start()
+            if match.lastgroup == "email":
+                # 本地部分超过 64 个字符时最左匹配从中间开始，向前扩展到整个 \w 串，前半段同样脱敏
+                while start > previous_end and self._WORD_CHAR.match(text, start - 1):
+                    start -= 1
+            spans.append(PiiSpan(match.lastgroup, start, match.end(), text[start:match.end()]))
+            previous_end = match.end()
+        return spans
 
-        return cleaned_text, detected
+    def group_spans(self, spans: List[PiiSpan]) -> Dict[str, List[str]]:
+        """按类型汇总敏感信息原文（类型顺序与 PATTERNS 一致）"""
+        grouped: Dict[str, List[str]] = {}
+        for span in spans:
+            grouped.setdefault(span.kind, []).append(span.text)
+        return {kind: grouped[kind] for kind in self.PATTERNS if kind in grouped}
 
     def validate_input(self, text: str) -> bool:
         """
@@ -58,7 +129,29 @@ class InputSanitizationService:
         Returns:
             True 表示安全，False 表示检测到攻击
         """
-        for pattern in self.DANGEROUS_PATTERNS:
-            if re.search(pattern, text, re.IGNORECASE):
-                return False
-        return True
+        return next(self._scan(self._INJECTION_REGEX, text), None) is None
+
+    def _scan(self, regex: re.Pattern, text: str) -> Iterator[re.Match]:
+        """
+        分块扫描，结果与整段 finditer 一致
+
+        每块只在 [块起点, 块终点 + SCAN_OVERLAP) 内搜索，并只接受起点落在块内的匹配；
+        由于匹配长度不超过 SCAN_OVERLAP，跨块的匹配不会被截断，单次搜索的回溯范围也有界。
+
+        Args:
+            regex: 预编译正则
+            text: 输入文本
+
+        Returns:
+            按位置顺序的匹配
+        """
+        length = len(text)
+        resume = 0
+        for start in range(0, length, self.chunk_size):
+            end = start + self.chunk_size
+            window_end = min(end + self.SCAN_OVERLAP, length)
+            for match in regex.finditer(text, max(start, resume), window_end):
+                if match.start() >= end:
+                    break
+                resume = match.end()
+                yield match
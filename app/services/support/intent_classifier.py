@@ -1,5 +1,8 @@
 # app/services/intent_classifier.py
 from enum import Enum
+from typing import Optional, Set
+
+from app.services.lexicon import LexiconRegistry, default_registry
 
 
 class Intent(Enum):
@@ -14,17 +17,14 @@ class Intent(Enum):
 class IntentClassifier:
     """用户意图分类服务"""
 
-    # 问题关键词
-    QUESTION_KEYWORDS = ["为什么", "怎么", "什么", "请问", "能否"]
-
-    # 抱怨关键词
-    COMPLAINT_KEYWORDS = ["烦", "慢", "多", "麻烦", "啰嗦"]
-
-    # 情绪关键词
-    EMOTIONAL_KEYWORDS = ["害怕", "担心", "焦虑", "恐惧", "紧张", "难过"]
+    def __init__(self, lexicons: Optional[LexiconRegistry] = None):
+        """
+        初始化服务
 
-    # 无关聊天关键词
-    IRRELEVANT_KEYWORDS = ["天气", "吃饭", "睡觉", "周末", "电影"]
+        Args:
+            lexicons: 词表注册表（意图关键词见词表 intent 段），默认使用全局词表
+        """
+        self.lexicons = lexicons or default_registry()
 
     def classify(self, user_input: str) -> Intent:
         """
@@ -36,21 +36,22 @@ class IntentClassifier:
         Returns:
             意图类别
         """
-        # 检测情绪
-        if any(keyword in user_input for keyword in self.EMOTIONAL_KEYWORDS):
-            return Intent.EMOTIONAL
+        return self.intent_for(self.lexicons.current.matcher("intent").labels(user_input))
 
-        # 检测抱怨
-        if any(keyword in user_input for keyword in self.COMPLAINT_KEYWORDS):
-            return Intent.COMPLAINT
+    def intent_for(self, hits: Set[str]) -> Intent:
+        """
+        由命中的词表标签确定意图
 
-        # 检测问题
-        if any(keyword in user_input for keyword in self.QUESTION_KEYWORDS):
-            return Intent.QUESTION
+        Args:
+            hits: 命中的 intent 词表标签
 
-        # 检测无关聊天
-        if any(keyword in user_input for keyword in self.IRRELEVANT_KEYWORDS):
-            return Intent.IRRELEVANT_CHAT
+        Returns:
+            意图类别
+        """
+        # 依次检测情绪、抱怨、问题、无关聊天
+        for intent in (Intent.EMOTIONAL, Intent.COMPLAINT, Intent.QUESTION, Intent.IRRELEVANT_CHAT):
+            if intent.value in hits:
+                return intent
 
         # 默认：相关信息
         return Intent.RELEVANT_INFO
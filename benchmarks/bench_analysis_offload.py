@@ -0,0 +1,92 @@
+# benchmarks/bench_analysis_offload.py
+"""文本分析执行层基准：混合负载下短输入的尾延迟
+
+同一事件循环内，短输入按固定间隔到达（模拟常规问诊轮次），长输入以较低频率
+穿插到达。短输入的延迟从计划到达时刻算起，事件循环被长输入阻塞的时间会计入。
+对比全部内联、线程池与进程池三种执行方式下短输入的 P50 / P99 / 最大延迟，
+以及长输入的平均延迟与被拒绝数。
+
+用法:
+    python -m benchmarks.bench_analysis_offload [长输入字符数] [运行秒数] [池大小]
+"""
+import asyncio
+import sys
+
+from app.services.analysis.offload import AnalysisExecutor, AnalysisOverloaded
+from app.services.analysis.text_analysis import TextAnalysisPipeline
+
+SMALL_TEXT = "我头痛三天了，有点恶心"
+SMALL_INTERVAL = 0.002
+LARGE_INTERVAL = 0.02
+SAMPLE = "我头痛三天了，有点恶心，电话13812345678，担心是不是高血压，晚上睡不着。"
+
+
+async def run(executor: AnalysisExecutor, large_chars: int, seconds: float) -> dict:
+    """返回短输入延迟分布与长输入统计"""
+    large_text = (SAMPLE * (large_chars // len(SAMPLE) + 1))[:large_chars]
+    small, large, rejected = [], [], 0
+    tasks = set()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+
+    async def request(text: str, due: float, into: list) -> None:
+        nonlocal rejected
+        try:
+            await executor.inspect(text)
+        except AnalysisOverloaded:
+            rejected += 1
+            return
+        into.append(loop.time() - due)
+
+    async def arrivals(text: str, interval: float, into: list) -> None:
+        count = 0
+        while True:
+            due = start + count * interval
+            if due - start >= seconds:
+                return
+            await asyncio.sleep(max(due - loop.time(), 0))
+            task = asyncio.create_task(request(text, due, into))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            count += 1
+
+    await asyncio.gather(
+        arrivals(SMALL_TEXT, SMALL_INTERVAL, small),
+        arrivals(large_text, LARGE_INTERVAL, large),
+    )
+    await asyncio.gather(*tasks)
+    small.sort()
+    return {
+        "p50": small[len(small) // 2] * 1000,
+        "p99": small[int(len(small) * 0.99) - 1] * 1000,
+        "max": small[-1] * 1000,
+        "large": sum(large) / len(large) * 1000 if large else float("nan"),
+        "rejected": rejected,
+    }
+
+
+def main(argv: list) -> None:
+    large_chars = int(argv[0]) if argv else 20000
+    seconds = float(argv[1]) if len(argv) > 1 else 3.0
+    workers = int(argv[2]) if len(argv) > 2 else 2
+    pipeline = TextAnalysisPipeline()
+    modes = [
+        ("inline", AnalysisExecutor(pipeline, workers=0)),
+        ("thread", AnalysisExecutor(pipeline, workers=workers)),
+        ("process", AnalysisExecutor(pipeline, workers=workers, processes=True)),
+    ]
+    print(f"large input {large_chars} chars every {LARGE_INTERVAL * 1000:.0f} ms, "
+          f"small input every {SMALL_INTERVAL * 1000:.0f} ms, {seconds:.0f} s per mode")
+    print(f"{'mode':>8}  {'p50 ms':>7}  {'p99 ms':>7}  {'max ms':>7}  {'large ms':>8}  {'rejected':>8}")
+    for name, executor in modes:
+        try:
+            asyncio.run(run(executor, large_chars, 0.2))
+            result = asyncio.run(run(executor, large_chars, seconds))
+        finally:
+            executor.shutdown()
+        print(f"{name:>8}  {result['p50']:>7.2f}  {result['p99']:>7.2f}  {result['max']:>7.2f}  "
+              f"{result['large']:>8.2f}  {result['rejected']:>8}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
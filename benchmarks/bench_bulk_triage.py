@@ -0,0 +1,61 @@
+# benchmarks/bench_bulk_triage.py
+"""批量重新分诊基准：不同进程数下的吞吐与加速比
+
+用法:
+    python -m benchmarks.bench_bulk_triage [记录数] [进程数 ...]
+"""
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+
+from app.services.detection.bulk_triage import bulk_triage
+
+DEFAULT_RECORDS = 200_000
+USER_TURNS = [
+    "我这两天有点头痛，晚上睡不好",
+    "今天早上起来觉得胸口有点闷，还有点喘不上气",
+    "发烧39度，一直持续呕吐",
+    "没有别的不舒服，就是有点累",
+    "以前有高血压，一直在吃药",
+]
+
+
+def write_corpus(path: str, records: int) -> None:
+    """生成合成会话语料（每条 6 轮用户发言）"""
+    rng = random.Random(0)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(records):
+            history = []
+            for _ in range(6):
+                history.append(["user", rng.choice(USER_TURNS)])
+                history.append(["assistant", "请问还有其他症状吗？"])
+            record = {"session_id": f"s{i}", "emergency_flag": False, "conversation_history": history}
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def main(argv: list) -> None:
+    records = int(argv[0]) if argv else DEFAULT_RECORDS
+    cpus = os.cpu_count() or 1
+    worker_counts = [int(arg) for arg in argv[1:]] or sorted({1, 2, 4, cpus})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "corpus.jsonl")
+        write_corpus(path, records)
+        print(f"records={records} cpus={cpus}")
+        print(f"{'workers':>8}  {'seconds':>8}  {'records/s':>10}  {'speedup':>8}")
+        baseline = None
+        for workers in worker_counts:
+            with open(path, encoding="utf-8") as source:
+                report = bulk_triage(source, io.StringIO(), workers=workers, chunk_size=2000)
+            baseline = baseline or report.elapsed_seconds
+            print(
+                f"{workers:>8}  {report.elapsed_seconds:>8.2f}"
+                f"  {report.records / report.elapsed_seconds:>10.0f}"
+                f"  {baseline / report.elapsed_seconds:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
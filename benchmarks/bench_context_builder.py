@@ -0,0 +1,51 @@
+# benchmarks/bench_context_builder.py
+"""模型上下文构造基准：每轮发送完整对话与按预算压缩的累计 token 与耗时
+
+模拟一段 N 轮问诊，每轮都构造一次上下文（最坏情况：每轮都调用模型），对比：
+- 完整对话："\\n".join(conversation_history)，累计 token 随轮数平方增长
+- ContextBuilder：已采集信息摘要 + 预算内最近对话，每轮 token 有上限
+
+用法:
+    python -m benchmarks.bench_context_builder [预算 token] [轮数 ...]
+"""
+import sys
+import time
+
+from app.models.consultation_state import ConsultationState
+from app.models.conversation import ConversationHistory, Role
+from app.services.llm import ContextBuilder, estimate_tokens
+
+DEFAULT_TURNS = [10, 50, 200]
+
+
+def simulate(turns: int, budget: int) -> tuple:
+    """返回 (完整对话累计 token, 压缩后累计 token, 每轮构造耗时微秒)"""
+    state = ConsultationState(
+        session_id="bench", conversation_history=ConversationHistory(maxlen=turns * 2)
+    )
+    builder = ContextBuilder(budget)
+    full_total = compact_total = 0
+    elapsed = 0.0
+    for i in range(turns):
+        state.conversation_history.add(Role.USER, f"第{i}轮：我头痛，晚上睡不好，今天早上胸口有点闷")
+        state.conversation_history.add(Role.ASSISTANT, "好的，请问这个症状持续多久了？有没有其他伴随症状？")
+        if i % 5 == 0:
+            state.collected_data[f"note_{i}"] = {"symptom": "头痛", "turn": i}
+        full_total += estimate_tokens("\n".join(state.conversation_history))
+        start = time.perf_counter()
+        compact_total += builder.build(state).tokens
+        elapsed += time.perf_counter() - start
+    return full_total, compact_total, elapsed / turns * 1e6
+
+
+def main(argv: list) -> None:
+    budget = int(argv[0]) if argv else 1000
+    print(f"{'turns':>6}  {'full tokens':>12}  {'compact tokens':>15}  {'saved':>7}  {'build us':>9}")
+    for turns in [int(arg) for arg in argv[1:]] or DEFAULT_TURNS:
+        full, compact, build_us = simulate(turns, budget)
+        saved = 1 - compact / full if full else 0
+        print(f"{turns:>6}  {full:>12}  {compact:>15}  {saved:>7.1%}  {build_us:>9.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,50 @@
+# benchmarks/bench_incremental_extraction.py
+"""增量提取基准：整段重扫与增量提取在长对话中的累计耗时
+
+每轮追加一问一答后提取一次主诉。整段重扫的累计成本随轮数平方增长，
+增量提取只处理新增轮次，累计成本线性增长。
+
+用法:
+    python -m benchmarks.bench_incremental_extraction [对话轮数 ...]
+"""
+import sys
+import time
+
+from app.models.conversation import ConversationHistory, Role
+from app.services.analysis.structured_extraction import StructuredExtractionService
+
+DEFAULT_TURNS = [50, 100, 200]
+
+
+def run(turns: int, incremental: bool) -> float:
+    """模拟一次问诊，返回提取累计耗时（毫秒）"""
+    service = StructuredExtractionService()
+    # 放宽上限，保留完整对话，以体现整段重扫的真实成本
+    history = ConversationHistory(maxlen=turns * 2)
+    progress = {}
+    elapsed = 0.0
+    for i in range(turns):
+        history.add(Role.USER, f"第{i}次复诊，头还是很痛，太阳穴胀痛，有点恶心，血压偏高")
+        history.add(Role.ASSISTANT, "请问这个症状持续多久了？有没有其他伴随症状？")
+        start = time.perf_counter()
+        if incremental:
+            service.extract_incremental(history, progress, "chief_complaint")
+        else:
+            service.extract("\n".join(history), "chief_complaint")
+        elapsed += time.perf_counter() - start
+    return elapsed * 1000
+
+
+def main(argv: list) -> None:
+    print(f"{'turns':>6}  {'full ms':>9}  {'incr ms':>9}  {'full/turn us':>13}  {'incr/turn us':>13}")
+    for turns in [int(arg) for arg in argv] or DEFAULT_TURNS:
+        full = run(turns, incremental=False)
+        incr = run(turns, incremental=True)
+        print(
+            f"{turns:>6}  {full:>9.2f}  {incr:>9.2f}"
+            f"  {full / turns * 1000:>13.1f}  {incr / turns * 1000:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
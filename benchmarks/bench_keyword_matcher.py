@@ -0,0 +1,63 @@
+# benchmarks/bench_keyword_matcher.py
+"""关键词匹配基准：逐词 any(k in text) 循环与编译后的 KeywordMatcher
+
+词表由内置紧急预警词加随机生成的中文词组成，对比：
+- 任一命中判断：any(k in text for k in terms) vs contains_any
+- 全部命中：[k for k in terms if k in text] vs matched
+
+用法:
+    python -m benchmarks.bench_keyword_matcher [词表规模 ...]
+"""
+import random
+import sys
+import time
+
+from app.services.lexicon import KeywordMatcher, default_registry
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 50_000]
+TEXT_LENGTHS = [20, 200]
+REPEAT = 200
+
+
+def build_lexicon(size: int, rng: random.Random) -> list:
+    """服务关键词 + 随机 2~6 字中文词"""
+    emergency = default_registry().current["emergency"]
+    terms = dict.fromkeys(emergency["red"] + emergency["yellow"])
+    while len(terms) < size:
+        word = "".join(chr(rng.randint(0x4E00, 0x9FA5)) for _ in range(rng.randint(2, 6)))
+        terms[word] = None
+    return list(terms)
+
+
+def timed(fn, texts: list) -> float:
+    """每条文本的平均耗时（微秒）"""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        for text in texts:
+            fn(text)
+    return (time.perf_counter() - start) / (REPEAT * len(texts)) * 1e6
+
+
+def main(argv: list) -> None:
+    rng = random.Random(0)
+    base = "我这两天有点头痛，晚上睡不好，今天早上起来觉得胸口有点闷，"
+    print(f"{'terms':>7}  {'chars':>5}  {'build ms':>9}  {'any us':>9}  {'ac any us':>10}"
+          f"  {'all us':>9}  {'ac all us':>10}")
+    for size in [int(arg) for arg in argv] or DEFAULT_SIZES:
+        terms = build_lexicon(size, rng)
+        start = time.perf_counter()
+        matcher = KeywordMatcher(terms)
+        build_ms = (time.perf_counter() - start) * 1000
+        for length in TEXT_LENGTHS:
+            texts = [(base * (length // len(base) + 1))[:length]]
+            texts.append(texts[0][:-2] + "胸痛")
+            naive_any = timed(lambda t: any(k in t for k in terms), texts)
+            ac_any = timed(matcher.contains_any, texts)
+            naive_all = timed(lambda t: [k for k in terms if k in t], texts)
+            ac_all = timed(matcher.matched, texts)
+            print(f"{size:>7}  {length:>5}  {build_ms:>9.1f}  {naive_any:>9.1f}  {ac_any:>10.1f}"
+                  f"  {naive_all:>9.1f}  {ac_all:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,66 @@
+# benchmarks/bench_llm_batching.py
+"""提取调用合并调度基准：请求数与延迟的权衡（本地 OpenAI 兼容替身）
+
+替身服务每个请求固定延迟 latency。N 个会话在 arrival 秒内均匀到达，
+其中每 DUPLICATE_EVERY 个会话有一个被重复提交（客户端重试），连接池并发上限固定，
+对比不合并与不同 合并窗口 / 批大小 组合的总吞吐、平均与 P95 延迟、请求数
+（窗口内同一段对话只请求一次，不同会话始终各自单独请求）。
+
+用法:
+    python -m benchmarks.bench_llm_batching [会话数] [并发上限]
+"""
+import asyncio
+import sys
+import time
+
+from app.services.llm import LLMExtractionClient, MicroBatcher, RecordExtractor
+from tests.fakes.openai_server import FakeOpenAIServer
+
+LATENCY = 0.05
+ARRIVAL_SECONDS = 1.0
+DUPLICATE_EVERY = 4
+# (合并窗口毫秒, 单批最大任务数)，窗口为 0 表示不合并
+SETTINGS = [(0, 1), (5, 8), (20, 8), (20, 32), (50, 32)]
+
+
+async def run(server: FakeOpenAIServer, sessions: int, limit: int, window_ms: int, batch: int) -> tuple:
+    """返回 (吞吐 会话/秒, 平均延迟毫秒, P95 延迟毫秒, 请求数)"""
+    client = LLMExtractionClient(server.base_url, "bench", "fake-model", max_concurrency=limit)
+    batcher = MicroBatcher(client.extract_jobs, batch, window_ms / 1000) if window_ms else None
+    extractor = RecordExtractor(client, batcher=batcher)
+    latencies = []
+
+    async def submit(conversation: str) -> None:
+        start = time.perf_counter()
+        await extractor.extract(conversation)
+        latencies.append(time.perf_counter() - start)
+
+    async def session(index: int) -> None:
+        await asyncio.sleep(ARRIVAL_SECONDS * index / sessions)
+        conversation = f"患者: 我头痛{index}天了，有高血压"
+        copies = 2 if index % DUPLICATE_EVERY == 0 else 1
+        await asyncio.gather(*(submit(conversation) for _ in range(copies)))
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(session(i) for i in range(sessions)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.aclose()
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    return sessions / elapsed, sum(latencies) / len(latencies) * 1000, p95 * 1000, client.requests
+
+
+def main(argv: list) -> None:
+    sessions = int(argv[0]) if argv else 400
+    limit = int(argv[1]) if len(argv) > 1 else 8
+    print(f"{'window ms':>9}  {'batch':>5}  {'sess/s':>7}  {'avg ms':>7}  {'p95 ms':>7}  {'requests':>8}")
+    with FakeOpenAIServer(latency=LATENCY) as server:
+        for window_ms, batch in SETTINGS:
+            throughput, avg_ms, p95_ms, requests = asyncio.run(run(server, sessions, limit, window_ms, batch))
+            print(f"{window_ms:>9}  {batch:>5}  {throughput:>7.1f}  {avg_ms:>7.1f}  {p95_ms:>7.1f}  {requests:>8}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,65 @@
+# benchmarks/bench_llm_extraction.py
+"""大模型结构化提取延迟基准（本地 OpenAI 兼容替身，固定响应延迟）
+
+对比：
+- 逐字段调用：每个会话依次为三个字段各发一次请求
+- 单次调用：每个会话一次请求提取全部字段
+两者都在共享连接池、给定并发上限下同时处理 N 个会话，输出总耗时、
+单会话平均延迟与请求数。
+
+用法:
+    python -m benchmarks.bench_llm_extraction [会话数] [响应延迟毫秒] [并发上限 ...]
+"""
+import asyncio
+import sys
+import time
+
+from app.services.llm import LLMExtractionClient
+from app.services.llm.schema import FIELD_SCHEMAS
+from tests.fakes.openai_server import FakeOpenAIServer
+
+CONVERSATION = "患者: 我头痛3天了\n助手: 有没有其他症状？\n患者: 有点恶心，以前有高血压"
+
+
+async def per_field(client: LLMExtractionClient) -> None:
+    for name in FIELD_SCHEMAS:
+        await client.extract(CONVERSATION, [name])
+
+
+async def single_call(client: LLMExtractionClient) -> None:
+    await client.extract(CONVERSATION)
+
+
+async def run(server: FakeOpenAIServer, strategy, sessions: int, concurrency: int) -> tuple:
+    """返回 (总耗时秒, 单会话平均延迟毫秒, 请求数)"""
+    client = LLMExtractionClient(server.base_url, "bench", "fake-model", max_concurrency=concurrency)
+    latencies = []
+
+    async def one() -> None:
+        start = time.perf_counter()
+        await strategy(client)
+        latencies.append(time.perf_counter() - start)
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(sessions)))
+        elapsed = time.perf_counter() - start
+    finally:
+        await client.aclose()
+    return elapsed, sum(latencies) / len(latencies) * 1000, client.requests
+
+
+def main(argv: list) -> None:
+    sessions = int(argv[0]) if argv else 100
+    latency_ms = float(argv[1]) if len(argv) > 1 else 50
+    concurrencies = [int(arg) for arg in argv[2:]] or [1, 8, 32]
+    print(f"{'strategy':>11}  {'limit':>5}  {'total s':>8}  {'avg ms':>8}  {'requests':>8}")
+    with FakeOpenAIServer(latency=latency_ms / 1000) as server:
+        for concurrency in concurrencies:
+            for name, strategy in (("per-field", per_field), ("single-call", single_call)):
+                elapsed, avg_ms, requests = asyncio.run(run(server, strategy, sessions, concurrency))
+                print(f"{name:>11}  {concurrency:>5}  {elapsed:>8.2f}  {avg_ms:>8.1f}  {requests:>8}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
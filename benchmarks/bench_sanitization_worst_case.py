@@ -0,0 +1,62 @@
+# benchmarks/bench_sanitization_worst_case.py
+"""输入清洗最坏情况基准：触发正则回溯的恶意输入
+
+对每种构造输入，比较原无界模式（\\w+@…、print.*length）与当前有界模式、
+分块扫描的耗时；输入长度每增大一倍，线性实现的耗时约增大一倍，
+原实现约增大四倍。原实现在超过 LEGACY_LIMIT 的输入上不再运行。
+
+用法:
+    python -m benchmarks.bench_sanitization_worst_case [输入字符数 ...]
+"""
+import re
+import sys
+import time
+
+from app.services.support.input_sanitization import InputSanitizationService
+
+DEFAULT_SIZES = [2_000, 4_000, 8_000, 16_000, 64_000, 256_000]
+LEGACY_LIMIT = 16_000
+
+LEGACY_PII = re.compile(r"\w+@\w+\.\w+")
+LEGACY_INJECTION = re.compile(r"print.*length", re.IGNORECASE)
+
+# 名称 -> (构造函数, 原实现扫描, 当前实现扫描)
+CASES = {
+    "word run, no @": (
+        lambda n: "a" * n,
+        lambda t: LEGACY_PII.findall(t),
+        lambda s, t: s.sanitize(t),
+    ),
+    "domain, no dot": (
+        lambda n: "a@" + "b" * (n - 2),
+        lambda t: LEGACY_PII.findall(t),
+        lambda s, t: s.sanitize(t),
+    ),
+    "print repeated": (
+        lambda n: "print" * (n // 5),
+        lambda t: LEGACY_INJECTION.search(t),
+        lambda s, t: s.validate_input(t),
+    ),
+}
+
+
+def timed(fn) -> float:
+    """单次耗时（毫秒）"""
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main(argv: list) -> None:
+    service = InputSanitizationService()
+    print(f"{'case':>16}  {'chars':>8}  {'legacy ms':>10}  {'bounded ms':>11}")
+    for name, (build, legacy, current) in CASES.items():
+        for size in [int(arg) for arg in argv] or DEFAULT_SIZES:
+            text = build(size)
+            legacy_ms = f"{timed(lambda: legacy(text)):.1f}" if size <= LEGACY_LIMIT else "-"
+            bounded_ms = timed(lambda: current(service, text))
+            print(f"{name:>16}  {size:>8}  {legacy_ms:>10}  {bounded_ms:>11.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,53 @@
+# benchmarks/bench_session_expiry.py
+"""会话过期清理基准
+
+在不同存活会话规模下测量 ``SessionManager.get_or_create`` 的单次请求延迟，
+验证过期索引使每次请求的清理成本与会话总数无关。
+
+用法:
+    python -m benchmarks.bench_session_expiry [规模 ...]
+    python -m benchmarks.bench_session_expiry 1000 10000 100000 1000000
+"""
+import sys
+import time
+from datetime import datetime
+
+from app.models.consultation_state import ConsultationState
+from app.services.core.session_manager import SessionManager
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+REQUESTS = 20_000
+
+
+def populate(manager: SessionManager, size: int) -> list:
+    """批量写入存活会话，返回会话 ID 列表"""
+    now = datetime.now()
+    ids = []
+    for i in range(size):
+        sid = f"s-{i}"
+        manager.update(sid, ConsultationState.model_construct(
+            session_id=sid, last_update=now
+        ))
+        ids.append(sid)
+    return ids
+
+
+def run(size: int) -> float:
+    """返回每次请求的平均耗时（微秒）"""
+    manager = SessionManager(timeout_minutes=30)
+    ids = populate(manager, size)
+    start = time.perf_counter()
+    for i in range(REQUESTS):
+        manager.get_or_create(ids[i % size])
+    return (time.perf_counter() - start) / REQUESTS * 1e6
+
+
+def main(argv: list) -> None:
+    sizes = [int(arg) for arg in argv] or DEFAULT_SIZES
+    print(f"{'sessions':>10}  {'us/request':>10}")
+    for size in sizes:
+        print(f"{size:>10}  {run(size):>10.2f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,56 @@
+# benchmarks/bench_session_journal.py
+"""会话持久化单轮成本：增量日志追加（含写入）vs 整体序列化（不含写盘）
+
+用法:
+    python -m benchmarks.bench_session_journal [对话轮数 ...]
+"""
+import sys
+import tempfile
+import time
+
+from app.models.consultation_state import ConsultationState
+from app.services.storage.journal import SessionJournal
+
+DEFAULT_TURNS = [10, 50, 200]
+REPEAT = 2_000
+
+
+def build(turns: int) -> ConsultationState:
+    state = ConsultationState(session_id="bench")
+    state.collected_data["chief_complaint"] = {"symptom": "头痛", "duration": "3天"}
+    for i in range(turns):
+        state.conversation_history.append(f"用户: 第{i}轮，头痛伴随恶心，晚上加重")
+        state.conversation_history.append("助手: 请问还有其他不舒服吗？")
+    return state
+
+
+def run(turns: int) -> tuple:
+    """返回 (日志追加, 整体序列化) 每轮耗时（微秒）"""
+    state = build(turns)
+    with tempfile.TemporaryDirectory() as tmp:
+        journal = SessionJournal(tmp)
+        journal.record("bench", state)
+        start = time.perf_counter()
+        for i in range(REPEAT):
+            state.conversation_history.append(f"用户: 追加第{i}轮")
+            journal.record("bench", state)
+        journal_us = (time.perf_counter() - start) / REPEAT * 1e6
+        journal.close()
+
+    state = build(turns)
+    start = time.perf_counter()
+    for i in range(REPEAT):
+        state.model_dump_json()
+    full_us = (time.perf_counter() - start) / REPEAT * 1e6
+    return journal_us, full_us
+
+
+def main(argv: list) -> None:
+    print(f"{'turns':>6}  {'journal us':>10}  {'full dump us':>12}")
+    for turns in [int(arg) for arg in argv] or DEFAULT_TURNS:
+        journal_us, full_us = run(turns)
+        print(f"{turns:>6}  {journal_us:>10.1f}  {full_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,59 @@
+# benchmarks/bench_session_snapshot.py
+"""会话快照基准：写入耗时、挂载耗时（启动可接流量的时间）与首次访问加载延迟
+
+用法:
+    python -m benchmarks.bench_session_snapshot [会话数]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from app.models.consultation_state import Phase
+from app.services.core.session_manager import SessionManager
+
+TURNS = 20
+
+
+def build(count: int) -> SessionManager:
+    manager = SessionManager()
+    for i in range(count):
+        state = manager.get_or_create(f"session-{i}")
+        state.current_phase = Phase.PRESENT_ILLNESS
+        state.collected_data["chief_complaint"] = {"symptom": "头痛", "duration": "3天"}
+        for turn in range(TURNS):
+            state.conversation_history.append(f"用户: 第{turn}轮，头痛伴随恶心")
+        manager.update(state.session_id, state)
+    return manager
+
+
+def main(argv: list) -> None:
+    count = int(argv[0]) if argv else 50_000
+    manager = build(count)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sessions.snap")
+
+        start = time.perf_counter()
+        manager.save_snapshot(path)
+        save_ms = (time.perf_counter() - start) * 1000
+        size_kb = os.path.getsize(path) / 1024
+
+        restarted = SessionManager()
+        start = time.perf_counter()
+        restarted.restore_snapshot(path)
+        mount_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for i in range(0, count, max(count // 1000, 1)):
+            restarted.get_or_create(f"session-{i}")
+        hydrate_us = (time.perf_counter() - start) / min(count, 1000) * 1e6
+
+    print(f"sessions        : {count:,}")
+    print(f"snapshot size   : {size_kb:,.0f} KB ({size_kb * 1024 / count:.0f} B/session)")
+    print(f"save            : {save_ms:,.1f} ms")
+    print(f"mount (startup) : {mount_ms:.3f} ms")
+    print(f"first access    : {hydrate_us:.1f} us/session")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
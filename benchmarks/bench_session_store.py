@@ -0,0 +1,65 @@
+# benchmarks/bench_session_store.py
+"""会话存储单轮延迟与多进程吞吐基准
+
+单轮 = get_or_create + 追加一轮对话 + update，与 chat 接口的存储访问一致。
+
+用法:
+    python -m benchmarks.bench_session_store [进程数]
+"""
+import multiprocessing
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from app.services.core.session_manager import SessionManager
+from app.services.storage import MemorySessionStore, SQLiteSessionStore
+
+SESSIONS = 200
+TURNS = 10
+
+
+def run_turns(manager: SessionManager, prefix: str) -> list:
+    """模拟多个会话的多轮对话，返回每轮耗时（微秒）"""
+    ids = [manager.get_or_create(f"{prefix}-{i}").session_id for i in range(SESSIONS)]
+    for sid in ids:
+        manager.update(sid, manager.get(sid))
+    timings = []
+    for turn in range(TURNS):
+        for sid in ids:
+            start = time.perf_counter()
+            state = manager.get_or_create(sid)
+            state.conversation_history.append(f"用户: 第{turn}轮描述")
+            manager.update(sid, state)
+            timings.append((time.perf_counter() - start) * 1e6)
+    return timings
+
+
+def _worker(path: str, index: int) -> int:
+    manager = SessionManager(store=SQLiteSessionStore(path))
+    return len(run_turns(manager, f"w{index}"))
+
+
+def report(name: str, timings: list) -> None:
+    timings.sort()
+    p99 = timings[int(len(timings) * 0.99)]
+    print(f"{name:<8} median={statistics.median(timings):8.1f}us  p99={p99:8.1f}us")
+
+
+def main(argv: list) -> None:
+    processes = int(argv[0]) if argv else os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sessions.db")
+        report("memory", run_turns(SessionManager(store=MemorySessionStore()), "m"))
+        report("sqlite", run_turns(SessionManager(store=SQLiteSessionStore(path)), "s"))
+
+        start = time.perf_counter()
+        with multiprocessing.Pool(processes) as pool:
+            turns = sum(pool.starmap(_worker, [(path, i) for i in range(processes)]))
+        elapsed = time.perf_counter() - start
+        print(f"sqlite x{processes} processes: {turns / elapsed:,.0f} turns/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
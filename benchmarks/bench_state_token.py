@@ -0,0 +1,52 @@
+# benchmarks/bench_state_token.py
+"""无状态会话令牌基准：不同对话长度下的令牌大小与编解码延迟
+
+用法:
+    python -m benchmarks.bench_state_token [对话轮数 ...]
+"""
+import sys
+import time
+
+from app.models.consultation_state import ConsultationState, Phase
+from app.services.storage.state_token import StateTokenCodec
+
+DEFAULT_TURNS = [5, 10, 25, 50]
+REPEAT = 1_000
+
+
+def build(turns: int) -> ConsultationState:
+    """构造接近真实问诊的会话（每轮一问一答）"""
+    state = ConsultationState(session_id="550e8400-e29b-41d4-a716-446655440000")
+    state.current_phase = Phase.PAST_HISTORY
+    state.collected_data = {
+        "chief_complaint": {"symptom": "头痛", "duration": "3天", "severity": None},
+        "present_illness": {"notes": "伴有恶心，晚上加重，吃止痛药后稍缓解"},
+    }
+    for i in range(turns):
+        state.conversation_history.append(f"用户: 第{i}天头还是很痛，太阳穴胀痛，有点恶心")
+        state.conversation_history.append("助手: 请问这个症状持续多久了？有没有其他伴随症状？")
+    return state
+
+
+def main(argv: list) -> None:
+    codec = StateTokenCodec("benchmark-secret")
+    print(f"{'turns':>6}  {'json B':>8}  {'token B':>8}  {'encode us':>10}  {'decode us':>10}")
+    for turns in [int(arg) for arg in argv] or DEFAULT_TURNS:
+        state = build(turns)
+        json_size = len(state.model_dump_json().encode("utf-8"))
+
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            token = codec.encode(state)
+        encode_us = (time.perf_counter() - start) / REPEAT * 1e6
+
+        start = time.perf_counter()
+        for _ in range(REPEAT):
+            codec.decode(token)
+        decode_us = (time.perf_counter() - start) / REPEAT * 1e6
+
+        print(f"{turns:>6}  {json_size:>8}  {len(token):>8}  {encode_us:>10.1f}  {decode_us:>10.1f}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -1,7 +1,10 @@
 # tests/api/test_consultation.py
 import pytest
 from fastapi.testclient import TestClient
+from app.api import consultation
 from app.main import app
+from app.services.llm import CircuitBreaker, LLMExtractionClient
+from tests.fakes.openai_server import FakeOpenAIServer
 
 
 client = TestClient(app)
@@ -79,3 +82,141 @@ def test_input_sanitization():
     )
     assert response.status_code == 200
     # 敏感信息应该被脱敏
+
+
+def test_oversized_input_rejected():
+    """测试超长输入返回 413"""
+    response = client.post(
+        "/api/v1/consultation/chat",
+        json={"user_input": "头痛" * 20000}
+    )
+    assert response.status_code == 413
+
+
+def test_analysis_overload_returns_503(monkeypatch):
+    """测试长输入分析排队已满时返回 503"""
+    monkeypatch.setattr(consultation.analysis_executor, "inline_chars", 0)
+    monkeypatch.setattr(consultation.analysis_executor, "max_queue", 0)
+    response = client.post(
+        "/api/v1/consultation/chat",
+        json={"user_input": "我头痛"}
+    )
+    assert response.status_code == 503
+
+
+def test_completed_record_structured_by_llm(monkeypatch):
+    """测试启用大模型且同步整理时问诊完成后返回结构化病历"""
+    monkeypatch.setattr(consultation.settings, "llm_background_refinement", False)
+    def reply(payload):
+        return {"chief_complaint": {"symptom": "头痛", "duration": "3天"},
+                "past_history": {"chronic_diseases": ["高血压"]}}
+
+    with FakeOpenAIServer(reply) as server:
+        llm = LLMExtractionClient(server.base_url, "test-key", "fake-model")
+        monkeypatch.setattr(consultation.record_refiner.extractor, "client", llm)
+        session_id = None
+        for text in ["你好", "我头痛", "3天了", "有高血压"]:
+            data = client.post(
+                "/api/v1/consultation/chat",
+                json={"session_id": session_id, "user_input": text}
+            ).json()
+            session_id = data["session_id"]
+        assert len(server.requests) == 1
+
+    assert data["is_complete"] is True
+    assert data["medical_record"]["chief_complaint"]["symptom"] == "头痛"
+    assert data["medical_record"]["past_history"]["chronic_diseases"] == ["高血压"]
+
+
+def test_completed_record_degrades_when_llm_slow(monkeypatch):
+    """测试大模型超出请求截止时间时降级为关键词提取并标记 degraded"""
+    monkeypatch.setattr(consultation.settings, "request_deadline_seconds", 0.2)
+    monkeypatch.setattr(consultation.settings, "llm_background_refinement", False)
+    monkeypatch.setattr(consultation.record_refiner.extractor, "breaker", CircuitBreaker())
+    with FakeOpenAIServer(latency=2.0) as server:
+        llm = LLMExtractionClient(server.base_url, "test-key", "fake-model")
+        monkeypatch.setattr(consultation.record_refiner.extractor, "client", llm)
+        session_id = None
+        for text in ["你好", "我胃痛", "两天了", "没有病史"]:
+            data = client.post(
+                "/api/v1/consultation/chat",
+                json={"session_id": session_id, "user_input": text}
+            ).json()
+            session_id = data["session_id"]
+
+    assert data["is_complete"] is True
+    assert data["degraded"] is True
+    assert "past_history" in data["medical_record"]
+
+
+def test_completed_record_refined_in_background(monkeypatch):
+    """测试问诊完成时立即返回关键词结果，精修在后台写回后可查询"""
+    def reply(payload):
+        return {"chief_complaint": {"symptom": "偏头痛", "duration": "5天"},
+                "past_history": {"chronic_diseases": ["糖尿病"]}}
+
+    monkeypatch.setattr(consultation.record_refiner.extractor, "breaker", CircuitBreaker())
+    with FakeOpenAIServer(reply, latency=0.3) as server, TestClient(app) as session_client:
+        llm = LLMExtractionClient(server.base_url, "test-key", "fake-model")
+        monkeypatch.setattr(consultation.record_refiner.extractor, "client", llm)
+        session_id = None
+        for text in ["你好", "我头痛", "已经5天了", "有糖尿病"]:
+            response = session_client.post(
+                "/api/v1/consultation/chat",
+                json={"session_id": session_id, "user_input": text}
+            )
+            session_id = response.json()["session_id"]
+        data = response.json()
+        assert response.elapsed.total_seconds() < 0.3
+        assert data["is_complete"] is True
+        assert data["medical_record"]["chief_complaint"]["symptom"] == "头痛"
+
+        record = session_client.get(f"/api/v1/consultation/medical-record/{session_id}").json()
+        assert record["chief_complaint"]["symptom"] == "偏头痛"
+        assert record["past_history"]["chronic_diseases"] == ["糖尿病"]
+        assert len(server.requests) == 1
+        stats = session_client.get("/health/extraction").json()["refinement"]
+        assert stats["conflicts"]["chief_complaint"] >= 1
+
+
+def test_stateless_mode_roundtrip():
+    """测试无状态模式通过令牌续接会话"""
+    response1 = client.post(
+        "/api/v1/consultation/chat",
+        json={"user_input": "你好", "stateless": True}
+    )
+    data1 = response1.json()
+    assert data1["state_token"]
+
+    response2 = client.post(
+        "/api/v1/consultation/chat",
+        json={"user_input": "我头痛三天了", "state_token": data1["state_token"]}
+    )
+    data2 = response2.json()
+    assert data2["session_id"] == data1["session_id"]
+    assert "chief_complaint" in data2["collected_fields"]
+    assert data2["state_token"] != data1["state_token"]
+
+
+def test_stateless_mode_rejects_invalid_token():
+    """测试无效状态令牌返回 400"""
+    response = client.post(
+        "/api/v1/consultation/chat",
+        json={"user_input": "我头痛", "state_token": "invalid.token"}
+    )
+    assert response.status_code == 400
+
+
+def test_stream_emergency_alert():
+    """测试流式接口在预警词完成时立即推送"""
+    with client.websocket_connect("/api/v1/consultation/stream") as ws:
+        ws.send_text("我喘不")
+        ws.send_text("上气")
+        alert = ws.receive_json()
+        assert alert["level"] == "red"
+        assert alert["offset"] == 5
+
+        ws.send_text("")
+        final = ws.receive_json()
+        assert final["final"] is True
+        assert final["level"] == "red"
@@ -0,0 +1,24 @@
+# tests/api/test_health.py
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+def test_health_check():
+    """测试健康检查"""
+    client = TestClient(app)
+    response = client.get("/health/")
+    assert response.status_code == 200
+    assert response.json()["status"] == "healthy"
+
+
+def test_session_metrics_with_lifespan():
+    """测试 lifespan 启动后台清理任务并暴露指标"""
+    with TestClient(app) as client:
+        response = client.get("/health/sessions")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["running"] is True
+        assert "evicted_total" in data
+        assert "last_duration_ms" in data
+        assert "bytes" in data["store"]
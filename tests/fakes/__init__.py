@@ -0,0 +1,2 @@
+# tests/fakes/__init__.py
+"""测试与基准使用的本地替身服务"""
@@ -0,0 +1,115 @@
+# tests/fakes/openai_server.py
+"""本地 OpenAI 兼容接口替身
+
+在后台线程中运行 ThreadingHTTPServer，实现 POST /v1/chat/completions，
+可配置响应内容、固定延迟、错误状态码与故障模式（断开连接 / 返回非 JSON 内容），
+并记录请求与最大并发数，
+供测试与延迟基准使用，无需网络和真实密钥。
+"""
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional
+
+
+def echo_fields(payload: Dict) -> Dict:
+    """默认响应：按请求的 JSON Schema 为每个字段返回空对象"""
+    schema = payload["response_format"]["json_schema"]["schema"]
+    return {name: {} for name in schema["properties"]}
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        server: FakeOpenAIServer = self.server.owner
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        payload = json.loads(body)
+        with server.lock:
+            server.requests.append(payload)
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        try:
+            time.sleep(server.latency)
+            if server.fault == "reset":
+                self.close_connection = True
+                self.connection.shutdown(socket.SHUT_RDWR)
+                return
+            if self.path.rstrip("/") != "/v1/chat/completions" or server.status != 200:
+                self._send(server.status if server.status != 200 else 404, {"error": "fake"})
+                return
+            content = json.dumps(server.reply(payload), ensure_ascii=False)
+            if server.fault == "garbage":
+                content = "抱歉，我无法以 JSON 格式回答。"
+            self._send(200, {
+                "id": f"chatcmpl-{len(server.requests)}",
+                "object": "chat.completion",
+                "model": payload.get("model"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+            })
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def _send(self, status: int, body: Dict) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeOpenAIServer:
+    """OpenAI 兼容接口替身（用作上下文管理器）"""
+
+    def __init__(
+        self,
+        reply: Optional[Callable[[Dict], Dict]] = None,
+        latency: float = 0.0,
+    ):
+        """
+        Args:
+            reply: 由请求体生成响应 JSON 对象的函数，默认 echo_fields
+            latency: 每个请求的固定延迟（秒）
+        """
+        self.reply = reply or echo_fields
+        self.latency = latency
+        self.status = 200
+        # 故障模式：None 正常；"reset" 不响应直接断开连接；"garbage" 返回无法解析的内容
+        self.fault: Optional[str] = None
+        self.requests: List[Dict] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self._httpd = _Server(("127.0.0.1", 0), _Handler)
+        self._httpd.owner = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}/v1"
+
+    def __enter__(self) -> "FakeOpenAIServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
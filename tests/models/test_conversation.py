@@ -0,0 +1,74 @@
+# tests/models/test_conversation.py
+from app.models.consultation_state import ConsultationState
+from app.models.conversation import ConversationHistory, Role, Turn
+
+
+def test_history_enforces_max_length():
+    """测试超过上限后只保留最近的轮次"""
+    history = ConversationHistory(maxlen=3)
+    for i in range(10):
+        history.add(Role.USER, f"第{i}轮")
+    assert len(history) == 3
+    assert history.appended == 10
+    assert history[0] == "用户: 第7轮"
+
+
+def test_history_nbytes_stays_flat():
+    """测试字节数在达到上限后不再增长"""
+    history = ConversationHistory(maxlen=4)
+    for _ in range(4):
+        history.add(Role.USER, "头痛")
+    full = history.nbytes
+    for _ in range(100):
+        history.add(Role.USER, "头痛")
+    assert history.nbytes == full
+
+
+def test_last_user_turn():
+    """测试直接读取最近一次用户发言"""
+    history = ConversationHistory()
+    assert history.last_user_turn is None
+    history.add(Role.USER, "我头痛")
+    history.add(Role.ASSISTANT, "持续多久了？")
+    assert history.last_user_turn == "我头痛"
+
+
+def test_legacy_prefixed_strings():
+    """测试兼容旧版带前缀的字符串"""
+    history = ConversationHistory(["用户: 我头痛", "助手: 好的", "三天了"])
+    assert history.records()[0] == Turn(Role.USER, "我头痛")
+    assert history.records()[2] == Turn(Role.UNKNOWN, "三天了")
+    assert list(history) == ["用户: 我头痛", "助手: 好的", "三天了"]
+
+
+def test_state_serializes_compact_records():
+    """测试会话状态以 [role, text] 记录序列化并可还原"""
+    state = ConsultationState(session_id="s1")
+    state.conversation_history.add(Role.USER, "我头痛")
+    dumped = state.model_dump(mode="json")
+    assert dumped["conversation_history"] == {"appended": 1, "turns": [["user", "我头痛"]]}
+
+    restored = ConsultationState.model_validate_json(state.model_dump_json())
+    assert restored == state
+    assert restored.conversation_history.last_user_turn == "我头痛"
+
+
+def test_appended_survives_round_trip_beyond_maxlen():
+    """测试超过 maxlen 的对话记录重新加载后累计追加轮数不变"""
+    state = ConsultationState(session_id="s1")
+    state.conversation_history = ConversationHistory(maxlen=5)
+    for i in range(12):
+        state.conversation_history.add(Role.USER, f"第{i}轮")
+
+    restored = ConsultationState.model_validate_json(state.model_dump_json())
+    assert restored.conversation_history.appended == 12
+    assert len(restored.conversation_history) == 5
+
+
+def test_legacy_list_form_still_accepted():
+    """测试旧版只含对话列表的序列化形式仍可加载"""
+    state = ConsultationState.model_validate(
+        {"session_id": "s1", "conversation_history": [["user", "我头痛"], ["assistant", "好的"]]}
+    )
+    assert state.conversation_history.appended == 2
+    assert state.conversation_history.last_user_turn == "我头痛"
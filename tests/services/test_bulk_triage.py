@@ -0,0 +1,58 @@
+# tests/services/test_bulk_triage.py
+import io
+import json
+from app.cli.retriage import main
+from app.services.detection.bulk_triage import bulk_triage
+
+CORPUS = [
+    {"id": "a", "text": "我头痛三天了"},
+    {"id": "b", "text": "突然喘不上气", "level": "red"},
+    {"session_id": "c", "emergency_flag": False,
+     "conversation_history": [["user", "发烧了"], ["assistant", "是高烧吗？"], ["user", "高烧39度"]]},
+    {"session_id": "d", "conversation_history": ["用户: 胸闷", "助手: 好的"]},
+]
+
+
+def _lines():
+    return [json.dumps(record, ensure_ascii=False) + "\n" for record in CORPUS] + ["not json\n"]
+
+
+def test_bulk_triage_levels_and_report():
+    """测试逐条结果、漏判统计与坏行计数"""
+    output = io.StringIO()
+    report = bulk_triage(_lines(), output, workers=1, chunk_size=2)
+
+    rows = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert rows == [
+        {"id": "a", "level": "green", "missed": False},
+        {"id": "b", "level": "red", "missed": False},
+        {"id": "c", "level": "yellow", "missed": True},
+        {"id": "d", "level": "red", "missed": True},
+    ]
+    assert report.records == 4
+    assert report.errors == 1
+    assert report.missed_escalations == 2
+    assert report.levels == {"red": 2, "yellow": 1, "green": 1}
+
+
+def test_process_pool_matches_single_process():
+    """测试多进程分片结果与单进程一致且保持输入顺序"""
+    lines = _lines() * 50
+    single, pooled = io.StringIO(), io.StringIO()
+    expected = bulk_triage(lines, single, workers=1, chunk_size=7)
+    report = bulk_triage(lines, pooled, workers=2, chunk_size=7)
+    assert pooled.getvalue() == single.getvalue()
+    assert report.levels == expected.levels
+
+
+def test_cli_writes_output_and_report(tmp_path):
+    """测试命令行工具"""
+    source = tmp_path / "corpus.jsonl"
+    source.write_text("".join(_lines()), encoding="utf-8")
+    output, report_path = tmp_path / "levels.jsonl", tmp_path / "report.json"
+
+    assert main([str(source), "-o", str(output), "--report", str(report_path), "--workers", "1"]) == 0
+    assert len(output.read_text(encoding="utf-8").splitlines()) == 4
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    assert report["missed_escalations"] == 2
+    assert report["lexicon_version"]
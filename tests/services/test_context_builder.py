@@ -0,0 +1,52 @@
+# tests/services/test_context_builder.py
+from app.models.consultation_state import ConsultationState
+from app.models.conversation import Role
+from app.services.llm import ContextBuilder, estimate_tokens
+
+
+def _state(turns=40):
+    state = ConsultationState(session_id="s1")
+    for i in range(turns):
+        state.conversation_history.add(Role.USER, f"第{i}轮：我头痛，晚上睡不好，已经持续了一段时间")
+        state.conversation_history.add(Role.ASSISTANT, "好的，请问还有其他症状吗？")
+    state.collected_data["chief_complaint"] = {"symptom": "头痛"}
+    return state
+
+
+def test_estimate_tokens_counts_cjk_per_char():
+    """测试中文按字、其他字符按 4 字符估算"""
+    assert estimate_tokens("头痛三天") == 4
+    assert estimate_tokens("headache") == 2
+    assert estimate_tokens("") == 0
+
+
+def test_context_stays_within_budget_with_summary_and_recent_turns():
+    """测试上下文不超预算，包含摘要与最近轮次"""
+    state = _state()
+    builder = ContextBuilder(budget_tokens=200)
+    context = builder.build(state)
+
+    assert context.tokens <= 200
+    assert "chief_complaint" in context.text
+    assert context.text.endswith(state.conversation_history[-1])
+    assert 0 < context.turns_included < context.turns_total
+    assert context.tokens_saved == context.full_tokens - context.tokens > 0
+
+
+def test_summary_reused_until_collected_data_changes():
+    """测试摘要在 collected_data 不变时复用，新轮次增量计数"""
+    state = _state(turns=3)
+    builder = ContextBuilder(budget_tokens=10_000)
+    first = builder.build(state)
+    state.conversation_history.add(Role.USER, "还有点恶心")
+    second = builder.build(state)
+    assert builder.stats()["summary_reused"] == 1
+    assert second.turns_included == first.turns_included + 1
+    assert second.full_tokens == sum(estimate_tokens(t) for t in state.conversation_history)
+
+    state.collected_data["past_history"] = {"notes": "高血压"}
+    assert "高血压" in builder.build(state).text
+    assert builder.stats()["summary_reused"] == 1
+
+    builder.forget("s1")
+    assert builder.stats()["cached_sessions"] == 0
@@ -0,0 +1,55 @@
+# tests/services/test_deidentify.py
+import io
+import json
+from app.cli.deidentify import main
+from app.services.support.deidentify import deidentify_file
+from app.services.support.input_sanitization import InputSanitizationService
+
+
+def _archive(tmp_path, count=200):
+    lines = [
+        json.dumps({"id": i, "text": f"王{'一二三四五'[i % 5]}先生，电话1390000{i:04d}，邮箱u{i}@example.com，头痛"},
+                   ensure_ascii=False)
+        for i in range(count)
+    ]
+    path = tmp_path / "archive.jsonl"
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return path
+
+
+def test_small_chunks_match_whole_file_redaction(tmp_path):
+    """测试小块切分时跨块边界的敏感信息同样被脱敏，结果与整体脱敏一致"""
+    path = _archive(tmp_path)
+    text = path.read_text(encoding="utf-8")
+    expected, _ = InputSanitizationService().redact_pii(text)
+
+    output = io.BytesIO()
+    report = deidentify_file(str(path), output, workers=1, chunk_bytes=37)
+    assert output.getvalue().decode("utf-8") == expected
+    assert report.chunks > 100
+    assert report.counts == {"name": 200, "id_card": 0, "phone": 200, "email": 200}
+    assert report.bytes_in == len(text.encode("utf-8"))
+
+
+def test_process_pool_matches_single_process(tmp_path):
+    """测试多进程结果与单进程一致且保持顺序"""
+    path = _archive(tmp_path)
+    single, pooled = io.BytesIO(), io.BytesIO()
+    expected = deidentify_file(str(path), single, workers=1, chunk_bytes=1024)
+    report = deidentify_file(str(path), pooled, workers=2, chunk_bytes=1024)
+    assert pooled.getvalue() == single.getvalue()
+    assert report.counts == expected.counts
+
+
+def test_cli_writes_output_and_report(tmp_path):
+    """测试命令行工具与空文件"""
+    path = _archive(tmp_path, count=3)
+    output, report_path = tmp_path / "out.jsonl", tmp_path / "report.json"
+
+    assert main([str(path), "-o", str(output), "--report", str(report_path), "--workers", "1"]) == 0
+    assert "1390000" not in output.read_text(encoding="utf-8")
+    assert json.loads(report_path.read_text(encoding="utf-8"))["counts"]["phone"] == 3
+
+    empty = tmp_path / "empty.txt"
+    empty.write_bytes(b"")
+    assert deidentify_file(str(empty), io.BytesIO()).chunks == 0
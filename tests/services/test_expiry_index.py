@@ -0,0 +1,63 @@
+# tests/services/test_expiry_index.py
+import pytest
+from app.services.core.expiry_index import ExpiryIndex
+
+
+def test_pop_expired_returns_only_old_entries():
+    """测试只弹出早于截止时间的会话"""
+    index = ExpiryIndex()
+    index.touch("a", 10.0)
+    index.touch("b", 20.0)
+    index.touch("c", 30.0)
+
+    assert index.pop_expired(25.0) == ["a", "b"]
+    assert len(index) == 1
+    assert "c" in index
+
+
+def test_touch_refresh_skips_stale_entry():
+    """测试刷新后的会话不会因旧条目被误删"""
+    index = ExpiryIndex()
+    index.touch("a", 10.0)
+    index.touch("a", 50.0)
+
+    assert index.pop_expired(25.0) == []
+    assert index.pop_expired(60.0) == ["a"]
+
+
+def test_discard_removes_session():
+    """测试移除会话后不再返回"""
+    index = ExpiryIndex()
+    index.touch("a", 10.0)
+    index.discard("a")
+
+    assert index.pop_expired(100.0) == []
+    assert len(index) == 0
+
+
+def test_pop_expired_respects_limit():
+    """测试单次弹出数量上限"""
+    index = ExpiryIndex()
+    for i in range(10):
+        index.touch(f"s{i}", float(i))
+
+    assert len(index.pop_expired(100.0, limit=3)) == 3
+    assert len(index) == 7
+
+
+def test_current_callback_reschedules_refreshed_session():
+    """测试绕过索引刷新的时间戳会被重新入堆"""
+    index = ExpiryIndex()
+    index.touch("a", 10.0)
+
+    assert index.pop_expired(25.0, current=lambda sid: 40.0) == []
+    assert index.pop_expired(50.0, current=lambda sid: 40.0) == ["a"]
+
+
+def test_heap_compaction_bounds_memory():
+    """测试频繁刷新不会让堆无限增长"""
+    index = ExpiryIndex()
+    for i in range(10_000):
+        index.touch("hot", float(i))
+
+    assert len(index._heap) < 200
@@ -0,0 +1,92 @@
+# tests/services/test_extraction_cache.py
+import asyncio
+import json
+
+from app.services.analysis.extraction_cache import (
+    CachedExtractionService,
+    ExtractionCache,
+    normalize_text,
+)
+from app.services.lexicon import LexiconRegistry
+from app.services.lexicon.registry import BUNDLED_PATH
+from app.services.llm import LLMExtractionClient, RecordExtractor
+from tests.fakes.openai_server import FakeOpenAIServer
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_normalize_text_folds_width_and_whitespace():
+    """测试全角字符与空白差异规范化后一致"""
+    assert normalize_text("  我头痛３天\n\t了 ") == normalize_text("我头痛3天 了")
+    key = ExtractionCache.key
+    assert key("我头痛３天了", "chief_complaint") == key(" 我头痛3天了", "chief_complaint")
+    assert key("我头痛3天了", "chief_complaint") != key("我头痛3天了", "past_history")
+
+
+def test_lru_eviction_ttl_and_counters():
+    """测试容量淘汰、过期与命中统计"""
+    clock = FakeClock()
+    cache = ExtractionCache(max_entries=2, ttl_seconds=10, clock=clock)
+    cache.put("a", {"v": 1})
+    cache.put("b", {"v": 2})
+    assert cache.get("a") == {"v": 1}
+    cache.put("c", {"v": 3})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+
+    clock.now = 10
+    assert cache.get("c") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (2, 2, 1, 1)
+
+
+def test_cached_results_are_copies():
+    """测试修改返回值不影响缓存"""
+    service = CachedExtractionService(ExtractionCache())
+    first = service.extract_batch("我头痛3天了，有高血压")
+    first["past_history"]["chronic_diseases"].append("糖尿病")
+    second = service.extract_batch("我头痛3天了，有高血压")
+    assert second["past_history"]["chronic_diseases"] == ["高血压"]
+    assert service.cache.stats()["hits"] == 3
+
+
+def test_llm_called_only_for_uncached_fields():
+    """测试大模型只为未命中的字段发起调用"""
+    async def run(server):
+        client = LLMExtractionClient(server.base_url, "test-key", "fake-model")
+        extractor = RecordExtractor(client, cache=ExtractionCache())
+        try:
+            await extractor.extract("我头痛3天了", ["chief_complaint"])
+            await extractor.extract("我头痛３天了 ", ["chief_complaint"])
+            await extractor.extract("我头痛3天了")
+        finally:
+            await client.aclose()
+
+    with FakeOpenAIServer() as server:
+        asyncio.run(run(server))
+        requested = [
+            list(r["response_format"]["json_schema"]["schema"]["properties"]) for r in server.requests
+        ]
+    assert requested == [["chief_complaint"], ["present_illness", "past_history"]]
+
+
+def test_cache_invalidated_when_lexicons_change_without_version_bump(tmp_path):
+    """测试词表内容变化但版本号未变时，缓存不返回旧词表的结果"""
+    with open(BUNDLED_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    path = tmp_path / "lexicons.json"
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    registry = LexiconRegistry(str(path))
+    service = CachedExtractionService(ExtractionCache(), registry)
+    assert service.extract("有哮喘", "past_history")["chronic_diseases"] == []
+
+    data["extraction"]["chronic_diseases"].append("哮喘")
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+    registry.reload()
+    assert service.extract("有哮喘", "past_history")["chronic_diseases"] == ["哮喘"]
@@ -1,4 +1,6 @@
 # tests/services/test_input_sanitization.py
+import time
+
 import pytest
 from app.services.support.input_sanitization import InputSanitizationService
 
@@ -54,3 +56,59 @@ def test_no_sensitive_info():
     text, detected = service.sanitize("我头痛三天")
     assert text == "我头痛三天"
     assert len(detected) == 0
+
+
+def test_redact_pii_returns_spans():
+    """测试单次扫描返回替换结果与原文位置"""
+    service = InputSanitizationService()
+    text = "王五女士的电话13912345678"
+    cleaned, spans = service.redact_pii(text)
+    assert cleaned == "[name_已脱敏]的电话[phone_已脱敏]"
+    assert [(s.kind, text[s.start:s.end]) for s in spans] == [
+        ("name", "王五女士"), ("phone", "13912345678")
+    ]
+    assert service.find_pii(text) == spans
+
+
+def test_overlapping_pii_prefers_leftmost_match():
+    """测试重叠时取最靠左的匹配（整个邮箱地址而非其中的手机号）"""
+    service = InputSanitizationService()
+    cleaned, detected = service.sanitize("邮箱 zhang13812345678@qq.com")
+    assert cleaned == "邮箱 [email_已脱敏]"
+    assert detected == {"email": ["zhang13812345678@qq.com"]}
+
+
+def test_overlong_email_local_part_fully_redacted():
+    """测试本地部分超过 64 个字符的邮箱整体脱敏，前半段不会残留"""
+    service = InputSanitizationService(chunk_size=512)
+    local = "patient_" + "x" * 700
+    cleaned, detected = service.sanitize(f"邮箱 {local}@example.com 谢谢")
+    assert cleaned == "邮箱 [email_已脱敏] 谢谢"
+    assert detected == {"email": [f"{local}@example.com"]}
+
+
+def test_validate_input_ignores_case():
+    """测试注入检测不区分大小写"""
+    service = InputSanitizationService()
+    assert service.validate_input("<SCRIPT>alert(1)</SCRIPT>") is False
+    assert service.validate_input("JavaScript:void(0)") is False
+
+
+def test_chunked_scan_matches_whole_text_scan():
+    """测试分块扫描与整段扫描结果一致（含跨块边界的敏感信息）"""
+    text = "".join(f"第{i}条记录，电话1390000{i:04d}，邮箱user{i}@example.com；" for i in range(300))
+    chunked = InputSanitizationService(chunk_size=512)
+    whole = InputSanitizationService(chunk_size=len(text))
+    assert chunked.sanitize(text) == whole.sanitize(text)
+    assert chunked.find_pii(text) == whole.find_pii(text)
+    assert chunked.validate_input("检查报告" * 500 + "<script>") is False
+
+
+def test_adversarial_input_scans_in_linear_time():
+    """测试回溯型恶意输入的耗时不会随长度平方增长"""
+    service = InputSanitizationService()
+    start = time.perf_counter()
+    for text in ("a" * 100_000, "print" * 20_000):
+        service.sanitize(text)
+        service.validate_input(text)
+    assert time.perf_counter() - start < 5
@@ -0,0 +1,45 @@
+# tests/services/test_keyword_matcher.py
+import random
+
+from app.services.lexicon import KeywordMatcher
+
+
+def test_finds_all_hits_with_positions():
+    """测试一次扫描找到全部命中（含重叠）及位置"""
+    matcher = KeywordMatcher(["担心", "很担心", "心慌"])
+    hits = [(m.start, m.end, m.keyword) for m in matcher.finditer("我很担心慌")]
+    assert hits == [(1, 4, "很担心"), (2, 4, "担心"), (3, 5, "心慌")]
+
+
+def test_matched_follows_lexicon_order():
+    """测试 matched 去重并按词表顺序返回"""
+    matcher = KeywordMatcher(["胸痛", "头痛", "发热"])
+    assert matcher.matched("头痛，发热，又头痛，胸痛") == ["胸痛", "头痛", "发热"]
+    assert matcher.matched("没有不舒服") == []
+
+
+def test_from_groups_labels():
+    """测试分组词表返回命中的标签，同一关键词可属于多个分组"""
+    matcher = KeywordMatcher.from_groups({"red": ["胸痛"], "yellow": ["高热", "胸痛"]})
+    assert matcher.labels("高热不退") == {"yellow"}
+    assert matcher.labels("胸痛") == {"red", "yellow"}
+    assert matcher.contains_any("一切正常") is False
+
+
+def test_equivalent_to_substring_checks():
+    """测试与逐词 in 判断结果一致"""
+    rng = random.Random(7)
+    alphabet = "头痛胸闷心慌发热咳"
+    keywords = list({"".join(rng.choices(alphabet, k=rng.randint(1, 4))) for _ in range(200)})
+    matcher = KeywordMatcher(keywords)
+    for _ in range(200):
+        text = "".join(rng.choices(alphabet, k=rng.randint(0, 30)))
+        assert matcher.matched(text) == [k for k in keywords if k in text]
+
+
+def test_stream_matches_across_chunks():
+    """测试流式扫描跨分片命中，位置相对于整个流"""
+    stream = KeywordMatcher(["呼吸困难"]).stream()
+    assert stream.feed("有点呼吸") == []
+    hits = stream.feed("困难")
+    assert [(m.start, m.end, m.keyword) for m in hits] == [(2, 6, "呼吸困难")]
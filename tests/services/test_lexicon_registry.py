@@ -0,0 +1,115 @@
+# tests/services/test_lexicon_registry.py
+import asyncio
+import json
+import os
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from app.services.detection.emergency_detection import EmergencyDetectionService, EmergencyLevel
+from app.services.lexicon import LexiconRegistry, LexiconWatcher
+from app.services.lexicon.registry import BUNDLED_PATH
+
+
+def _write_lexicons(path, version, extra_red=()):
+    """基于内置词表写入一个新版本"""
+    with open(BUNDLED_PATH, encoding="utf-8") as f:
+        data = json.load(f)
+    data["version"] = version
+    data["emergency"]["red"] += list(extra_red)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    # 保证修改时间变化
+    stat = os.stat(path)
+    os.utime(path, (stat.st_atime, stat.st_mtime + 1))
+
+
+def test_bundled_lexicons_load():
+    """测试内置词表可加载并编译"""
+    registry = LexiconRegistry()
+    assert registry.current.version
+    assert "胸痛" in registry.current["emergency"]["red"]
+    assert registry.current.matcher("emergency").labels("胸痛") == {"red"}
+
+
+def test_reload_swaps_lexicons(tmp_path):
+    """测试词表文件更新后重新加载，服务立即使用新词表"""
+    path = tmp_path / "lexicons.json"
+    _write_lexicons(path, "v1")
+    registry = LexiconRegistry(str(path))
+    service = EmergencyDetectionService(registry)
+    assert service.detect("心脏骤停").level == EmergencyLevel.GREEN
+
+    assert registry.reload_if_changed() is False
+    _write_lexicons(path, "v2", extra_red=["心脏骤停"])
+    assert registry.reload_if_changed() is True
+    assert registry.current.version == "v2"
+    assert service.detect("心脏骤停").level == EmergencyLevel.RED
+
+
+def test_invalid_file_keeps_current(tmp_path):
+    """测试无效词表文件不会替换当前版本"""
+    path = tmp_path / "lexicons.json"
+    _write_lexicons(path, "v1")
+    registry = LexiconRegistry(str(path))
+    path.write_text('{"version": "broken"}', encoding="utf-8")
+
+    with pytest.raises(ValueError):
+        registry.reload()
+    assert registry.current.version == "v1"
+
+
+def test_compiled_cache_reused(tmp_path):
+    """测试冷启动直接读取磁盘上的编译结果"""
+    path = tmp_path / "lexicons.json"
+    cache_dir = tmp_path / "cache"
+    _write_lexicons(path, "v1")
+    LexiconRegistry(str(path), str(cache_dir))
+    assert len(os.listdir(cache_dir)) == 1
+
+    registry = LexiconRegistry(str(path), str(cache_dir))
+    assert registry.metrics()["cache_hits"] == 1
+    assert registry.current.matcher("emergency").labels("胸痛") == {"red"}
+
+
+def test_corrupt_cache_rebuilt_and_write_failure_ignored(tmp_path):
+    """测试缓存文件损坏或内容不符时重新编译，缓存写入失败不影响加载"""
+    path = tmp_path / "lexicons.json"
+    cache_dir = tmp_path / "cache"
+    _write_lexicons(path, "v1")
+    LexiconRegistry(str(path), str(cache_dir))
+    (cache_file,) = cache_dir.iterdir()
+
+    for content in (pickle.dumps({"not": "lexicons"}), cache_file.read_bytes()[:20]):
+        cache_file.write_bytes(content)
+        registry = LexiconRegistry(str(path), str(cache_dir))
+        assert registry.metrics()["cache_hits"] == 0
+        assert registry.current.version == "v1"
+    assert [p.name for p in cache_dir.iterdir()] == [cache_file.name]
+
+    blocked = tmp_path / "blocked"
+    blocked.write_text("not a directory")
+    registry = LexiconRegistry(str(path), str(blocked))
+    assert registry.current.version == "v1"
+
+
+def test_concurrent_cold_starts_share_cache_dir(tmp_path):
+    """测试多个 worker 同时冷启动写同一缓存目录不会失败"""
+    path = tmp_path / "lexicons.json"
+    cache_dir = tmp_path / "cache"
+    _write_lexicons(path, "v1")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        registries = list(pool.map(lambda _: LexiconRegistry(str(path), str(cache_dir)), range(16)))
+    assert {r.current.version for r in registries} == {"v1"}
+    assert len(os.listdir(cache_dir)) == 1
+
+
+def test_watcher_check_once(tmp_path):
+    """测试后台任务在线程中完成重新加载"""
+    path = tmp_path / "lexicons.json"
+    _write_lexicons(path, "v1")
+    registry = LexiconRegistry(str(path))
+    watcher = LexiconWatcher(registry, interval_seconds=60)
+    _write_lexicons(path, "v2")
+
+    assert asyncio.run(watcher.check_once()) is True
+    assert registry.current.version == "v2"
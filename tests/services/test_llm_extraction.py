@@ -0,0 +1,131 @@
+# tests/services/test_llm_extraction.py
+import asyncio
+
+import pytest
+from app.models.consultation_state import ConsultationState
+from app.models.conversation import Role
+from app.services.llm import LLMExtractionClient, LLMExtractionError, MicroBatcher, RecordExtractor
+from tests.fakes.openai_server import FakeOpenAIServer
+
+
+def _client(server, **kwargs):
+    return LLMExtractionClient(server.base_url, "test-key", "fake-model", **kwargs)
+
+
+def test_all_fields_extracted_in_one_call():
+    """测试全部字段在一次请求中提取，缺失属性补为空值"""
+    def reply(payload):
+        return {"chief_complaint": {"symptom": "头痛", "duration": "3天"},
+                "past_history": {"chronic_diseases": ["高血压"], "unknown": 1}}
+
+    async def run(server):
+        client = _client(server)
+        try:
+            return await client.extract("患者: 我头痛3天了，有高血压")
+        finally:
+            await client.aclose()
+
+    with FakeOpenAIServer(reply) as server:
+        result = asyncio.run(run(server))
+        assert len(server.requests) == 1
+        schema = server.requests[0]["response_format"]["json_schema"]["schema"]
+        assert list(schema["properties"]) == ["chief_complaint", "present_illness", "past_history"]
+
+    assert result["chief_complaint"] == {"symptom": "头痛", "duration": "3天", "severity": None}
+    assert result["present_illness"] == {"onset_time": None, "progression": None, "associated_symptoms": []}
+    assert result["past_history"]["chronic_diseases"] == ["高血压"]
+    assert "unknown" not in result["past_history"]
+
+
+def test_concurrency_bounded_by_semaphore():
+    """测试并发请求数不超过上限"""
+    async def run(server):
+        client = _client(server, max_concurrency=3)
+        try:
+            await asyncio.gather(*(client.extract(f"对话{i}", ["chief_complaint"]) for i in range(12)))
+            return client.stats()
+        finally:
+            await client.aclose()
+
+    with FakeOpenAIServer(latency=0.05) as server:
+        stats = asyncio.run(run(server))
+        assert len(server.requests) == 12
+        assert server.max_in_flight <= 3
+    assert stats["requests"] == 12
+    assert stats["in_flight"] == 0
+
+
+def test_server_error_raises():
+    """测试接口错误转换为 LLMExtractionError"""
+    async def run(server):
+        client = _client(server)
+        try:
+            await client.extract("对话")
+        finally:
+            await client.aclose()
+
+    with FakeOpenAIServer() as server:
+        server.status = 500
+        with pytest.raises(LLMExtractionError):
+            asyncio.run(run(server))
+
+
+def test_record_extractor_falls_back_to_keywords():
+    """测试未配置大模型时使用关键词提取，且不覆盖病历"""
+    extractor = RecordExtractor()
+    result = asyncio.run(extractor.extract("我头痛3天了", ["chief_complaint"]))
+    assert result == {"chief_complaint": {"symptom": "头痛", "duration": "3天", "severity": None}}
+
+    state = ConsultationState(session_id="s1")
+    state.conversation_history.add(Role.USER, "我头痛")
+    assert asyncio.run(extractor.complete_record(state)) is None
+    assert state.collected_data == {}
+
+
+def test_micro_batcher_coalesces_same_conversation_only():
+    """测试窗口内同一段对话只请求一次（字段取并集），不同会话各自单独请求"""
+    def reply(payload):
+        text = payload["messages"][1]["content"]
+        return {
+            "chief_complaint": {"symptom": text},
+            "past_history": {"chronic_diseases": [text]},
+        }
+
+    async def run(server):
+        client = _client(server)
+        batcher = MicroBatcher(client.extract_jobs, max_batch_size=8, max_wait=0.05)
+        extractor = RecordExtractor(client, batcher=batcher)
+        try:
+            submissions = [(f"症状{i}", ["chief_complaint"]) for i in range(3)]
+            submissions += [("症状0", ["chief_complaint"]), ("症状1", ["past_history"])]
+            results = await asyncio.gather(*(
+                extractor.extract(text, fields) for text, fields in submissions
+            ))
+            return results, batcher.stats()
+        finally:
+            await client.aclose()
+
+    with FakeOpenAIServer(reply) as server:
+        results, stats = asyncio.run(run(server))
+        prompts = sorted(request["messages"][1]["content"] for request in server.requests)
+    assert prompts == ["症状0", "症状1", "症状2"]
+    assert [r["chief_complaint"]["symptom"] for r in results[:4]] == ["症状0", "症状1", "症状2", "症状0"]
+    assert results[4] == {"past_history": {
+        "chronic_diseases": ["症状1"], "surgeries": [], "allergies": [], "medications": [],
+    }}
+    results[0]["chief_complaint"]["symptom"] = "changed"
+    assert results[3]["chief_complaint"]["symptom"] == "症状0"
+    assert stats["batches"] == 1
+
+
+def test_micro_batcher_propagates_failure_to_batch():
+    """测试批量调用失败时同批等待方都收到异常"""
+    async def failing(items):
+        raise LLMExtractionError("boom")
+
+    async def run():
+        batcher = MicroBatcher(failing, max_batch_size=8, max_wait=0.01)
+        return await asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(r, LLMExtractionError) for r in results)
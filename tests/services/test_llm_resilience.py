@@ -0,0 +1,179 @@
+# tests/services/test_llm_resilience.py
+import asyncio
+import time
+
+from app.services.analysis.extraction_cache import ExtractionCache
+from app.services.llm import (
+    CircuitBreaker,
+    LLMExtractionClient,
+    MicroBatcher,
+    RecordExtractor,
+    deadline,
+    stage_timeout,
+)
+from tests.fakes.openai_server import FakeOpenAIServer
+
+CONVERSATION = "患者: 我头痛3天了，有高血压"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _extractor(server, **kwargs):
+    client = LLMExtractionClient(server.base_url, "test-key", "fake-model", timeout=5)
+    return RecordExtractor(client, **kwargs)
+
+
+def test_stage_timeout_bounded_by_request_deadline():
+    """测试阶段超时取阶段上限与剩余时间的较小者，嵌套取更早的截止时间"""
+    assert stage_timeout(10) == 10
+    assert stage_timeout() is None
+    with deadline(1.0):
+        assert stage_timeout(10) <= 1.0
+        with deadline(5.0):
+            assert stage_timeout() <= 1.0
+        assert stage_timeout(10, reserve=2.0) == 0.0
+
+
+def test_slow_model_degrades_within_deadline():
+    """测试模型响应慢时在截止时间内降级为关键词提取"""
+    async def run(server):
+        extractor = _extractor(server)
+        try:
+            with deadline(0.2):
+                start = time.perf_counter()
+                outcome = await extractor.extract_outcome(CONVERSATION)
+                return outcome, time.perf_counter() - start, extractor.stats()
+        finally:
+            await extractor.client.aclose()
+
+    with FakeOpenAIServer(latency=2.0) as server:
+        outcome, elapsed, stats = asyncio.run(run(server))
+
+    assert outcome.degraded is True
+    assert outcome.reason == "deadline"
+    assert elapsed < 1.0
+    assert outcome.fields["past_history"] is not None
+    assert stats["degraded"]["deadline"] == 1
+
+
+def test_faults_degrade_with_error_reason():
+    """测试服务端错误、断开连接与无法解析的输出均降级"""
+    async def run(server):
+        extractor = _extractor(server)
+        try:
+            return await extractor.extract_outcome(CONVERSATION)
+        finally:
+            await extractor.client.aclose()
+
+    with FakeOpenAIServer() as server:
+        for fault, status in [(None, 500), ("reset", 200), ("garbage", 200)]:
+            server.fault, server.status = fault, status
+            outcome = asyncio.run(run(server))
+            assert outcome.degraded is True
+            assert outcome.reason == "error"
+
+
+def test_breaker_opens_and_recovers_after_trial():
+    """测试连续失败后熔断、不再请求模型，冷却后试探成功恢复"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=3, reset_seconds=30, clock=clock)
+
+    async def run(server):
+        extractor = _extractor(server, breaker=breaker)
+        try:
+            server.status = 500
+            outcomes = [await extractor.extract_outcome(CONVERSATION) for _ in range(5)]
+            assert len(server.requests) == 3
+            assert breaker.state == CircuitBreaker.OPEN
+            assert [o.reason for o in outcomes[3:]] == ["circuit_open", "circuit_open"]
+
+            clock.now = 31
+            server.status = 200
+            assert breaker.state == CircuitBreaker.HALF_OPEN
+            return await extractor.extract_outcome(CONVERSATION)
+        finally:
+            await extractor.client.aclose()
+
+    with FakeOpenAIServer() as server:
+        outcome = asyncio.run(run(server))
+
+    assert outcome.degraded is False
+    assert len(server.requests) == 4
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.stats()["opened"] == 1
+
+
+def test_failed_trial_reopens_breaker():
+    """测试半开状态试探失败后重新熔断"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+    breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 10
+    assert breaker.allow() is True
+    assert breaker.allow() is False
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.stats()["opened"] == 2
+
+
+def test_degraded_results_not_cached():
+    """测试降级结果不写入缓存"""
+    cache = ExtractionCache(max_entries=16)
+
+    async def run(server):
+        extractor = _extractor(server, cache=cache)
+        try:
+            return await extractor.extract_outcome(CONVERSATION)
+        finally:
+            await extractor.client.aclose()
+
+    with FakeOpenAIServer() as server:
+        server.status = 500
+        assert asyncio.run(run(server)).degraded is True
+        server.status = 200
+        assert asyncio.run(run(server)).degraded is False
+        assert len(server.requests) == 2
+
+
+def test_unexpected_or_cancelled_trial_releases_breaker():
+    """测试试探调用抛出意外异常或被取消时，熔断器不会一直停在 half_open"""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=10, clock=clock)
+    breaker.allow()
+    breaker.record_failure()
+    clock.now = 10
+
+    async def broken(items):
+        raise RuntimeError("boom")
+
+    async def hanging(items):
+        await asyncio.sleep(60)
+
+    async def run():
+        client = LLMExtractionClient("http://127.0.0.1:9", "test-key", "fake-model")
+        try:
+            extractor = RecordExtractor(client, breaker=breaker, batcher=MicroBatcher(broken, max_wait=0))
+            outcome = await extractor.extract_outcome(CONVERSATION)
+            assert (outcome.degraded, outcome.reason) == (True, "error")
+            assert breaker.state == CircuitBreaker.OPEN
+
+            clock.now = 20
+            extractor.batcher = MicroBatcher(hanging, max_wait=0)
+            task = asyncio.ensure_future(extractor.extract_outcome(CONVERSATION))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            assert breaker.allow() is True
+        finally:
+            await client.aclose()
+
+    asyncio.run(run())
@@ -0,0 +1,86 @@
+# tests/services/test_memory_budget.py
+import pytest
+from app.models.consultation_state import ConsultationState, Phase
+from app.services.storage import MemorySessionStore
+
+
+def _state(session_id: str, turns: int = 0) -> ConsultationState:
+    state = ConsultationState(session_id=session_id)
+    for i in range(turns):
+        state.conversation_history.append(f"用户: 第{i}轮，头痛加重了一些")
+    return state
+
+
+def test_footprint_tracks_bytes_incrementally():
+    """测试追加对话后字节数增量增长，删除后归零"""
+    store = MemorySessionStore()
+    state = _state("s1")
+    store.put("s1", state)
+    base = store.footprint()["bytes"]
+
+    state.conversation_history.append("用户: 我头痛三天了")
+    store.put("s1", state)
+    grown = store.footprint()["bytes"]
+    assert grown > base
+
+    store.delete("s1")
+    assert store.footprint()["bytes"] == 0
+
+
+def test_lru_eviction_when_budget_exceeded():
+    """测试超出预算时淘汰最久未使用的会话"""
+    probe = MemorySessionStore()
+    probe.put("probe", _state("probe", turns=20))
+    per_session = probe.footprint()["bytes"]
+
+    store = MemorySessionStore(max_bytes=per_session * 3)
+    for sid in ["a", "b", "c"]:
+        store.put(sid, _state(sid, turns=20))
+    store.get("a")  # a 变为最近使用
+    store.put("d", _state("d", turns=20))
+
+    assert "b" not in store
+    assert all(sid in store for sid in ["a", "c", "d"])
+    assert store.footprint()["bytes"] <= per_session * 3
+    assert store.footprint()["evictions"] == 1
+
+
+def test_active_sessions_are_not_evicted():
+    """测试正在处理请求的会话不会被淘汰"""
+    store = MemorySessionStore(max_bytes=1, is_active=lambda sid: sid == "busy")
+    store.put("busy", _state("busy", turns=5))
+    store.put("idle", _state("idle", turns=5))
+    store.put("new", _state("new", turns=5))
+
+    assert "busy" in store
+    assert "idle" not in store
+    assert "new" in store
+
+
+def test_spill_to_disk_and_reload(tmp_path):
+    """测试淘汰会话落盘后可重新加载"""
+    store = MemorySessionStore(max_bytes=1, spill_dir=str(tmp_path))
+    state = _state("old", turns=3)
+    state.current_phase = Phase.PAST_HISTORY
+    store.put("old", state)
+    store.put("new", _state("new"))
+
+    footprint = store.footprint()
+    assert footprint["sessions_spilled"] == 1
+    assert len(store) == 2
+    assert len(list(tmp_path.iterdir())) == 1
+
+    reloaded = store.get("old")
+    assert reloaded.current_phase == Phase.PAST_HISTORY
+    assert len(reloaded.conversation_history) == 3
+
+
+def test_spilled_session_expires(tmp_path):
+    """测试落盘会话同样会过期并删除文件"""
+    store = MemorySessionStore(max_bytes=1, spill_dir=str(tmp_path))
+    store.put("old", _state("old"))
+    store.put("new", _state("new"))
+
+    expired = store.expire(cutoff=float("inf"))
+    assert sorted(expired) == ["new", "old"]
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,189 @@
+# tests/services/test_record_refiner.py
+import asyncio
+import logging
+import time
+
+from app.models.conversation import Role
+from app.services.core.session_locks import SessionLockRegistry
+from app.services.core.session_manager import SessionManager
+from app.services.llm import LLMExtractionClient, RecordExtractor, RecordRefiner, deadline, field_conflicts
+from tests.fakes.openai_server import FakeOpenAIServer
+
+
+def _reply(payload):
+    return {"chief_complaint": {"symptom": "偏头痛", "duration": "3天"},
+            "past_history": {"chronic_diseases": ["高血压"]}}
+
+
+def _completed_session(manager):
+    state = manager.get_or_create()
+    for role, text in [(Role.USER, "我头痛"), (Role.USER, "3天了"), (Role.USER, "有高血压")]:
+        state.conversation_history.add(role, text)
+    manager.update(state.session_id, state)
+    return state
+
+
+def _refiner(server, manager):
+    client = LLMExtractionClient(server.base_url, "test-key", "fake-model")
+    return RecordRefiner(RecordExtractor(client), manager, SessionLockRegistry())
+
+
+def test_field_conflicts_ignores_empty_values():
+    """测试只有两种结果都有值且不一致的属性计为冲突"""
+    quick = {"chief_complaint": {"symptom": "头痛", "duration": None},
+             "past_history": {"chronic_diseases": ["高血压", "糖尿病"]}}
+    refined = {"chief_complaint": {"symptom": "偏头痛", "duration": "3天"},
+               "past_history": {"chronic_diseases": ["糖尿病", "高血压"]}}
+    assert field_conflicts(quick, refined) == [("chief_complaint", "symptom")]
+
+
+def test_speculate_returns_keywords_then_merges_refinement(caplog):
+    """测试先返回关键词结果，后台精修完成后写回会话并记录冲突（日志不含临床取值）"""
+    caplog.set_level(logging.INFO, logger="app.services.llm.refiner")
+    manager = SessionManager()
+    state = _completed_session(manager)
+
+    async def run(server):
+        refiner = _refiner(server, manager)
+        try:
+            start = time.perf_counter()
+            outcome = await refiner.complete(state)
+            elapsed = time.perf_counter() - start
+            quick = dict(state.collected_data)
+            assert await refiner.settle(state.session_id)
+            return refiner, outcome, elapsed, quick
+        finally:
+            await refiner.extractor.client.aclose()
+
+    with FakeOpenAIServer(_reply, latency=0.3) as server:
+        refiner, outcome, elapsed, quick = asyncio.run(run(server))
+
+    assert elapsed < 0.1
+    assert outcome.degraded is False
+    assert quick["chief_complaint"]["symptom"] == "头痛"
+    assert manager.get(state.session_id).collected_data["chief_complaint"]["symptom"] == "偏头痛"
+    stats = refiner.stats()
+    assert stats["refined"] == 1
+    assert stats["pending"] == 0
+    assert stats["conflicts"] == {"chief_complaint": 1}
+    assert "chief_complaint.symptom" in caplog.text
+    assert "头痛" not in caplog.text
+
+
+def test_refinement_not_bound_by_request_deadline():
+    """测试后台精修不继承安排它的请求的截止时间"""
+    manager = SessionManager()
+    state = _completed_session(manager)
+
+    async def run(server):
+        refiner = _refiner(server, manager)
+        try:
+            with deadline(0.05):
+                refiner.speculate(state)
+            await refiner.settle(state.session_id)
+            return refiner
+        finally:
+            await refiner.extractor.client.aclose()
+
+    with FakeOpenAIServer(_reply, latency=0.2) as server:
+        refiner = asyncio.run(run(server))
+
+    assert refiner.stats()["refined"] == 1
+    assert refiner.stats()["degraded"] == 0
+
+
+def test_settle_times_out_without_blocking():
+    """测试等待精修超时时立即返回，精修稍后仍会写回"""
+    manager = SessionManager()
+    state = _completed_session(manager)
+
+    async def run(server):
+        refiner = _refiner(server, manager)
+        try:
+            refiner.speculate(state)
+            settled = await refiner.settle(state.session_id, timeout=0.05)
+            await refiner.aclose()
+            return refiner, settled
+        finally:
+            await refiner.extractor.client.aclose()
+
+    with FakeOpenAIServer(_reply, latency=0.3) as server:
+        refiner, settled = asyncio.run(run(server))
+
+    assert settled is False
+    assert refiner.stats()["settle_timeouts"] == 1
+    assert manager.get(state.session_id).collected_data["chief_complaint"]["symptom"] == "偏头痛"
+
+
+def test_failed_refinement_keeps_keyword_record():
+    """测试大模型失败时保留关键词结果，不写回会话"""
+    manager = SessionManager()
+    state = _completed_session(manager)
+
+    async def run(server):
+        refiner = _refiner(server, manager)
+        try:
+            refiner.speculate(state)
+            manager.update(state.session_id, state)
+            await refiner.settle(state.session_id)
+            return refiner
+        finally:
+            await refiner.extractor.client.aclose()
+
+    with FakeOpenAIServer(_reply) as server:
+        server.status = 500
+        refiner = asyncio.run(run(server))
+
+    assert refiner.stats()["degraded"] == 1
+    assert refiner.stats()["refined"] == 0
+    assert manager.get(state.session_id).collected_data["chief_complaint"]["symptom"] == "头痛"
+
+
+def test_degraded_refinement_keeps_rule_notes():
+    """测试大模型降级时，关键词结果不覆盖阶段规则记录的回答"""
+    manager = SessionManager()
+    state = manager.get_or_create()
+    answer = "有青霉素过敏，做过阑尾手术"
+    state.conversation_history.add(Role.USER, answer)
+    state.collected_data["past_history"] = {"notes": answer}
+    manager.update(state.session_id, state)
+
+    async def run(server):
+        refiner = _refiner(server, manager)
+        try:
+            await refiner.complete(state)
+            await refiner.settle(state.session_id)
+            return await refiner.complete(state, background=False)
+        finally:
+            await refiner.extractor.client.aclose()
+
+    with FakeOpenAIServer(_reply) as server:
+        server.status = 500
+        outcome = asyncio.run(run(server))
+
+    assert outcome.degraded is True
+    assert state.collected_data["past_history"]["notes"] == answer
+    assert manager.get(state.session_id).collected_data["past_history"]["notes"] == answer
+
+
+def test_stale_refinement_discarded():
+    """测试同一会话安排了新的精修后，较早的精修结果不写回"""
+    manager = SessionManager()
+    state = _completed_session(manager)
+
+    async def run(server):
+        refiner = _refiner(server, manager)
+        try:
+            refiner.speculate(state)
+            first = refiner._pending[state.session_id]
+            refiner.speculate(state)
+            await asyncio.gather(first, refiner._pending[state.session_id])
+            return refiner
+        finally:
+            await refiner.extractor.client.aclose()
+
+    with FakeOpenAIServer(_reply) as server:
+        refiner = asyncio.run(run(server))
+
+    assert refiner.stats()["scheduled"] == 2
+    assert refiner.stats()["refined"] == 1
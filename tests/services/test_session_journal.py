@@ -0,0 +1,154 @@
+# tests/services/test_session_journal.py
+import asyncio
+import json
+import pytest
+from datetime import datetime, timedelta
+from app.models.consultation_state import Phase
+from app.services.core.journal_compactor import (
+    JournalCompactor,
+    compact_journal,
+    recover_from_journal,
+)
+from app.services.core.session_manager import SessionManager
+from app.services.storage.journal import SessionJournal
+
+
+def _records(journal: SessionJournal) -> list:
+    lines = []
+    for path in journal.segments():
+        with open(path, encoding="utf-8") as f:
+            lines.extend(json.loads(line) for line in f)
+    return lines
+
+
+def _play_turn(manager: SessionManager, session_id: str, text: str) -> None:
+    state = manager.get_or_create(session_id)
+    state.conversation_history.append(f"用户: {text}")
+    state.conversation_history.append("助手: 好的")
+    manager.update(session_id, state)
+
+
+def test_update_appends_small_delta(tmp_path):
+    """测试每轮只追加新增的对话与变化字段"""
+    journal = SessionJournal(str(tmp_path))
+    manager = SessionManager(journal=journal)
+    _play_turn(manager, "s1", "我头痛")
+
+    state = manager.get("s1")
+    state.current_phase = Phase.PRESENT_ILLNESS
+    state.collected_data["chief_complaint"] = {"symptom": "头痛"}
+    _play_turn(manager, "s1", "三天了")
+
+    last = _records(journal)[-1]
+    assert last["append"]["conversation_history"] == [["user", "三天了"], ["assistant", "好的"]]
+    assert last["set"]["current_phase"] == "present_illness"
+    assert last["merge"]["collected_data"] == {"chief_complaint": {"symptom": "头痛"}}
+    assert "emotion_state" not in last["set"]
+
+
+def test_recover_after_crash(tmp_path):
+    """测试进程崩溃后重放日志恢复会话"""
+    manager = SessionManager(journal=SessionJournal(str(tmp_path)))
+    _play_turn(manager, "s1", "我头痛")
+    state = manager.get("s1")
+    state.collected_data["chief_complaint"] = {"symptom": "头痛"}
+    state.current_phase = Phase.PAST_HISTORY
+    manager.update("s1", state)
+    state.collected_data.pop("chief_complaint")
+    manager.update("s1", state)
+
+    restarted = SessionManager(journal=SessionJournal(str(tmp_path)))
+    assert recover_from_journal(restarted, restarted.journal) == 1
+    recovered = restarted.get("s1")
+    assert recovered.current_phase == Phase.PAST_HISTORY
+    assert recovered.conversation_history == ["用户: 我头痛", "助手: 好的"]
+    assert recovered.collected_data == {}
+
+
+def test_recover_keeps_appended_count(tmp_path):
+    """测试重放日志后对话记录的累计追加轮数与崩溃前一致"""
+    manager = SessionManager(journal=SessionJournal(str(tmp_path)))
+    for i in range(40):
+        _play_turn(manager, "s1", f"第{i}轮")
+    appended = manager.get("s1").conversation_history.appended
+
+    restarted = SessionManager(journal=SessionJournal(str(tmp_path)))
+    recover_from_journal(restarted, restarted.journal)
+    recovered = restarted.get("s1").conversation_history
+    assert recovered.appended == appended == 80
+    assert recovered.last_user_turn == "第39轮"
+
+
+def test_torn_tail_line_ignored(tmp_path):
+    """测试崩溃时写了一半的尾行被忽略"""
+    journal = SessionJournal(str(tmp_path))
+    manager = SessionManager(journal=journal)
+    _play_turn(manager, "s1", "我头痛")
+    journal.close()
+    with open(journal.segments()[-1], "a", encoding="utf-8") as f:
+        f.write('{"s": "s1", "set": {"curr')
+
+    restarted = SessionManager(journal=SessionJournal(str(tmp_path)))
+    recover_from_journal(restarted, restarted.journal)
+    assert len(restarted.get("s1").conversation_history) == 2
+
+
+def test_compaction_folds_segments_into_checkpoint(tmp_path):
+    """测试压缩后日志段被删除，恢复结果不变"""
+    journal = SessionJournal(str(tmp_path))
+    manager = SessionManager(journal=journal)
+    _play_turn(manager, "s1", "我头痛")
+    _play_turn(manager, "s2", "我咳嗽")
+    assert compact_journal(journal) == 2
+    assert journal.segments() == []
+
+    # 压缩后继续写入，再压缩一次（以上一检查点为基准）
+    _play_turn(manager, "s1", "三天了")
+    journal.forget("s2")
+    assert compact_journal(journal) == 1
+    assert compact_journal(journal) == -1
+
+    restarted = SessionManager(journal=SessionJournal(str(tmp_path)))
+    recover_from_journal(restarted, restarted.journal)
+    assert len(restarted.get("s1").conversation_history) == 4
+    assert restarted.get("s2") is None
+
+
+def test_compaction_drops_expired_sessions(tmp_path):
+    """测试压缩时丢弃已过期会话"""
+    journal = SessionJournal(str(tmp_path))
+    manager = SessionManager(journal=journal)
+    _play_turn(manager, "old", "我头痛")
+    state = manager.get("old")
+    state.last_update = datetime.now() - timedelta(hours=2)
+    manager.update("old", state)
+    _play_turn(manager, "new", "我咳嗽")
+
+    cutoff = (datetime.now() - timedelta(minutes=30)).timestamp()
+    assert compact_journal(journal, cutoff=cutoff) == 1
+
+
+def test_background_compactor(tmp_path):
+    """测试后台压缩任务在线程中执行"""
+    journal = SessionJournal(str(tmp_path))
+    manager = SessionManager(journal=journal)
+    _play_turn(manager, "s1", "我头痛")
+    compactor = JournalCompactor(manager, journal)
+
+    assert asyncio.run(compactor.compact_once()) == 1
+    assert compactor.metrics()["compactions"] == 1
+
+
+def test_journal_refused_with_multiple_workers(tmp_path, monkeypatch):
+    """测试多 worker 部署配置增量日志时拒绝启动（各进程会写同一日志段并互删）"""
+    from app import dependencies
+
+    monkeypatch.setattr(dependencies.settings, "web_concurrency", 4)
+    monkeypatch.setattr(dependencies, "session_journal", SessionJournal(str(tmp_path)))
+
+    async def start():
+        async with dependencies.lifespan(None):
+            pass
+
+    with pytest.raises(RuntimeError, match="SESSION_JOURNAL_DIR"):
+        asyncio.run(start())
@@ -0,0 +1,72 @@
+# tests/services/test_session_locks.py
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from app.services.core.session_locks import SessionLockRegistry
+from app.services.core.session_manager import SessionManager
+
+
+def test_same_session_serialized():
+    """测试同一会话的请求串行执行"""
+    registry = SessionLockRegistry()
+    events = []
+
+    async def turn(name: str):
+        async with registry.lock("s1"):
+            events.append(f"{name}-start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name}-end")
+
+    async def scenario():
+        await asyncio.gather(turn("a"), turn("b"))
+
+    asyncio.run(scenario())
+    assert events == ["a-start", "a-end", "b-start", "b-end"]
+
+
+def test_different_sessions_run_in_parallel():
+    """测试不同会话互不阻塞"""
+    registry = SessionLockRegistry(stripes=1)
+    inside = []
+    peak = []
+
+    async def turn(session_id: str):
+        async with registry.lock(session_id):
+            inside.append(session_id)
+            peak.append(len(inside))
+            await asyncio.sleep(0.01)
+            inside.remove(session_id)
+
+    async def scenario():
+        await asyncio.gather(*(turn(f"s{i}") for i in range(5)))
+
+    asyncio.run(scenario())
+    assert max(peak) == 5
+
+
+def test_idle_locks_are_reclaimed():
+    """测试无等待者的锁被回收"""
+    registry = SessionLockRegistry()
+
+    async def scenario():
+        async with registry.lock("s1"):
+            assert registry.is_locked("s1")
+            assert len(registry) == 1
+
+    asyncio.run(scenario())
+    assert len(registry) == 0
+    assert not registry.is_locked("s1")
+
+
+def test_expired_sessions_notify_registry():
+    """测试会话过期时回调注册表回收锁"""
+    manager = SessionManager(timeout_minutes=30)
+    evicted = []
+    manager.add_eviction_listener(evicted.append)
+
+    state = manager.get_or_create(None)
+    state.last_update = datetime.now() - timedelta(hours=1)
+    manager.update(state.session_id, state)
+    manager.sweep_expired()
+
+    assert evicted == [state.session_id]
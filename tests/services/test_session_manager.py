@@ -67,3 +67,27 @@ def test_session_last_update_refreshed():
 
     # 最后更新时间应该被刷新
     assert state2.last_update > original_time
+
+
+def test_refreshed_session_not_cleaned_up():
+    """测试刷新过的会话不会被过期清理误删"""
+    manager = SessionManager(timeout_minutes=30)
+    state = manager.get_or_create(None)
+    state.last_update = datetime.now() - timedelta(minutes=60)
+    manager.update(state.session_id, state)
+
+    # 刷新后另建会话触发清理，原会话应保留
+    refreshed = manager.get_or_create(state.session_id)
+    manager.get_or_create(None)
+    assert manager.get(refreshed.session_id) is not None
+
+
+def test_expired_session_removed_on_cleanup():
+    """测试过期会话在下一次请求时被清理"""
+    manager = SessionManager(timeout_minutes=30)
+    state = manager.get_or_create(None)
+    state.last_update = datetime.now() - timedelta(minutes=60)
+    manager.update(state.session_id, state)
+
+    manager.get_or_create(None)
+    assert manager.get(state.session_id) is None
@@ -0,0 +1,154 @@
+# tests/services/test_session_snapshot.py
+import asyncio
+
+import pytest
+from datetime import datetime, timedelta
+from app.models.consultation_state import ConsultationState, Phase
+from app.services.core.session_manager import SessionManager
+from app.services.storage.snapshot import (
+    SessionSnapshot,
+    decode_state,
+    encode_state,
+    write_snapshot,
+)
+
+
+def _manager_with_sessions(count: int) -> SessionManager:
+    manager = SessionManager()
+    for i in range(count):
+        state = manager.get_or_create(f"s{i}")
+        state.current_phase = Phase.PRESENT_ILLNESS
+        state.collected_data["chief_complaint"] = {"symptom": "头痛", "index": i}
+        state.conversation_history.append(f"用户: 第{i}个病人头痛")
+        manager.update(state.session_id, state)
+    return manager
+
+
+def test_encode_decode_roundtrip():
+    """测试压缩记录可还原会话"""
+    state = ConsultationState(session_id="s1", current_phase=Phase.PAST_HISTORY)
+    state.conversation_history.append("用户: 我头痛")
+    restored = decode_state(encode_state(state))
+    assert restored == state
+
+
+def test_snapshot_lookup(tmp_path):
+    """测试快照按会话 ID 二分查找"""
+    path = str(tmp_path / "sessions.snap")
+    states = [ConsultationState(session_id=f"id-{i:03d}") for i in range(50)]
+    write_snapshot(path, [
+        (s.session_id, s.last_update.timestamp(), encode_state(s)) for s in reversed(states)
+    ])
+
+    snapshot = SessionSnapshot(path)
+    assert len(snapshot) == 50
+    assert "id-017" in snapshot
+    assert "missing" not in snapshot
+    assert snapshot.load("id-042").session_id == "id-042"
+    assert list(snapshot) == sorted(s.session_id for s in states)
+    snapshot.close()
+
+
+def test_invalid_snapshot_rejected(tmp_path):
+    """测试拒绝非快照文件"""
+    path = tmp_path / "broken.snap"
+    path.write_bytes(b"not a snapshot file at all")
+    with pytest.raises(ValueError):
+        SessionSnapshot(str(path))
+
+
+def test_unknown_snapshot_version_rejected(tmp_path):
+    """测试拒绝版本不支持的快照"""
+    path = tmp_path / "sessions.snap"
+    state = ConsultationState(session_id="s1")
+    write_snapshot(str(path), [(state.session_id, 0.0, encode_state(state))])
+    data = bytearray(path.read_bytes())
+    data[4] = 99
+    path.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="版本"):
+        SessionSnapshot(str(path))
+
+
+def test_write_uses_unique_temp_file(tmp_path):
+    """测试写入使用独立临时文件，不覆盖他人的临时文件，失败时清理"""
+    path = tmp_path / "sessions.snap"
+    other = tmp_path / "sessions.snap.tmp"
+    other.write_bytes(b"another worker")
+    state = ConsultationState(session_id="s1")
+    assert write_snapshot(str(path), [(state.session_id, 0.0, encode_state(state))]) == 1
+    assert other.read_bytes() == b"another worker"
+
+    def failing():
+        yield state.session_id, 0.0, encode_state(state)
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        write_snapshot(str(path), failing())
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["sessions.snap", "sessions.snap.tmp"]
+    assert SessionSnapshot(str(path)).load("s1") == state
+
+
+def test_warm_restart_restores_lazily(tmp_path):
+    """测试重启后会话在首次访问时恢复"""
+    path = str(tmp_path / "sessions.snap")
+    assert _manager_with_sessions(3).save_snapshot(path) == 3
+
+    restarted = SessionManager()
+    assert restarted.restore_snapshot(path) == 3
+    assert len(restarted.store) == 0
+
+    state = restarted.get_or_create("s1")
+    assert state.current_phase == Phase.PRESENT_ILLNESS
+    assert state.collected_data["chief_complaint"]["index"] == 1
+    assert len(restarted.store) == 1
+
+
+def test_unaccessed_sessions_carried_to_next_snapshot(tmp_path):
+    """测试未访问的快照会话在下一次关闭时保留，过期会话被丢弃"""
+    first = str(tmp_path / "first.snap")
+    second = str(tmp_path / "second.snap")
+    manager = _manager_with_sessions(2)
+    stale = manager.get_or_create("stale")
+    stale.last_update = datetime.now() - timedelta(hours=2)
+    manager.update("stale", stale)
+    manager.save_snapshot(first)
+
+    restarted = SessionManager()
+    restarted.restore_snapshot(first)
+    touched = restarted.get_or_create("s0")
+    touched.current_phase = Phase.COMPLETE
+    restarted.update("s0", touched)
+    assert restarted.save_snapshot(second) == 2
+
+    final = SessionManager()
+    final.restore_snapshot(second)
+    assert final.get("s0").current_phase == Phase.COMPLETE
+    assert final.get("s1").current_phase == Phase.PRESENT_ILLNESS
+    assert final.get("stale") is None
+
+
+def test_deleted_session_not_resurrected(tmp_path):
+    """测试已恢复后过期删除的会话不会再次从快照加载"""
+    path = str(tmp_path / "sessions.snap")
+    _manager_with_sessions(1).save_snapshot(path)
+
+    manager = SessionManager()
+    manager.restore_snapshot(path)
+    state = manager.get("s0")
+    manager.store.delete(state.session_id)
+    assert manager.get("s0") is None
+
+
+def test_snapshot_refused_with_multiple_workers(tmp_path, monkeypatch):
+    """测试多 worker 部署配置快照时拒绝启动（各进程会互相覆盖同一快照）"""
+    from app import dependencies
+
+    monkeypatch.setattr(dependencies.settings, "web_concurrency", 4)
+    monkeypatch.setattr(dependencies.settings, "session_snapshot_path", str(tmp_path / "s.snap"))
+
+    async def start():
+        async with dependencies.lifespan(None):
+            pass
+
+    with pytest.raises(RuntimeError, match="SESSION_SNAPSHOT_PATH"):
+        asyncio.run(start())
@@ -0,0 +1,122 @@
+# tests/services/test_session_store.py
+import pytest
+from datetime import datetime, timedelta
+from app.models.consultation_state import ConsultationState, Phase
+from app.services.core.session_manager import SessionManager
+from app.services.storage import (
+    MemorySessionStore,
+    SQLiteSessionStore,
+    create_session_store,
+)
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """两种存储后端共用同一组行为测试"""
+    if request.param == "memory":
+        yield MemorySessionStore()
+    else:
+        sqlite_store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+        yield sqlite_store
+        sqlite_store.close()
+
+
+def _state(session_id: str, minutes_ago: int = 0) -> ConsultationState:
+    return ConsultationState(
+        session_id=session_id,
+        last_update=datetime.now() - timedelta(minutes=minutes_ago),
+    )
+
+
+def test_put_get_delete(store):
+    """测试基本读写删除"""
+    store.put("a", _state("a"))
+    store.flush()
+    assert store.get("a").session_id == "a"
+    assert "a" in store
+    assert len(store) == 1
+
+    store.delete("a")
+    assert store.get("a") is None
+    assert len(store) == 0
+
+
+def test_expire_with_limit(store):
+    """测试按最后更新时间过期并限制数量"""
+    for i in range(5):
+        store.put(f"old-{i}", _state(f"old-{i}", minutes_ago=60 + i))
+    store.put("fresh", _state("fresh"))
+    cutoff = (datetime.now() - timedelta(minutes=30)).timestamp()
+
+    first = store.expire(cutoff, limit=2)
+    rest = store.expire(cutoff)
+
+    assert len(first) == 2
+    assert sorted(first + rest) == [f"old-{i}" for i in range(5)]
+    assert list(store) == ["fresh"]
+
+
+def test_sqlite_store_shared_between_workers(tmp_path):
+    """测试两个连接（模拟两个 worker）共享会话"""
+    path = str(tmp_path / "shared.db")
+    worker_a = SQLiteSessionStore(path)
+    worker_b = SQLiteSessionStore(path)
+
+    state = _state("s1")
+    state.current_phase = Phase.PRESENT_ILLNESS
+    state.conversation_history.append("用户: 我头痛")
+    worker_a.put("s1", state)
+    worker_a.flush()
+
+    loaded = worker_b.get("s1")
+    assert loaded.current_phase == Phase.PRESENT_ILLNESS
+    assert loaded.conversation_history == ["用户: 我头痛"]
+
+    # worker_b 更新后 worker_a 的本地缓存应失效
+    loaded.current_phase = Phase.COMPLETE
+    worker_b.put("s1", loaded)
+    worker_b.flush()
+    assert worker_a.get("s1").current_phase == Phase.COMPLETE
+
+
+def test_sqlite_store_buffers_writes_until_flush(tmp_path):
+    """测试写入缓冲到 flush 才对其他 worker 可见"""
+    path = str(tmp_path / "batch.db")
+    writer = SQLiteSessionStore(path, max_pending=10)
+    reader = SQLiteSessionStore(path)
+
+    for i in range(3):
+        writer.put(f"s{i}", _state(f"s{i}"))
+    assert writer.get("s0") is not None
+    assert reader.get("s0") is None
+
+    writer.flush()
+    assert len(reader) == 3
+
+
+def test_sqlite_store_read_through_cache(tmp_path):
+    """测试版本未变化时直接返回缓存对象"""
+    store = SQLiteSessionStore(str(tmp_path / "cache.db"))
+    store.put("s1", _state("s1"))
+    store.flush()
+
+    assert store.get("s1") is store.get("s1")
+
+
+def test_manager_with_sqlite_store(tmp_path):
+    """测试 SessionManager 跨实例续接会话"""
+    path = str(tmp_path / "manager.db")
+    manager_a = SessionManager(store=SQLiteSessionStore(path))
+    manager_b = SessionManager(store=SQLiteSessionStore(path))
+
+    state = manager_a.get_or_create(None)
+    state.current_phase = Phase.CHIEF_COMPLAINT
+    manager_a.update(state.session_id, state)
+
+    resumed = manager_b.get_or_create(state.session_id)
+    assert resumed.current_phase == Phase.CHIEF_COMPLAINT
+
+
+def test_create_session_store():
+    """测试根据配置选择后端"""
+    assert isinstance(create_session_store(None), MemorySessionStore)
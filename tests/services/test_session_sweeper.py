@@ -0,0 +1,63 @@
+# tests/services/test_session_sweeper.py
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from app.models.consultation_state import Phase
+from app.services.core.session_manager import SessionManager
+from app.services.core.session_sweeper import SessionSweeper
+
+
+def _add_expired(manager: SessionManager, count: int) -> None:
+    """写入指定数量的过期会话"""
+    for _ in range(count):
+        state = manager.get_or_create(None)
+        state.last_update = datetime.now() - timedelta(hours=1)
+        manager.update(state.session_id, state)
+
+
+def test_sweep_once_evicts_in_batches():
+    """测试分批清理全部过期会话"""
+    manager = SessionManager(timeout_minutes=30, cleanup_on_access=False)
+    _add_expired(manager, 25)
+    live = manager.get_or_create(None)
+    sweeper = SessionSweeper(manager, batch_size=10)
+
+    evicted = asyncio.run(sweeper.sweep_once())
+
+    assert evicted == 25
+    assert list(manager.store) == [live.session_id]
+    metrics = sweeper.metrics()
+    assert metrics["evicted_total"] == 25
+    assert metrics["last_duration_ms"] >= 0
+    assert metrics["live_sessions"] == 1
+
+
+def test_background_task_start_and_stop():
+    """测试后台任务按间隔运行并可停止"""
+    manager = SessionManager(timeout_minutes=30, cleanup_on_access=False)
+    _add_expired(manager, 3)
+    sweeper = SessionSweeper(manager, interval_seconds=0.01)
+
+    async def scenario():
+        sweeper.start()
+        assert sweeper.running
+        await asyncio.sleep(0.05)
+        await sweeper.stop()
+
+    asyncio.run(scenario())
+    assert not sweeper.running
+    assert sweeper.metrics()["sweeps"] >= 1
+    assert len(manager.store) == 0
+
+
+def test_access_without_inline_cleanup_ignores_expired_session():
+    """测试关闭请求路径清理后，过期会话仍不会被复用"""
+    manager = SessionManager(timeout_minutes=30, cleanup_on_access=False)
+    state = manager.get_or_create(None)
+    state.current_phase = Phase.COMPLETE
+    state.last_update = datetime.now() - timedelta(hours=1)
+    manager.update(state.session_id, state)
+
+    fresh = manager.get_or_create(state.session_id)
+    assert fresh is not state
+    assert fresh.current_phase == Phase.GREETING
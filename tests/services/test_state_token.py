@@ -0,0 +1,75 @@
+# tests/services/test_state_token.py
+import logging
+
+import pytest
+from app.models.consultation_state import ConsultationState, Phase
+from app.services.storage.state_token import InvalidStateToken, StateTokenCodec
+
+
+def _state() -> ConsultationState:
+    state = ConsultationState(session_id="s1", current_phase=Phase.PRESENT_ILLNESS)
+    state.collected_data["chief_complaint"] = {"symptom": "头痛"}
+    state.conversation_history.extend(["用户: 我头痛", "助手: 持续多久了？"])
+    return state
+
+
+def test_roundtrip():
+    """测试令牌编码后可完整还原"""
+    codec = StateTokenCodec("secret")
+    state = _state()
+    assert codec.decode(codec.encode(state)) == state
+
+
+def test_token_is_url_safe_and_compact():
+    """测试令牌为 URL 安全字符且经过压缩"""
+    codec = StateTokenCodec("secret")
+    state = _state()
+    for i in range(50):
+        state.conversation_history.append(f"用户: 第{i}轮，头痛没有缓解")
+    token = codec.encode(state)
+    assert all(c.isalnum() or c in "-_." for c in token)
+    assert len(token) < len(state.model_dump_json().encode("utf-8"))
+
+
+def test_tampered_token_rejected():
+    """测试篡改后的令牌被拒绝"""
+    codec = StateTokenCodec("secret")
+    body, signature = codec.encode(_state()).split(".")
+    tampered = body[:-2] + ("AA" if body[-2:] != "AA" else "BB") + "." + signature
+    with pytest.raises(InvalidStateToken):
+        codec.decode(tampered)
+
+
+def test_other_secret_rejected():
+    """测试不同密钥签发的令牌被拒绝"""
+    token = StateTokenCodec("node-a").encode(_state())
+    with pytest.raises(InvalidStateToken):
+        StateTokenCodec("node-b").decode(token)
+
+
+def test_shared_secret_accepted_across_nodes():
+    """测试共享密钥的节点之间可以互认令牌"""
+    token = StateTokenCodec("shared").encode(_state())
+    assert StateTokenCodec("shared").decode(token).session_id == "s1"
+
+
+def test_malformed_token_rejected():
+    """测试格式错误的令牌被拒绝"""
+    codec = StateTokenCodec("secret")
+    for token in ["", "no-dot", "a.b.c", "中文.令牌"]:
+        with pytest.raises(InvalidStateToken):
+            codec.decode(token)
+
+
+def test_token_from_other_process_without_secret_explained(caplog):
+    """测试未配置密钥时，其他进程签发的令牌以明确的错误拒绝，首次签发时告警"""
+    worker_a, worker_b = StateTokenCodec(), StateTokenCodec()
+    with caplog.at_level(logging.WARNING):
+        token = worker_a.encode(_state())
+    assert "STATE_TOKEN_SECRET" in caplog.text
+    assert worker_a.decode(token).session_id == "s1"
+
+    with pytest.raises(InvalidStateToken, match="STATE_TOKEN_SECRET"):
+        worker_b.decode(token)
+    with pytest.raises(InvalidStateToken, match="STATE_TOKEN_SECRET"):
+        StateTokenCodec("secret").decode(token)
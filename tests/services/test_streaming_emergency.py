@@ -0,0 +1,40 @@
+# tests/services/test_streaming_emergency.py
+from app.services.detection.emergency_detection import EmergencyLevel
+from app.services.detection.streaming_emergency import StreamingEmergencyDetector
+
+
+def test_flag_split_across_chunks():
+    """测试跨分片的预警词仍能命中，并在完成的分片内立即报警"""
+    detector = StreamingEmergencyDetector()
+    assert detector.feed("我现在有点喘") is None
+    result = detector.feed("不上气，")
+    assert result is not None
+    assert result.level == EmergencyLevel.RED
+    assert detector.alert_offset == 9
+
+
+def test_single_character_chunks():
+    """测试逐字输入"""
+    detector = StreamingEmergencyDetector()
+    alerts = [detector.feed(char) for char in "一直持续呕吐"]
+    assert [a.level for a in alerts if a] == [EmergencyLevel.YELLOW]
+    assert alerts[-1] is not None
+
+
+def test_escalates_from_yellow_to_red_once():
+    """测试黄色升级为红色，之后不再重复报警"""
+    detector = StreamingEmergencyDetector()
+    assert detector.feed("高烧不退").level == EmergencyLevel.YELLOW
+    assert detector.feed("还发高热") is None
+    assert detector.feed("，现在胸痛").level == EmergencyLevel.RED
+    assert detector.feed("胸闷") is None
+    assert detector.result().level == EmergencyLevel.RED
+
+
+def test_no_flag_stays_green():
+    """测试无预警词时保持绿色"""
+    detector = StreamingEmergencyDetector()
+    assert detector.feed("头有点") is None
+    assert detector.feed("痛") is None
+    assert detector.result().is_emergency is False
+    assert detector.consumed == 4
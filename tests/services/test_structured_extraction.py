@@ -1,5 +1,7 @@
 # tests/services/test_structured_extraction.py
 import pytest
+from app.models.consultation_state import ConsultationState
+from app.models.conversation import ConversationHistory
 from app.services.analysis.structured_extraction import StructuredExtractionService
 
 
@@ -62,3 +64,80 @@ def test_extract_batch():
     result = service.extract_batch(conversation)
     assert "chief_complaint" in result
     assert "past_history" in result
+
+
+def test_extract_incremental_matches_full_scan():
+    """测试增量提取与整段对话提取结果一致"""
+    service = StructuredExtractionService()
+    history = ConversationHistory()
+    progress = {}
+    turns = ["用户: 我胸痛", "助手: 持续多久了？", "用户: 2天了，3周前也有过",
+             "用户: 现在头痛", "用户: 有糖尿病和高血压", "用户: 肚子也腹痛"]
+    for turn in turns:
+        history.append(turn)
+        conversation = "\n".join(history)
+        for field_type in ("chief_complaint", "past_history"):
+            expected = service.extract(conversation, field_type)
+            assert service.extract_incremental(history, progress, field_type) == expected
+
+
+def test_extract_incremental_only_scans_new_turns():
+    """测试游标之前的轮次不会被重复扫描"""
+    service = StructuredExtractionService()
+    history = ConversationHistory(["用户: 我头痛"])
+    progress = {}
+    service.extract_incremental(history, progress, "chief_complaint")
+    assert progress["cursor"] == 1
+
+    scanned = []
+    original = service._scan_turns
+
+    def recording_scan(turns, progress):
+        turns = list(turns)
+        scanned.extend(turns)
+        original(turns, progress)
+
+    service._scan_turns = recording_scan
+    history.append("用户: 3天了")
+    result = service.extract_incremental(history, progress, "chief_complaint")
+    assert scanned == ["用户: 3天了"]
+    assert result == {"symptom": "头痛", "duration": "3天", "severity": None}
+
+
+def _long_state():
+    state = ConsultationState(session_id="s1")
+    for i in range(60):
+        state.conversation_history.append(f"用户: 第{i}轮，没什么不舒服")
+    return state
+
+
+def test_extract_incremental_after_round_trip_beyond_maxlen():
+    """测试超过 maxlen 的对话重新加载后，增量提取仍能识别新追加的轮次"""
+    service = StructuredExtractionService()
+    state = _long_state()
+    service.extract_incremental(state.conversation_history, state.extraction_progress, "chief_complaint")
+
+    restored = ConsultationState.model_validate_json(state.model_dump_json())
+    restored.conversation_history.append("用户: 我头痛三天")
+    result = service.extract_incremental(
+        restored.conversation_history, restored.extraction_progress, "chief_complaint"
+    )
+    assert result["symptom"] == "头痛"
+
+
+def test_extract_incremental_rescans_when_cursor_ahead():
+    """测试旧版序列化丢失累计轮数、游标超前时重新扫描保留的轮次"""
+    service = StructuredExtractionService()
+    state = _long_state()
+    service.extract_incremental(state.conversation_history, state.extraction_progress, "chief_complaint")
+
+    legacy = state.model_dump(mode="json")
+    legacy["conversation_history"] = legacy["conversation_history"]["turns"]
+    restored = ConsultationState.model_validate(legacy)
+    restored.conversation_history.append("用户: 我头痛三天")
+    result = service.extract_incremental(
+        restored.conversation_history, restored.extraction_progress, "chief_complaint"
+    )
+    conversation = "\n".join(restored.conversation_history)
+    assert result == service.extract(conversation, "chief_complaint")
+    assert result["symptom"] == "头痛"
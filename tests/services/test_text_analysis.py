@@ -0,0 +1,44 @@
+# tests/services/test_text_analysis.py
+import pytest
+from app.services.analysis.text_analysis import TextAnalysisPipeline
+from app.services.detection.emergency_detection import EmergencyDetectionService, EmergencyLevel
+from app.services.support.emotion_support import EmotionSupportService
+from app.services.support.input_sanitization import InputSanitizationService
+from app.services.support.intent_classifier import IntentClassifier
+
+SAMPLES = [
+    "我头痛三天了",
+    "我叫李四先生，手机15900000000，胸口有点闷",
+    "其实我很担心，可能是发烧了，为什么这么久还不好",
+    "天气不错，周末去看电影",
+    "太害怕了，一直在哭，肚子痛",
+]
+
+
+@pytest.mark.parametrize("text", SAMPLES)
+def test_analysis_matches_individual_services(text):
+    """测试统一分析结果与各服务单独调用一致"""
+    analysis = TextAnalysisPipeline().analyze(text)
+    cleaned, detected = InputSanitizationService().sanitize(text)
+    assert analysis.text == cleaned
+    assert analysis.detected_pii == detected
+    assert analysis.emergency_level == EmergencyDetectionService().detect(cleaned).level
+    assert analysis.emotion_level == EmotionSupportService().detect_emotion_level(cleaned)
+    assert analysis.intent == IntentClassifier().classify(cleaned)
+
+
+def test_analysis_symptoms_and_markers():
+    """测试症状优先级与确定性、矛盾标记"""
+    analysis = TextAnalysisPipeline().analyze("其实不是头痛，可能是胸痛，还拉肚子")
+    assert [(s.name, s.priority) for s in analysis.symptoms] == [("胸痛", 1), ("头痛", 2), ("腹泻", 99)]
+    assert [m.keyword for m in analysis.uncertainty_markers] == ["可能"]
+    assert {m.keyword for m in analysis.contradiction_markers} == {"其实", "不是"}
+    assert analysis.emergency_level == EmergencyLevel.RED
+
+
+def test_analysis_pii_spans():
+    """测试敏感信息位置指向原始文本"""
+    text = "电话13812345678，头痛"
+    analysis = TextAnalysisPipeline().analyze(text)
+    span = analysis.pii[0]
+    assert (span.kind, text[span.start:span.end]) == ("phone", "13812345678")